@@ -74,6 +74,7 @@ class AdminViewsTests(TestCase):
         self.assertGreaterEqual(data["questions"]["short"], self.initial_short_question_count + 1)
         self.assertIn("ai_usage", data)
         self.assertGreaterEqual(data["ai_usage"]["ai_answered"], self.initial_short_answer_count + 1)
+        self.assertIn("hit_rate", data["answer_key_cache"])
 
     def test_user_activity_endpoint_returns_results(self):
         self.client.force_authenticate(user=self.admin_user)
@@ -94,3 +95,4 @@ class AdminViewsTests(TestCase):
         self.assertGreaterEqual(stats["totals"]["short_answers"], self.initial_short_answer_count + 1)
         self.assertGreaterEqual(stats["totals"]["ai_populated"], self.initial_short_answer_count + 1)
         self.assertIsNotNone(stats["performance"]["average_ai_answer_length"])
+        self.assertEqual(set(stats["cache"]), {"entries", "hits", "misses", "hit_rate"})
@@ -2,14 +2,16 @@ from collections import OrderedDict
 from datetime import timedelta
 
 from django.contrib.auth.models import User
-from django.db.models import Avg, Count, Max, Q
+from django.db.models import Avg, Count, Max, Q, Sum
 from django.db.models.functions import Length
 from django.utils import timezone
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from attempts.answer_keys import answer_keys
 from attempts.models import Attempt
-from questions.models import Question, ShortAnswerQuestion
+from questions import explanation_cache
+from questions.models import AICompletionCall, Question, ShortAnswerQuestion
 from .permissions import IsAdminEmail
 from rest_framework import status
 
@@ -71,6 +73,7 @@ class AdminOverviewView(APIView):
                     else None
                 ),
             },
+            answer_key_cache=answer_keys.stats(),
             generated_at=now.isoformat(),
         )
 
@@ -164,6 +167,15 @@ class AdminAIUsageView(APIView):
                 }
             )
 
+        calls = AICompletionCall.objects.filter(created_at__gte=timezone.now() - timedelta(days=7))
+        call_stats = calls.aggregate(
+            calls=Count("id"),
+            errors=Count("id", filter=~Q(status="ok")),
+            average_latency_ms=Avg("latency_ms", filter=Q(status="ok")),
+            prompt_tokens=Sum("prompt_tokens"),
+            completion_tokens=Sum("completion_tokens"),
+        )
+
         response = {
             "totals": {
                 "short_answers": base_queryset.count(),
@@ -183,6 +195,14 @@ class AdminAIUsageView(APIView):
                     else None
                 ),
             },
+            "cache": explanation_cache.stats(),
+            "api_calls_7d": {
+                "calls": call_stats["calls"],
+                "errors": call_stats["errors"],
+                "average_latency_ms": call_stats["average_latency_ms"],
+                "prompt_tokens": call_stats["prompt_tokens"] or 0,
+                "completion_tokens": call_stats["completion_tokens"] or 0,
+            },
             "recent_examples": recent,
         }
 
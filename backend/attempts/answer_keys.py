@@ -0,0 +1,116 @@
+# attempts/answer_keys.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from questions.models import MCQQuestion
+
+# Cached value for questions without an MCQ key (short answers are never graded)
+NO_KEY = None
+
+VERSION_KEY = "attempts:answer_keys:version"
+
+
+def _shared_cache():
+    return caches[getattr(settings, "ATTEMPT_ANSWER_KEY_CACHE_ALIAS", "default")]
+
+
+def current_version() -> int:
+    """Version of the MCQ answer keys in the shared cache; bumped after every committed key edit."""
+    cache = _shared_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so a version evicted from the cache never repeats an old one
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _bump_version():
+    cache = _shared_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), None)
+
+
+class AnswerKeyCache:
+    """
+    Per-process LRU of question id -> sorted tuple of correct MCQ options (NO_KEY for
+    non-MCQ questions). Each entry records the shared-cache version it was loaded under;
+    attempts.signals bumps that version once an MCQQuestion save/delete commits, so every
+    worker process drops its copies on its next lookup. Entries also expire after `ttl` seconds.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, question_ids) -> dict:
+        """Answer keys for `question_ids`, loading every miss in one query."""
+        found = {}
+        now = time.monotonic()
+        # Read the version before any key, so a key loaded while an edit commits is tagged with the older one
+        version = current_version()
+        with self._lock:
+            for question_id in question_ids:
+                entry = self._entries.get(question_id)
+                if entry is not None and entry[2] == version and now - entry[1] < self.ttl:
+                    self._entries.move_to_end(question_id)
+                    found[question_id] = entry[0]
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        missing = [question_id for question_id in question_ids if question_id not in found]
+        if missing:
+            loaded = {question_id: NO_KEY for question_id in missing}
+            for question_id, correct in MCQQuestion.objects.filter(question_id__in=missing).values_list(
+                "question_id", "correct_options",
+            ):
+                loaded[question_id] = tuple(sorted(correct))
+            with self._lock:
+                for question_id, key in loaded.items():
+                    self._entries[question_id] = (key, now, version)
+                    self._entries.move_to_end(question_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+            found.update(loaded)
+        return found
+
+    def get(self, question_id):
+        return self.get_many([question_id])[question_id]
+
+    def invalidate(self):
+        """Make every process reload its keys once the current transaction commits."""
+        transaction.on_commit(_bump_version)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+            }
+
+
+answer_keys = AnswerKeyCache(
+    max_size=getattr(settings, "ATTEMPT_ANSWER_KEY_CACHE_SIZE", 4096),
+    ttl=getattr(settings, "ATTEMPT_ANSWER_KEY_CACHE_TTL", 300),
+)
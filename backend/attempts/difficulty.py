@@ -0,0 +1,168 @@
+# attempts/difficulty.py
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from questions.models import Question
+
+from .models import DifficultyFit, UserAbility, UserQuestionProgress
+
+# Precision of the N(0, 1/PRIOR) prior on every ability and difficulty; keeps users or
+# questions with all-correct / all-wrong responses finite
+PRIOR = 1.0
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def fit_rasch(users, items, correct, n_users, n_items, prior=PRIOR, max_iter=50, tol=1e-4):
+    """
+    Joint MAP fit of the 1PL (Rasch) model P(correct) = sigmoid(ability - difficulty).
+    `users`/`items` are index arrays and `correct` 0/1 outcomes, one per response.
+    Alternates one Newton step on every ability and then on every difficulty; each
+    step is a pass of bincount sums over the response arrays.
+    Returns (ability, difficulty, iterations).
+    """
+    ability = np.zeros(n_users)
+    difficulty = np.zeros(n_items)
+    correct = np.asarray(correct, dtype=float)
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        p = _sigmoid(ability[users] - difficulty[items])
+        residual, weight = correct - p, p * (1 - p)
+        step_ability = (np.bincount(users, residual, n_users) - prior * ability) / (
+            np.bincount(users, weight, n_users) + prior
+        )
+        ability += step_ability
+
+        p = _sigmoid(ability[users] - difficulty[items])
+        residual, weight = correct - p, p * (1 - p)
+        step_difficulty = (-np.bincount(items, residual, n_items) - prior * difficulty) / (
+            np.bincount(items, weight, n_items) + prior
+        )
+        difficulty += step_difficulty
+
+        if max(np.abs(step_ability).max(initial=0), np.abs(step_difficulty).max(initial=0)) < tol:
+            break
+    return ability, difficulty, iterations
+
+
+def update_rasch(users, items, correct, ability, difficulty, user_seen, item_seen, prior=PRIOR):
+    """
+    Fold a batch of new responses into existing estimates with one Newton step each.
+    An estimate backed by `seen` earlier responses counts as a prior of precision
+    prior + seen / 4 (the information of that many coin-flip responses), so
+    established users and questions move less than new ones.
+    Returns new (ability, difficulty) arrays.
+    """
+    correct = np.asarray(correct, dtype=float)
+    n_users, n_items = len(ability), len(difficulty)
+    p = _sigmoid(ability[users] - difficulty[items])
+    residual, weight = correct - p, p * (1 - p)
+    ability = ability + np.bincount(users, residual, n_users) / (
+        np.bincount(users, weight, n_users) + prior + user_seen / 4
+    )
+    difficulty = difficulty - np.bincount(items, residual, n_items) / (
+        np.bincount(items, weight, n_items) + prior + item_seen / 4
+    )
+    return ability, difficulty
+
+
+def _responses(queryset):
+    """(user ids, question ids, 0/1 outcomes) of first attempts at graded (MCQ) questions."""
+    rows = list(
+        queryset.filter(first_attempt__is_correct__isnull=False)
+        .values_list("user_id", "question_id", "first_attempt__is_correct")
+        .iterator()
+    )
+    user_ids = [row[0] for row in rows]
+    question_ids = [row[1] for row in rows]
+    outcomes = np.fromiter((row[2] for row in rows), dtype=float, count=len(rows))
+    return user_ids, question_ids, outcomes
+
+
+def _index(ids):
+    """(distinct ids in first-seen order, index array into them)."""
+    positions = {}
+    index = np.fromiter((positions.setdefault(i, len(positions)) for i in ids), dtype=np.int64, count=len(ids))
+    return list(positions), index
+
+
+def _save(user_ids, ability, user_responses, question_ids, difficulty, question_responses):
+    UserAbility.objects.bulk_create(
+        [
+            UserAbility(user_id=user_id, ability=float(a), responses=int(n))
+            for user_id, a, n in zip(user_ids, ability, user_responses)
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["ability", "responses", "updated_at"],
+    )
+    questions = [
+        Question(id=question_id, difficulty=float(b), difficulty_responses=int(n))
+        for question_id, b, n in zip(question_ids, difficulty, question_responses)
+    ]
+    Question.objects.bulk_update(questions, ["difficulty", "difficulty_responses"], batch_size=1000)
+
+
+def estimate_difficulty(incremental=False, log=None) -> dict:
+    """
+    Fit question difficulty and user ability from first-attempt MCQ outcomes.
+    A full run refits everything; an incremental run folds in only first attempts made
+    since the last run (falling back to a full run if there is none).
+    Returns {"mode", "responses", "users", "questions", "iterations"}.
+    """
+    started = timezone.now()
+    last = DifficultyFit.objects.order_by("-started_at").first() if incremental else None
+    progress = UserQuestionProgress.objects.all()
+
+    if last is None:
+        user_ids, question_ids, outcomes = _responses(progress)
+        users, user_index = _index(user_ids)
+        questions, item_index = _index(question_ids)
+        ability, difficulty, iterations = fit_rasch(user_index, item_index, outcomes, len(users), len(questions))
+        user_responses = np.bincount(user_index, minlength=len(users))
+        question_responses = np.bincount(item_index, minlength=len(questions))
+        mode = DifficultyFit.Mode.FULL
+    else:
+        user_ids, question_ids, outcomes = _responses(
+            progress.filter(first_attempt__submitted_at__gt=last.started_at)
+        )
+        users, user_index = _index(user_ids)
+        questions, item_index = _index(question_ids)
+        known_users = {
+            user_id: (a, n) for user_id, a, n in
+            UserAbility.objects.filter(user_id__in=users).values_list("user_id", "ability", "responses")
+        }
+        known_questions = {
+            question_id: (b or 0.0, n) for question_id, b, n in
+            Question.objects.filter(id__in=questions).values_list("id", "difficulty", "difficulty_responses")
+        }
+        ability = np.array([known_users.get(u, (0.0, 0))[0] for u in users], dtype=float)
+        user_seen = np.array([known_users.get(u, (0.0, 0))[1] for u in users], dtype=float)
+        difficulty = np.array([known_questions.get(q, (0.0, 0))[0] for q in questions], dtype=float)
+        item_seen = np.array([known_questions.get(q, (0.0, 0))[1] for q in questions], dtype=float)
+
+        ability, difficulty = update_rasch(
+            user_index, item_index, outcomes, ability, difficulty, user_seen, item_seen,
+        )
+        user_responses = user_seen + np.bincount(user_index, minlength=len(users))
+        question_responses = item_seen + np.bincount(item_index, minlength=len(questions))
+        iterations = 1
+        mode = DifficultyFit.Mode.INCREMENTAL
+
+    with transaction.atomic():
+        _save(users, ability, user_responses, questions, difficulty, question_responses)
+        DifficultyFit.objects.create(mode=mode, started_at=started, responses=len(outcomes), iterations=iterations)
+    if log:
+        log(f"{mode} fit: {len(outcomes)} responses from {len(users)} users on {len(questions)} questions")
+    return {
+        "mode": mode,
+        "responses": len(outcomes),
+        "users": len(users),
+        "questions": len(questions),
+        "iterations": iterations,
+    }
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from attempts.difficulty import estimate_difficulty
+
+
+class Command(BaseCommand):
+    help = "Fit question difficulty and user ability (1PL IRT) from first-attempt MCQ outcomes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental", action="store_true",
+            help="Fold in only first attempts since the last run (full fit if there is none).",
+        )
+
+    def handle(self, *args, **options):
+        totals = estimate_difficulty(incremental=options["incremental"], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['mode'].capitalize()} fit of {totals['responses']} responses: "
+            f"{totals['questions']} questions, {totals['users']} users, {totals['iterations']} iterations."
+        ))
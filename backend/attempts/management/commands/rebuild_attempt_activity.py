@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from attempts.services import rebuild_activity
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-user activity year vectors behind the heatmap from the daily rollups."
+
+    def handle(self, *args, **options):
+        count = rebuild_activity()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} user activity years."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from attempts.services import rebuild_progress
+
+
+class Command(BaseCommand):
+    help = "Recompute the UserQuestionProgress table from raw attempts."
+
+    def handle(self, *args, **options):
+        count = rebuild_progress()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} user/question progress rows."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from attempts.services import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the AttemptDailyRollup table from raw attempts."
+
+    def handle(self, *args, **options):
+        count = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} attempt rollup buckets."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from attempts.services import rebuild_streaks
+
+
+class Command(BaseCommand):
+    help = "Recompute the UserStreak table from the daily attempt rollups."
+
+    def handle(self, *args, **options):
+        count = rebuild_streaks()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt streaks for {count} users."))
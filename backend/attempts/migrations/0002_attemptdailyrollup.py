@@ -0,0 +1,71 @@
+# Generated by Django 5.2.5 on 2026-10-17 16:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    """Populate AttemptDailyRollup from existing attempts"""
+    Attempt = apps.get_model("attempts", "Attempt")
+    AttemptDailyRollup = apps.get_model("attempts", "AttemptDailyRollup")
+
+    rows = (
+        Attempt.objects
+        .annotate(day=TruncDate("submitted_at"))
+        .values("attempter", "day", "question__week", "question__topic")
+        .annotate(
+            attempts=Count("id"),
+            correct=Count("id", filter=Q(is_correct=True)),
+            last_submitted_at=Max("submitted_at"),
+        )
+        .order_by()
+    )
+    merged = {}
+    for row in rows:
+        key = (row["attempter"], row["day"], row["question__week"] or "", row["question__topic"] or "")
+        bucket = merged.setdefault(key, {"attempts": 0, "correct": 0, "last_submitted_at": None})
+        bucket["attempts"] += row["attempts"]
+        bucket["correct"] += row["correct"]
+        if bucket["last_submitted_at"] is None or row["last_submitted_at"] > bucket["last_submitted_at"]:
+            bucket["last_submitted_at"] = row["last_submitted_at"]
+
+    AttemptDailyRollup.objects.bulk_create(
+        [
+            AttemptDailyRollup(attempter_id=attempter_id, date=day, week=week, topic=topic, **values)
+            for (attempter_id, day, week, topic), values in merged.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attempts", "0001_initial"),
+        ("questions", "0007_savedquestion"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttemptDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("week", models.CharField(blank=True, default="", max_length=50)),
+                ("topic", models.CharField(blank=True, default="", max_length=100)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("correct", models.PositiveIntegerField(default=0)),
+                ("last_submitted_at", models.DateTimeField(blank=True, null=True)),
+                ("attempter", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="attempt_rollups", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["date"], name="attempt_rollup_date_idx"), models.Index(fields=["week", "date"], name="attempt_rollup_week_idx")],
+                "constraints": [models.UniqueConstraint(fields=("attempter", "date", "week", "topic"), name="attempt_rollup_bucket_unique")],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
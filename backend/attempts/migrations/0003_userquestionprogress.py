@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-17 17:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_progress(apps, schema_editor):
+    """Populate UserQuestionProgress from existing attempts"""
+    Attempt = apps.get_model("attempts", "Attempt")
+    UserQuestionProgress = apps.get_model("attempts", "UserQuestionProgress")
+
+    rows = {}
+    attempts = Attempt.objects.order_by("submitted_at", "id").values_list(
+        "id", "attempter_id", "question_id", "is_correct", "submitted_at",
+    )
+    for attempt_id, user_id, question_id, is_correct, submitted_at in attempts.iterator():
+        row = rows.get((user_id, question_id))
+        if row is None:
+            row = rows[(user_id, question_id)] = UserQuestionProgress(
+                user_id=user_id, question_id=question_id, first_attempt_id=attempt_id,
+            )
+        row.last_attempt_id = attempt_id
+        row.last_submitted_at = submitted_at
+        row.attempt_count += 1
+        row.ever_correct = row.ever_correct or bool(is_correct)
+    UserQuestionProgress.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attempts', '0002_attemptdailyrollup'),
+        ('questions', '0013_aicompletioncall'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserQuestionProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('ever_correct', models.BooleanField(default=False)),
+                ('last_submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('first_attempt', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='attempts.attempt')),
+                ('last_attempt', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='attempts.attempt')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_progress', to='questions.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-last_submitted_at'], name='progress_user_recent_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'question'), name='user_question_progress_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
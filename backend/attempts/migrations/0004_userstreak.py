@@ -0,0 +1,71 @@
+# Generated by Django 5.2.5 on 2026-10-17 17:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def streak_from_days(day_counts):
+    """Frozen copy of attempts.services.streak_from_days as of this migration."""
+    current = longest = 0
+    last_date = None
+    last_count = 0
+    for day, count in day_counts:
+        if last_date is not None and (day - last_date).days == 1:
+            current += 1
+        else:
+            current = 1
+        longest = max(longest, current)
+        last_date, last_count = day, count
+    return current, longest, last_date, last_count
+
+
+def backfill_streaks(apps, schema_editor):
+    """Populate UserStreak from the existing daily rollups"""
+    AttemptDailyRollup = apps.get_model("attempts", "AttemptDailyRollup")
+    UserStreak = apps.get_model("attempts", "UserStreak")
+
+    per_user = {}
+    rows = (
+        AttemptDailyRollup.objects.filter(attempts__gt=0)
+        .values_list("attempter_id", "date").annotate(count=Sum("attempts")).order_by("attempter_id", "date")
+    )
+    for user_id, day, count in rows:
+        per_user.setdefault(user_id, []).append((day, count))
+
+    streaks = []
+    for user_id, days in per_user.items():
+        current, longest, last_date, last_count = streak_from_days(days)
+        streaks.append(UserStreak(
+            user_id=user_id,
+            current_streak=current,
+            longest_streak=longest,
+            last_active_date=last_date,
+            last_active_count=last_count,
+        ))
+    UserStreak.objects.bulk_create(streaks, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attempts', '0003_userquestionprogress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStreak',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current_streak', models.PositiveIntegerField(default=0)),
+                ('longest_streak', models.PositiveIntegerField(default=0)),
+                ('last_active_date', models.DateField(blank=True, null=True)),
+                ('last_active_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='streak', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(backfill_streaks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.5 on 2026-10-17 17:56
+
+import sys
+from array import array
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+# Frozen copies of the attempts.services year-vector helpers as of this migration:
+# 366 little-endian unsigned ints per (user, year), slot = day of year - 1
+DAYS_PER_YEAR_VECTOR = 366
+
+
+def decode_counts(blob):
+    counts = array("I")
+    if blob:
+        counts.frombytes(bytes(blob))
+        if sys.byteorder == "big":
+            counts.byteswap()
+    if len(counts) < DAYS_PER_YEAR_VECTOR:
+        counts.extend([0] * (DAYS_PER_YEAR_VECTOR - len(counts)))
+    return counts
+
+
+def encode_counts(counts):
+    counts = array("I", counts)
+    if sys.byteorder == "big":
+        counts.byteswap()
+    return counts.tobytes()
+
+
+def day_slot(day):
+    return day.timetuple().tm_yday - 1
+
+
+def backfill_activity(apps, schema_editor):
+    """Populate UserActivityYear from the existing daily rollups"""
+    AttemptDailyRollup = apps.get_model("attempts", "AttemptDailyRollup")
+    UserActivityYear = apps.get_model("attempts", "UserActivityYear")
+
+    per_year = {}
+    rows = (
+        AttemptDailyRollup.objects.filter(attempts__gt=0)
+        .values_list("attempter_id", "date").annotate(count=Sum("attempts"))
+    )
+    for user_id, day, count in rows:
+        counts = per_year.setdefault((user_id, day.year), decode_counts(None))
+        counts[day_slot(day)] = count
+    UserActivityYear.objects.bulk_create(
+        [
+            UserActivityYear(user_id=user_id, year=year, counts=encode_counts(counts), version=1)
+            for (user_id, year), counts in per_year.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attempts', '0004_userstreak'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserActivityYear',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('counts', models.BinaryField()),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_years', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'year'), name='user_activity_year_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-17 18:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attempts', '0005_useractivityyear'),
+        ('questions', '0013_aicompletioncall'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attempt',
+            index=models.Index(fields=['attempter', '-submitted_at', '-id'], name='attempt_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attempt',
+            index=models.Index(fields=['question', '-submitted_at', '-id'], name='attempt_question_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attempt',
+            index=models.Index(fields=['attempter', 'question', '-submitted_at', '-id'], name='attempt_user_question_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attempt',
+            index=models.Index(condition=models.Q(('is_correct', True)), fields=['attempter', 'submitted_at'], name='attempt_user_correct_idx'),
+        ),
+    ]
@@ -17,5 +17,140 @@ class Attempt(models.Model):
     is_correct = models.BooleanField(null=True, blank=True)     #Only for MCQ
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Every hot read is "one user's / one question's / one user on one question's
+        # attempts, newest first"; id breaks submitted_at ties for keyset paging
+        indexes = [
+            models.Index(fields=["attempter", "-submitted_at", "-id"], name="attempt_user_recent_idx"),
+            models.Index(fields=["question", "-submitted_at", "-id"], name="attempt_question_recent_idx"),
+            models.Index(
+                fields=["attempter", "question", "-submitted_at", "-id"], name="attempt_user_question_idx",
+            ),
+            models.Index(
+                fields=["attempter", "submitted_at"],
+                condition=models.Q(is_correct=True),
+                name="attempt_user_correct_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.attempter} - {self.question} ({self.is_correct})"
+
+class AttemptDailyRollup(models.Model):
+    """
+    Attempt counts per (attempter, day, week, topic) bucket.
+    Kept current by attempts.signals; rebuilt by `manage.py rebuild_attempt_rollups`.
+    """
+    attempter = models.ForeignKey(User, on_delete=models.CASCADE, related_name="attempt_rollups")
+    date = models.DateField()
+    week = models.CharField(max_length=50, blank=True, default="")
+    topic = models.CharField(max_length=100, blank=True, default="")
+    attempts = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    last_submitted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["attempter", "date", "week", "topic"],
+                name="attempt_rollup_bucket_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date"], name="attempt_rollup_date_idx"),
+            models.Index(fields=["week", "date"], name="attempt_rollup_week_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.attempter} {self.date} {self.week}/{self.topic}: {self.attempts}"
+
+
+class UserQuestionProgress(models.Model):
+    """
+    One row per (user, question) the user has attempted: first/latest attempt, count
+    and whether any attempt was correct. Kept current by attempts.signals; rebuilt by
+    `manage.py rebuild_attempt_progress`.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="question_progress")
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name="user_progress")
+    first_attempt = models.ForeignKey(Attempt, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    last_attempt = models.ForeignKey(Attempt, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    attempt_count = models.PositiveIntegerField(default=0)
+    ever_correct = models.BooleanField(default=False)
+    last_submitted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "question"], name="user_question_progress_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "-last_submitted_at"], name="progress_user_recent_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} on {self.question_id}: {self.attempt_count} attempts"
+
+
+class UserStreak(models.Model):
+    """
+    A user's daily-activity streak as of last_active_date. Advanced per attempt by
+    attempts.services.record_streak; rebuilt by `manage.py rebuild_attempt_streaks`.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="streak")
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_active_date = models.DateField(null=True, blank=True)
+    last_active_count = models.PositiveIntegerField(default=0)   # attempts on last_active_date
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user}: {self.current_streak} days (best {self.longest_streak})"
+
+
+class UserActivityYear(models.Model):
+    """
+    One user's attempts per day for one calendar year, packed as 366 little-endian
+    uint32 counters (slot = day of year - 1; see attempts.services.decode_counts).
+    `version` is bumped on every write and feeds the activity heatmap's ETag.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="activity_years")
+    year = models.PositiveSmallIntegerField()
+    counts = models.BinaryField()
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "year"], name="user_activity_year_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} activity {self.year}"
+
+
+class UserAbility(models.Model):
+    """
+    A user's 1PL IRT ability (logits, on the same scale as Question.difficulty), from
+    their first attempt at each MCQ. Written by `manage.py estimate_question_difficulty`.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="ability")
+    ability = models.FloatField(default=0.0, db_index=True)
+    responses = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user}: ability {self.ability:.2f} ({self.responses} responses)"
+
+
+class DifficultyFit(models.Model):
+    """One difficulty/ability estimation run; the latest started_at is where an incremental run resumes."""
+    class Mode(models.TextChoices):
+        FULL = "full", "Full"
+        INCREMENTAL = "incremental", "Incremental"
+
+    mode = models.CharField(max_length=20, choices=Mode.choices)
+    started_at = models.DateTimeField(db_index=True)
+    responses = models.PositiveIntegerField(default=0)
+    iterations = models.PositiveIntegerField(default=0)
+
     def __str__(self):
-        return f"{self.attempter} - {self.question} ({self.is_correct})"
\ No newline at end of file
+        return f"{self.mode} fit at {self.started_at:%Y-%m-%d %H:%M} ({self.responses} responses)"
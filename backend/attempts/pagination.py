@@ -0,0 +1,21 @@
+from questions.pagination import KeysetPagination
+
+
+class AttemptHistoryPagination(KeysetPagination):
+    """
+    Keyset pages over attempt histories ordered (-submitted_at, -id), which the
+    attempt_*_recent_idx indexes serve directly. Always on: ?limit=N sizes the
+    page and ?cursor=<token> continues from the `next` link.
+    """
+    page_size = 50
+    max_page_size = 200
+
+
+class OptionalAttemptHistoryPagination(AttemptHistoryPagination):
+    """As AttemptHistoryPagination, but only when ?cursor= or ?limit= is given; otherwise the bare list."""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
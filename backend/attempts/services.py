@@ -0,0 +1,410 @@
+# attempts/services.py
+
+import sys
+from array import array
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from .models import Attempt, AttemptDailyRollup, UserActivityYear, UserQuestionProgress, UserStreak
+
+
+def normalize_answer(user_answer) -> list[str]:
+    """MCQ answers arrive as "B" or ["b", "D"]; compare them as upper-case option letters."""
+    if isinstance(user_answer, list):
+        return [str(ans).strip().upper() for ans in user_answer]
+    return [str(user_answer).strip().upper()]
+
+
+def grade(answer_key, user_answer):
+    """True/False for an MCQ answer against its sorted correct options; None for questions without a key."""
+    if answer_key is None:
+        return None
+    return tuple(sorted(normalize_answer(user_answer))) == tuple(answer_key)
+
+
+def _bucket(attempt):
+    question = attempt.question
+    return (
+        attempt.attempter_id,
+        timezone.localdate(attempt.submitted_at),
+        question.week or "",
+        question.topic or "",
+    )
+
+
+def _blank_or(field, value) -> Q:
+    """Match `value`, with "" also matching NULL (they share a rollup bucket)."""
+    if value:
+        return Q(**{field: value})
+    return Q(**{field: ""}) | Q(**{f"{field}__isnull": True})
+
+
+def _latest_in_bucket(attempter_id, day, week, topic):
+    """Subquery for the newest remaining Attempt.submitted_at in one rollup bucket (NULL when empty)."""
+    attempts = Attempt.objects.filter(
+        _blank_or("question__week", week),
+        _blank_or("question__topic", topic),
+        attempter_id=attempter_id,
+        submitted_at__date=day,
+    )
+    return Subquery(attempts.order_by("-submitted_at").values("submitted_at")[:1])
+
+
+def record_rollups(attempts, sign: int = 1):
+    """Fold newly created (sign=1) or deleted (sign=-1) attempts into their daily rollup buckets."""
+    buckets = defaultdict(lambda: {"attempts": 0, "correct": 0, "last_submitted_at": None})
+    for attempt in attempts:
+        totals = buckets[_bucket(attempt)]
+        totals["attempts"] += sign
+        if attempt.is_correct:
+            totals["correct"] += sign
+        if totals["last_submitted_at"] is None or attempt.submitted_at > totals["last_submitted_at"]:
+            totals["last_submitted_at"] = attempt.submitted_at
+
+    for (attempter_id, day, week, topic), totals in buckets.items():
+        lookup = {"attempter_id": attempter_id, "date": day, "week": week, "topic": topic}
+        if sign > 0:
+            AttemptDailyRollup.objects.get_or_create(**lookup)
+            last_submitted_at = totals["last_submitted_at"]
+            AttemptDailyRollup.objects.filter(**lookup).update(
+                attempts=F("attempts") + totals["attempts"],
+                correct=F("correct") + totals["correct"],
+                last_submitted_at=Case(
+                    When(
+                        Q(last_submitted_at__isnull=True) | Q(last_submitted_at__lt=last_submitted_at),
+                        then=Value(last_submitted_at),
+                    ),
+                    default=F("last_submitted_at"),
+                ),
+            )
+        else:
+            # last_submitted_at breaks ties on filtered leaderboards, so re-read it
+            AttemptDailyRollup.objects.filter(**lookup).update(
+                attempts=Greatest(F("attempts") + totals["attempts"], Value(0)),
+                correct=Greatest(F("correct") + totals["correct"], Value(0)),
+                last_submitted_at=_latest_in_bucket(attempter_id, day, week, topic),
+            )
+
+
+def rebuild_rollups() -> int:
+    """Recompute every rollup bucket from raw attempts. Returns the number of buckets written."""
+    rows = (
+        Attempt.objects
+        .annotate(day=TruncDate("submitted_at"))
+        .values("attempter", "day", "question__week", "question__topic")
+        .annotate(
+            attempts=Count("id"),
+            correct=Count("id", filter=Q(is_correct=True)),
+            last_submitted_at=Max("submitted_at"),
+        )
+        .order_by()
+    )
+    merged = {}
+    for row in rows:
+        # NULL and "" week/topic share a bucket
+        key = (row["attempter"], row["day"], row["question__week"] or "", row["question__topic"] or "")
+        bucket = merged.setdefault(key, {"attempts": 0, "correct": 0, "last_submitted_at": None})
+        bucket["attempts"] += row["attempts"]
+        bucket["correct"] += row["correct"]
+        if bucket["last_submitted_at"] is None or row["last_submitted_at"] > bucket["last_submitted_at"]:
+            bucket["last_submitted_at"] = row["last_submitted_at"]
+
+    rollups = [
+        AttemptDailyRollup(attempter_id=attempter_id, date=day, week=week, topic=topic, **values)
+        for (attempter_id, day, week, topic), values in merged.items()
+    ]
+    with transaction.atomic():
+        AttemptDailyRollup.objects.all().delete()
+        AttemptDailyRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
+
+
+# ---------- Per-user/per-question progress ----------
+def record_progress(attempts):
+    """Fold newly created attempts into their (user, question) progress rows, one upsert per pair."""
+    pairs = defaultdict(list)
+    for attempt in attempts:
+        pairs[(attempt.attempter_id, attempt.question_id)].append(attempt)
+
+    for (user_id, question_id), group in pairs.items():
+        first = min(group, key=lambda attempt: (attempt.submitted_at, str(attempt.pk)))
+        last = max(group, key=lambda attempt: (attempt.submitted_at, str(attempt.pk)))
+        UserQuestionProgress.objects.get_or_create(user_id=user_id, question_id=question_id)
+        updates = {
+            "attempt_count": F("attempt_count") + len(group),
+            "first_attempt": Case(
+                When(first_attempt__isnull=True, then=Value(first.pk)),
+                default=F("first_attempt"),
+            ),
+            "last_attempt": Case(
+                When(Q(last_submitted_at__isnull=True) | Q(last_submitted_at__lte=last.submitted_at), then=Value(last.pk)),
+                default=F("last_attempt"),
+            ),
+            "last_submitted_at": Case(
+                When(Q(last_submitted_at__isnull=True) | Q(last_submitted_at__lt=last.submitted_at), then=Value(last.submitted_at)),
+                default=F("last_submitted_at"),
+            ),
+        }
+        if any(attempt.is_correct for attempt in group):
+            updates["ever_correct"] = True
+        UserQuestionProgress.objects.filter(user_id=user_id, question_id=question_id).update(**updates)
+
+
+def refresh_progress(user_id, question_id):
+    """Recompute one progress row from its attempts (after a delete or an edit); drops it if none remain."""
+    attempts = Attempt.objects.filter(attempter_id=user_id, question_id=question_id)
+    first = attempts.order_by("submitted_at", "id").first()
+    if first is None:
+        UserQuestionProgress.objects.filter(user_id=user_id, question_id=question_id).delete()
+        return
+    last = attempts.order_by("-submitted_at", "-id").first()
+    UserQuestionProgress.objects.update_or_create(
+        user_id=user_id,
+        question_id=question_id,
+        defaults={
+            "first_attempt": first,
+            "last_attempt": last,
+            "attempt_count": attempts.count(),
+            "ever_correct": attempts.filter(is_correct=True).exists(),
+            "last_submitted_at": last.submitted_at,
+        },
+    )
+
+
+def rebuild_progress() -> int:
+    """Recompute every progress row from raw attempts. Returns the number of rows written."""
+    rows = {}
+    for attempt in Attempt.objects.order_by("submitted_at", "id").values_list(
+        "id", "attempter_id", "question_id", "is_correct", "submitted_at",
+    ).iterator():
+        attempt_id, user_id, question_id, is_correct, submitted_at = attempt
+        row = rows.get((user_id, question_id))
+        if row is None:
+            row = rows[(user_id, question_id)] = UserQuestionProgress(
+                user_id=user_id, question_id=question_id, first_attempt_id=attempt_id,
+            )
+        row.last_attempt_id = attempt_id
+        row.last_submitted_at = submitted_at
+        row.attempt_count += 1
+        row.ever_correct = row.ever_correct or bool(is_correct)
+
+    with transaction.atomic():
+        UserQuestionProgress.objects.all().delete()
+        UserQuestionProgress.objects.bulk_create(rows.values(), batch_size=1000)
+    return len(rows)
+
+
+# ---------- Streaks ----------
+def streak_from_days(day_counts):
+    """
+    (current_streak, longest_streak, last_active_date, last_active_count) from
+    (date, attempts) pairs in ascending date order. current_streak is as of the last date.
+    """
+    current = longest = 0
+    last_date = None
+    last_count = 0
+    for day, count in day_counts:
+        if last_date is not None and (day - last_date).days == 1:
+            current += 1
+        else:
+            current = 1
+        longest = max(longest, current)
+        last_date, last_count = day, count
+    return current, longest, last_date, last_count
+
+
+def _advance_streak(user_id, day, count) -> bool:
+    """
+    Fold `count` attempts on `day` into the user's streak with one conditional UPDATE
+    (SET expressions all read the pre-update row). Returns False when there is no row
+    to advance: the user has no streak yet, or `day` is before last_active_date.
+    """
+    new_current = Case(
+        When(last_active_date=day, then=F("current_streak")),
+        When(last_active_date=day - timedelta(days=1), then=F("current_streak") + 1),
+        default=Value(1),
+    )
+    updated = UserStreak.objects.filter(
+        Q(last_active_date__isnull=True) | Q(last_active_date__lte=day), user_id=user_id,
+    ).update(
+        current_streak=new_current,
+        longest_streak=Greatest(F("longest_streak"), new_current),
+        last_active_count=Case(When(last_active_date=day, then=F("last_active_count") + count), default=Value(count)),
+        last_active_date=day,
+        updated_at=timezone.now(),
+    )
+    return updated > 0
+
+
+def record_streak(attempts):
+    """Advance each user's streak with newly created attempts; one UPDATE per user and day."""
+    per_user = defaultdict(lambda: defaultdict(int))
+    for attempt in attempts:
+        per_user[attempt.attempter_id][timezone.localdate(attempt.submitted_at)] += 1
+
+    for user_id, days in per_user.items():
+        for day in sorted(days):
+            if _advance_streak(user_id, day, days[day]):
+                continue
+            _, created = UserStreak.objects.get_or_create(user_id=user_id)
+            if created:
+                # The user's first streak row: advance it like any other
+                _advance_streak(user_id, day, days[day])
+                continue
+            # Back-dated attempt: the stored state cannot absorb it, so recompute from the rollups
+            refresh_streak(user_id)
+            break
+
+
+def refresh_streak(user_id, create: bool = True):
+    """
+    Recompute one user's streak from their daily rollups (after deletes, edits or
+    out-of-order attempts). With create=False only an existing row is updated: the
+    delete path must not re-insert a row for a user whose deletion is cascading.
+    """
+    days = (
+        AttemptDailyRollup.objects.filter(attempter_id=user_id, attempts__gt=0)
+        .values_list("date").annotate(count=Sum("attempts")).order_by("date")
+    )
+    current, longest, last_date, last_count = streak_from_days(days)
+    fields = {
+        "current_streak": current,
+        "longest_streak": longest,
+        "last_active_date": last_date,
+        "last_active_count": last_count,
+    }
+    if create:
+        UserStreak.objects.update_or_create(user_id=user_id, defaults=fields)
+    else:
+        UserStreak.objects.filter(user_id=user_id).update(**fields, updated_at=timezone.now())
+
+
+def rebuild_streaks() -> int:
+    """Recompute every user's streak from the daily rollups. Returns the number of users written."""
+    rows = (
+        AttemptDailyRollup.objects.filter(attempts__gt=0)
+        .values_list("attempter_id", "date").annotate(count=Sum("attempts")).order_by("attempter_id", "date")
+    )
+    per_user = defaultdict(list)
+    for user_id, day, count in rows:
+        per_user[user_id].append((day, count))
+
+    streaks = []
+    for user_id, days in per_user.items():
+        current, longest, last_date, last_count = streak_from_days(days)
+        streaks.append(UserStreak(
+            user_id=user_id,
+            current_streak=current,
+            longest_streak=longest,
+            last_active_date=last_date,
+            last_active_count=last_count,
+        ))
+    with transaction.atomic():
+        UserStreak.objects.all().delete()
+        UserStreak.objects.bulk_create(streaks, batch_size=1000)
+    return len(streaks)
+
+
+# ---------- Activity heatmap ----------
+DAYS_PER_YEAR_VECTOR = 366
+
+
+def decode_counts(blob) -> array:
+    """UserActivityYear.counts as a 366-slot array of unsigned ints (slot = day of year - 1)."""
+    counts = array("I")
+    if blob:
+        counts.frombytes(bytes(blob))
+        if sys.byteorder == "big":
+            counts.byteswap()
+    if len(counts) < DAYS_PER_YEAR_VECTOR:
+        counts.extend([0] * (DAYS_PER_YEAR_VECTOR - len(counts)))
+    return counts
+
+
+def encode_counts(counts) -> bytes:
+    counts = array("I", counts)
+    if sys.byteorder == "big":
+        counts.byteswap()
+    return counts.tobytes()
+
+
+def day_slot(day) -> int:
+    return day.timetuple().tm_yday - 1
+
+
+def record_activity(attempts, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) attempts from their users' per-day year vectors."""
+    per_year = defaultdict(lambda: defaultdict(int))
+    for attempt in attempts:
+        day = timezone.localdate(attempt.submitted_at)
+        per_year[(attempt.attempter_id, day.year)][day_slot(day)] += sign
+
+    for (user_id, year), slots in per_year.items():
+        # No savepoint: a failure here must roll back the attempt write around it anyway
+        with transaction.atomic(savepoint=False):
+            row = UserActivityYear.objects.select_for_update().filter(user_id=user_id, year=year).first()
+            if row is None:
+                if sign < 0:
+                    # Nothing recorded to remove (or the user's deletion is cascading): never re-insert
+                    continue
+                UserActivityYear.objects.get_or_create(
+                    user_id=user_id, year=year, defaults={"counts": encode_counts(decode_counts(None))},
+                )
+                row = UserActivityYear.objects.select_for_update().get(user_id=user_id, year=year)
+            counts = decode_counts(row.counts)
+            for slot, delta in slots.items():
+                counts[slot] = max(counts[slot] + delta, 0)
+            row.counts = encode_counts(counts)
+            row.version += 1
+            row.save(update_fields=["counts", "version"])
+
+
+def activity_between(user_id, start, end):
+    """
+    ({date: attempts} for days with activity in [start, end], version tag) read from at
+    most two year rows. The tag changes whenever either row is written.
+    """
+    rows = UserActivityYear.objects.filter(user_id=user_id, year__gte=start.year, year__lte=end.year)
+    years = {row.year: row for row in rows}
+    tag = "-".join(f"{year}.{years[year].version}" for year in sorted(years))
+
+    activity = {}
+    day = start
+    while day <= end:
+        row = years.get(day.year)
+        if row is None:
+            day = day.replace(year=day.year + 1, month=1, day=1)
+            continue
+        counts = decode_counts(row.counts)
+        last = min(end, day.replace(month=12, day=31))
+        while day <= last:
+            count = counts[day_slot(day)]
+            if count:
+                activity[day] = count
+            day += timedelta(days=1)
+    return activity, tag
+
+
+def rebuild_activity() -> int:
+    """Recompute every year vector from the daily rollups. Returns the number of rows written."""
+    per_year = defaultdict(lambda: decode_counts(None))
+    rows = (
+        AttemptDailyRollup.objects.filter(attempts__gt=0)
+        .values_list("attempter_id", "date").annotate(count=Sum("attempts"))
+    )
+    for user_id, day, count in rows:
+        per_year[(user_id, day.year)][day_slot(day)] = count
+
+    vectors = [
+        UserActivityYear(user_id=user_id, year=year, counts=encode_counts(counts), version=1)
+        for (user_id, year), counts in per_year.items()
+    ]
+    with transaction.atomic():
+        UserActivityYear.objects.all().delete()
+        UserActivityYear.objects.bulk_create(vectors, batch_size=1000)
+    return len(vectors)
@@ -0,0 +1,84 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .answer_keys import answer_keys
+from .models import Attempt
+from . import services
+from questions.models import MCQQuestion, Question
+from questions.recommendations import forget_user
+from questions.services import record_question_attempts
+
+# Sent with `attempts=[...]` after Attempt.objects.bulk_create, which skips post_save
+attempts_bulk_created = Signal()
+
+
+@receiver(pre_save, sender=Attempt)
+def remember_stored_attempt(sender, instance, **kwargs):
+    """
+    Keep the stored row of an attempt being updated so receivers can move it
+    between aggregates. Attempts are normally insert-only, so this rarely queries.
+    """
+    instance._stored_attempt = None
+    if not instance._state.adding:
+        instance._stored_attempt = (
+            Attempt.objects.select_related("question").filter(pk=instance.pk).first()
+        )
+
+
+@receiver(post_save, sender=Attempt)
+def add_attempt_to_rollup(sender, instance, created, **kwargs):
+    if created:
+        services.record_rollups([instance])
+        services.record_progress([instance])
+        services.record_streak([instance])
+        services.record_activity([instance])
+        record_question_attempts([instance.question_id])
+        forget_user(instance.attempter_id)
+        return
+    stored = getattr(instance, "_stored_attempt", None)
+    if stored is not None:
+        services.record_rollups([stored], sign=-1)
+        services.record_rollups([instance])
+        services.refresh_progress(stored.attempter_id, stored.question_id)
+        if (stored.attempter_id, stored.question_id) != (instance.attempter_id, instance.question_id):
+            services.refresh_progress(instance.attempter_id, instance.question_id)
+        if (stored.attempter_id, stored.submitted_at) != (instance.attempter_id, instance.submitted_at):
+            services.refresh_streak(stored.attempter_id)
+            services.refresh_streak(instance.attempter_id)
+            services.record_activity([stored], sign=-1)
+            services.record_activity([instance])
+        if stored.question_id != instance.question_id:
+            record_question_attempts([stored.question_id], sign=-1)
+            record_question_attempts([instance.question_id])
+
+
+@receiver(post_delete, sender=Attempt)
+def remove_attempt_from_rollup(sender, instance, **kwargs):
+    services.record_rollups([instance], sign=-1)
+    services.refresh_progress(instance.attempter_id, instance.question_id)
+    services.refresh_streak(instance.attempter_id, create=False)
+    services.record_activity([instance], sign=-1)
+    record_question_attempts([instance.question_id], sign=-1)
+    forget_user(instance.attempter_id)
+
+
+@receiver(attempts_bulk_created, sender=Attempt)
+def add_bulk_attempts_to_rollup(sender, attempts, **kwargs):
+    services.record_rollups(attempts)
+    services.record_progress(attempts)
+    services.record_streak(attempts)
+    services.record_activity(attempts)
+    record_question_attempts([attempt.question_id for attempt in attempts])
+    for user_id in {attempt.attempter_id for attempt in attempts}:
+        forget_user(user_id)
+
+
+@receiver(post_save, sender=MCQQuestion)
+@receiver(post_delete, sender=MCQQuestion)
+def forget_answer_key(sender, instance, **kwargs):
+    answer_keys.invalidate()
+
+
+@receiver(post_delete, sender=Question)
+def forget_deleted_question_key(sender, instance, **kwargs):
+    answer_keys.invalidate()
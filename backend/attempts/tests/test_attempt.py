@@ -163,8 +163,48 @@ class AttemptTests(APITestCase):
         url = reverse("question-attempts", kwargs={"question_id": self.mcq_question.id})
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertFalse(response.data[0]["is_correct"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+        self.assertFalse(response.data["results"][0]["is_correct"])
+
+    def test_question_attempts_keyset_pages(self):
+        """Question history is served newest first in bounded pages with no repeats"""
+        created = [
+            Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="A", is_correct=False)
+            for _ in range(5)
+        ]
+        url = reverse("question-attempts", kwargs={"question_id": self.mcq_question.id})
+        seen = []
+        response = self.client.get(url, {"limit": 2})
+        while True:
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(item["id"] for item in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, [str(a.id) for a in sorted(created, key=lambda a: (a.submitted_at, a.id), reverse=True)])
+
+    def test_attempt_history_since_and_compact_view(self):
+        """since= returns only newer attempts; view=compact returns the projected fields"""
+        old = Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="A", is_correct=False)
+        new = Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="D", is_correct=True)
+        url = reverse("user-question-attempts", kwargs={"question_id": self.mcq_question.id})
+
+        response = self.client.get(url, {"since": old.submitted_at.isoformat()})
+        self.assertEqual([item["id"] for item in response.data], [str(new.id)])
+
+        response = self.client.get(url, {"view": "compact"})
+        self.assertEqual(
+            [(str(item["id"]), item["is_correct"]) for item in response.data],
+            [(str(new.id), True), (str(old.id), False)],
+        )
+        self.assertEqual(set(response.data[0]), {"id", "question", "is_correct", "submitted_at"})
+
+        response = self.client.get(url, {"limit": 1, "view": "compact"})
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNotNone(response.data["next"])
+
+        self.assertEqual(self.client.get(url, {"since": "yesterday"}).status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_list_attempts_unauthenticated(self):
         """Unauthorized attempt list access"""
@@ -195,9 +235,350 @@ class AttemptTests(APITestCase):
         self.assertIn("total_attempts", response.data)
         self.assertGreaterEqual(response.data["total_attempts"], 3)
 
+    def test_user_activity_heatmap_etag(self):
+        """A repeat request with the ETag gets 304 without reading attempts; a new attempt changes the tag"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="D", is_correct=True)
+        url = reverse("user-activity-heatmap")
+        first = self.client.get(url)
+        self.assertEqual(first.data["activity"], {str(timezone.localdate()): 1})
+        etag = first["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(any("attempts_attempt" in q["sql"] for q in queries.captured_queries))
+
+        Attempt.objects.create(attempter=self.user, question=self.short_question, answer="x")
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(fresh["ETag"], etag)
+        self.assertEqual(fresh.data["total_attempts"], 2)
+
+    def test_user_activity_heatmap_vector_layout(self):
+        """layout=vector returns one count per day, oldest first, and follows deletes"""
+        attempt = Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="D", is_correct=True)
+        Attempt.objects.create(attempter=self.user, question=self.short_question, answer="x")
+        attempt.delete()
+
+        data = self.client.get(reverse("user-activity-heatmap"), {"layout": "vector"}).data
+        self.assertEqual(len(data["counts"]), 366)
+        self.assertEqual(data["counts"][-1], 1)
+        self.assertEqual(sum(data["counts"]), data["total_attempts"])
+
+    def test_rebuild_attempt_activity_command(self):
+        """rebuild_attempt_activity restores the year vectors from the rollups"""
+        from django.core.management import call_command
+        from attempts.models import UserActivityYear
+
+        Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="D", is_correct=True)
+        UserActivityYear.objects.all().delete()
+        call_command("rebuild_attempt_activity")
+
+        data = self.client.get(reverse("user-activity-heatmap")).data
+        self.assertEqual(data["activity"], {str(timezone.localdate()): 1})
+
     def test_user_activity_heatmap_unauthenticated(self):
         """Unauthorized user cannot access heatmap"""
         self.client.logout()
         url = reverse("user-activity-heatmap")
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    # --- Rollup Tests ---
+    def test_attempt_updates_daily_rollup(self):
+        """Creating attempts folds them into the (user, date, week, topic) bucket"""
+        from attempts.models import AttemptDailyRollup
+
+        url = reverse("attempt-create")
+        self.client.post(url, {"question": str(self.mcq_question.id), "answer": "D"}, format="json")
+        self.client.post(url, {"question": str(self.mcq_question.id), "answer": "A"}, format="json")
+
+        rollup = AttemptDailyRollup.objects.get(attempter=self.user, week="Week1", topic="Math")
+        self.assertEqual(rollup.attempts, 2)
+        self.assertEqual(rollup.correct, 1)
+        self.assertEqual(rollup.date, timezone.localdate())
+
+    def test_deleting_newest_attempt_moves_rollup_tie_break_back(self):
+        """Filtered leaderboards break ties on the bucket's newest remaining attempt"""
+        from attempts.models import AttemptDailyRollup
+
+        other = User.objects.create_user(username="rollup_other", password="StrongPass123!")
+        first = Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="A", is_correct=False)
+        Attempt.objects.create(attempter=other, question=self.mcq_question, answer="A", is_correct=False)
+        newest = Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="A", is_correct=False)
+        newest.delete()
+
+        rollup = AttemptDailyRollup.objects.get(attempter=self.user, week="Week1", topic="Math")
+        self.assertEqual(rollup.last_submitted_at, first.submitted_at)
+        results = self.client.get(reverse("leaderboard-list") + "?week=Week1").data["results"]
+        self.assertEqual([row["user_id"] for row in results], [self.user.id, other.id])
+
+    def test_rebuild_attempt_rollups_command(self):
+        """rebuild_attempt_rollups recreates buckets from raw attempts"""
+        from django.core.management import call_command
+        from attempts.models import AttemptDailyRollup
+
+        Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="D", is_correct=True)
+        Attempt.objects.create(attempter=self.user, question=self.short_question, answer="x")
+        AttemptDailyRollup.objects.all().delete()
+
+        call_command("rebuild_attempt_rollups")
+
+        self.assertEqual(AttemptDailyRollup.objects.filter(attempter=self.user).count(), 2)
+        streak = self.client.get(reverse("user-streak")).data
+        self.assertEqual(streak["today_count"], 2)
+        self.assertEqual(streak["current_streak"], 1)
+
+    # --- Streak Tests ---
+    def test_streak_advances_per_attempt(self):
+        """record_streak extends, resets and counts days from the stored row alone"""
+        from attempts import services
+        from attempts.models import UserStreak
+
+        now = timezone.now()
+        for days_ago in (4, 2, 1, 0, 0):
+            services.record_streak([Attempt(attempter=self.user, submitted_at=now - timedelta(days=days_ago))])
+
+        streak = UserStreak.objects.get(user=self.user)
+        self.assertEqual(streak.current_streak, 3)
+        self.assertEqual(streak.longest_streak, 3)
+        self.assertEqual(streak.last_active_date, timezone.localdate(now))
+        self.assertEqual(streak.last_active_count, 2)
+
+        data = self.client.get(reverse("user-streak")).data
+        self.assertEqual(data["current_streak"], 3)
+        self.assertEqual(data["today_count"], 2)
+        self.assertTrue(data["has_attempted_today"])
+
+    def test_attempt_create_query_count(self):
+        """A repeat attempt touches each derived table with a fixed number of queries"""
+        url = reverse("attempt-create")
+        self.client.post(url, {"question": str(self.mcq_question.id), "answer": "D"}, format="json")
+        # Session and user; the view's savepoint; question lookup and INSERT; rollup, progress
+        # and standing (SELECT + UPDATE each); streak (1 UPDATE); activity year (locked SELECT +
+        # UPDATE); num_attempts UPDATE
+        with self.assertNumQueries(16):
+            self.client.post(url, {"question": str(self.mcq_question.id), "answer": "A"}, format="json")
+
+    def test_streak_lapses_after_missed_day(self):
+        """A streak last extended two days ago reads as broken, but longest is kept"""
+        from attempts.models import UserStreak
+
+        UserStreak.objects.create(
+            user=self.user, current_streak=5, longest_streak=7,
+            last_active_date=timezone.localdate() - timedelta(days=2), last_active_count=3,
+        )
+        data = self.client.get(reverse("user-streak")).data
+        self.assertEqual(data["current_streak"], 0)
+        self.assertEqual(data["longest_streak"], 7)
+        self.assertEqual(data["today_count"], 0)
+        self.assertFalse(data["has_attempted_today"])
+
+    def test_streak_follows_deletes_and_rebuild(self):
+        """Deleting attempts recomputes the streak; rebuild_attempt_streaks restores lost rows"""
+        from django.core.management import call_command
+        from attempts.models import UserStreak
+
+        first = Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="D", is_correct=True)
+        Attempt.objects.create(attempter=self.user, question=self.short_question, answer="x")
+        self.assertEqual(self.client.get(reverse("user-streak")).data["today_count"], 2)
+
+        first.delete()
+        self.assertEqual(self.client.get(reverse("user-streak")).data["today_count"], 1)
+
+        UserStreak.objects.all().delete()
+        call_command("rebuild_attempt_streaks")
+        data = self.client.get(reverse("user-streak")).data
+        self.assertEqual(data["current_streak"], 1)
+        self.assertEqual(data["today_count"], 1)
+
+    def test_deleting_user_with_attempts_cascades(self):
+        """The attempt delete signals must not re-insert streak or activity rows for a user being deleted"""
+        from attempts.models import UserActivityYear, UserStreak
+
+        attempter = User.objects.create_user(username="leaving@example.com", password="StrongPass123!")
+        Attempt.objects.create(attempter=attempter, question=self.mcq_question, answer="D", is_correct=True)
+        Attempt.objects.create(attempter=attempter, question=self.short_question, answer="x")
+        self.assertTrue(UserStreak.objects.filter(user=attempter).exists())
+
+        attempter.delete()
+        self.assertFalse(Attempt.objects.filter(attempter_id=attempter.pk).exists())
+        self.assertFalse(UserStreak.objects.filter(user_id=attempter.pk).exists())
+        self.assertFalse(UserActivityYear.objects.filter(user_id=attempter.pk).exists())
+
+    # --- Counter Tests ---
+    def test_attempt_counter_follows_creates_and_deletes(self):
+        """num_attempts is incremented and decremented in place, without recounting"""
+        url = reverse("attempt-create")
+        self.client.post(url, {"question": str(self.mcq_question.id), "answer": "D"}, format="json")
+        self.client.post(url, {"question": str(self.mcq_question.id), "answer": "A"}, format="json")
+        self.mcq_question.refresh_from_db()
+        self.assertEqual(self.mcq_question.num_attempts, 2)
+
+        Attempt.objects.filter(question=self.mcq_question).first().delete()
+        self.mcq_question.refresh_from_db()
+        self.assertEqual(self.mcq_question.num_attempts, 1)
+
+    def test_reconcile_question_counters_command(self):
+        """reconcile_question_counters repairs drifted attempt and rating counters"""
+        from django.core.management import call_command
+        from questions.models import QuestionRating
+
+        Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="D", is_correct=True)
+        QuestionRating.objects.create(question=self.mcq_question, user=self.user, score=4)
+        Question.objects.filter(pk=self.mcq_question.pk).update(num_attempts=7, rating=1.0, rating_sum=1, rating_count=3)
+
+        call_command("reconcile_question_counters")
+
+        self.mcq_question.refresh_from_db()
+        self.assertEqual(self.mcq_question.num_attempts, 1)
+        self.assertEqual((self.mcq_question.rating_sum, self.mcq_question.rating_count), (4, 1))
+        self.assertEqual(self.mcq_question.rating, 4.0)
+
+    # --- Bulk Submission Tests ---
+    def test_bulk_attempts_grade_and_update_counters(self):
+        """A practice set is graded, inserted and counted in one request"""
+        from attempts.models import AttemptDailyRollup
+        from leaderboard.models import LeaderboardStanding
+
+        url = reverse("attempt-bulk-create")
+        answers = [
+            {"question": str(self.mcq_question.id), "answer": "D"},
+            {"question": str(self.mcq_question.id), "answer": ["a"]},
+            {"question": str(self.short_question.id), "answer": "Many forms."},
+            {"question": str(uuid.uuid4()), "answer": "A"},
+            {"question": "not-a-uuid", "answer": "A"},
+        ]
+        response = self.client.post(url, {"answers": answers}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(response.data["correct"], 1)
+        results = response.data["results"]
+        self.assertEqual([item.get("is_correct") for item in results[:3]], [True, False, None])
+        self.assertEqual([item.get("error") for item in results[3:]], ["Question not found"] * 2)
+
+        self.mcq_question.refresh_from_db()
+        self.assertEqual(self.mcq_question.num_attempts, 2)
+        rollup = AttemptDailyRollup.objects.get(attempter=self.user, week="Week1", topic="Math")
+        self.assertEqual((rollup.attempts, rollup.correct), (2, 1))
+        standing = LeaderboardStanding.objects.get(user=self.user)
+        self.assertEqual((standing.attempts, standing.correct), (3, 1))
+
+    def test_bulk_attempt_queries_do_not_grow_with_set_size(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse("attempt-bulk-create")
+
+        def submit(count):
+            answers = [{"question": str(self.mcq_question.id), "answer": "D"}] * count
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(url, {"answers": answers}, format="json")
+            return len(queries)
+
+        submit(1)  # creates the rollup bucket and standing
+        self.assertEqual(submit(2), submit(20))
+
+    def test_bulk_attempts_rejects_bad_payloads(self):
+        url = reverse("attempt-bulk-create")
+        self.assertEqual(self.client.post(url, {"answers": []}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = [{"question": str(self.mcq_question.id), "answer": "D"}] * 101
+        self.assertEqual(self.client.post(url, {"answers": too_many}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Attempt.objects.count(), 0)
+
+    def test_bulk_attempts_with_no_valid_answer_is_rejected(self):
+        url = reverse("attempt-bulk-create")
+        response = self.client.post(url, {"answers": [
+            {"question": str(uuid.uuid4()), "answer": "A"},
+            {"question": str(self.mcq_question.id)},
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([item["error"] for item in response.data["results"]], ["Question not found", "answer is required"])
+        self.assertEqual(Attempt.objects.count(), 0)
+
+    # --- Answer-Key Cache Tests ---
+    def test_grading_hot_question_reads_key_from_cache(self):
+        """After the first submission the MCQ key is not read from the DB again"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse("attempt-create")
+        self.client.post(url, {"question": str(self.mcq_question.id), "answer": "D"}, format="json")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, {"question": str(self.mcq_question.id), "answer": "D"}, format="json")
+
+        self.assertTrue(response.data["is_correct"])
+        self.assertFalse(any("questions_mcqquestion" in query["sql"] for query in queries))
+
+    def test_answer_key_cache_invalidated_when_key_changes(self):
+        url = reverse("attempt-create")
+        self.client.post(url, {"question": str(self.mcq_question.id), "answer": "D"}, format="json")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mcq_detail.correct_options = ["A"]
+            self.mcq_detail.save()
+
+        response = self.client.post(url, {"question": str(self.mcq_question.id), "answer": "A"}, format="json")
+        self.assertTrue(response.data["is_correct"])
+
+    def test_answer_key_edit_reaches_other_processes_after_commit(self):
+        """Another worker's copy is dropped via the shared version, but only once the edit commits"""
+        from attempts.answer_keys import AnswerKeyCache
+
+        other_worker = AnswerKeyCache(max_size=10, ttl=300)
+        self.assertEqual(other_worker.get(self.mcq_question.id), ("D",))
+
+        with self.captureOnCommitCallbacks(execute=False):
+            self.mcq_detail.correct_options = ["B"]
+            self.mcq_detail.save()
+        # Not committed yet: the version has not moved, so the cached key is still served
+        self.assertEqual(other_worker.get(self.mcq_question.id), ("D",))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mcq_detail.correct_options = ["A"]
+            self.mcq_detail.save()
+        self.assertEqual(other_worker.get(self.mcq_question.id), ("A",))
+
+    # --- Progress Tests ---
+    def test_progress_tracks_first_last_count_and_correctness(self):
+        from attempts.models import UserQuestionProgress
+
+        url = reverse("attempt-create")
+        first = self.client.post(url, {"question": str(self.mcq_question.id), "answer": "A"}, format="json").data
+        self.client.post(reverse("attempt-bulk-create"), {"answers": [
+            {"question": str(self.mcq_question.id), "answer": "D"},
+        ]}, format="json")
+        last = self.client.post(url, {"question": str(self.mcq_question.id), "answer": "B"}, format="json").data
+
+        progress = UserQuestionProgress.objects.get(user=self.user, question=self.mcq_question)
+        self.assertEqual(progress.attempt_count, 3)
+        self.assertTrue(progress.ever_correct)
+        self.assertEqual(progress.first_attempt_id, first["id"])
+        self.assertEqual(progress.last_attempt_id, last["id"])
+
+        Attempt.objects.get(pk=last["id"]).delete()
+        progress.refresh_from_db()
+        self.assertEqual(progress.attempt_count, 2)
+        self.assertNotEqual(progress.last_attempt_id, last["id"])
+
+        Attempt.objects.filter(question=self.mcq_question).delete()
+        self.assertFalse(UserQuestionProgress.objects.filter(user=self.user).exists())
+
+    def test_rebuild_attempt_progress_command(self):
+        from django.core.management import call_command
+        from attempts.models import UserQuestionProgress
+
+        Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="D", is_correct=True)
+        Attempt.objects.create(attempter=self.user, question=self.mcq_question, answer="A", is_correct=False)
+        UserQuestionProgress.objects.all().delete()
+
+        call_command("rebuild_attempt_progress")
+
+        progress = UserQuestionProgress.objects.get(user=self.user, question=self.mcq_question)
+        self.assertEqual((progress.attempt_count, progress.ever_correct), (2, True))
+        self.assertEqual(len(self.client.get(reverse("user-attempts")).data), 1)
@@ -0,0 +1,102 @@
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from attempts.difficulty import estimate_difficulty, fit_rasch
+from attempts.models import Attempt, DifficultyFit, UserAbility
+from questions.models import Question
+
+
+class DifficultyEstimationTests(APITestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="difficulty-author", password="pw")
+        self.easy = Question.objects.create(
+            creator=self.author, question="Easy", type="MCQ", week="Week 23", topic="Difficulty",
+        )
+        self.hard = Question.objects.create(
+            creator=self.author, question="Hard", type="MCQ", week="Week 23", topic="Difficulty",
+        )
+        self.students = [User.objects.create_user(username=f"difficulty{i}", password="pw") for i in range(6)]
+        for i, student in enumerate(self.students):
+            Attempt.objects.create(attempter=student, question=self.easy, answer="A", is_correct=i != 0)
+            Attempt.objects.create(attempter=student, question=self.hard, answer="A", is_correct=i >= 4)
+
+    def test_fit_rasch_recovers_simulated_parameters(self):
+        """The vectorized fit ranks simulated questions and users by their true parameters"""
+        rng = np.random.default_rng(0)
+        true_ability, true_difficulty = rng.normal(size=400), rng.normal(size=40)
+        users, items = np.repeat(np.arange(400), 40), np.tile(np.arange(40), 400)
+        correct = rng.random(len(users)) < 1 / (1 + np.exp(true_difficulty[items] - true_ability[users]))
+
+        ability, difficulty, iterations = fit_rasch(users, items, correct, 400, 40)
+        self.assertLess(iterations, 50)
+        self.assertGreater(np.corrcoef(difficulty, true_difficulty)[0, 1], 0.95)
+        self.assertGreater(np.corrcoef(ability, true_ability)[0, 1], 0.85)
+
+    def test_full_fit_orders_questions_and_users(self):
+        call_command("estimate_question_difficulty")
+
+        self.easy.refresh_from_db()
+        self.hard.refresh_from_db()
+        self.assertLess(self.easy.difficulty, self.hard.difficulty)
+        self.assertEqual(self.hard.difficulty_responses, 6)
+        abilities = dict(UserAbility.objects.values_list("user_id", "ability"))
+        self.assertLess(abilities[self.students[0].id], abilities[self.students[5].id])
+        self.assertEqual(DifficultyFit.objects.get().mode, DifficultyFit.Mode.FULL)
+
+    def test_incremental_fit_folds_in_new_first_attempts(self):
+        estimate_difficulty()
+        self.hard.refresh_from_db()
+        before = self.hard.difficulty
+
+        newcomers = [User.objects.create_user(username=f"difficulty-new{i}", password="pw") for i in range(3)]
+        for student in newcomers:
+            Attempt.objects.create(attempter=student, question=self.hard, answer="A", is_correct=True)
+        # A repeat attempt is not a new response
+        Attempt.objects.create(attempter=self.students[0], question=self.hard, answer="A", is_correct=True)
+
+        totals = estimate_difficulty(incremental=True)
+        self.assertEqual((totals["mode"], totals["responses"]), (DifficultyFit.Mode.INCREMENTAL, 3))
+        self.hard.refresh_from_db()
+        self.assertLess(self.hard.difficulty, before)
+        self.assertEqual(self.hard.difficulty_responses, 9)
+        self.assertEqual(UserAbility.objects.get(user=newcomers[0]).responses, 1)
+
+    def test_question_list_near_level(self):
+        """near_level=true keeps questions within level_window of the requester's ability"""
+        estimate_difficulty()
+        self.easy.refresh_from_db()
+        self.hard.refresh_from_db()
+        user = self.students[2]
+        ability = UserAbility.objects.get(user=user).ability
+        self.client.force_authenticate(user)
+
+        window = abs(ability - self.easy.difficulty) + 0.01
+        response = self.client.get(reverse("question-list"), {"near_level": "true", "level_window": window})
+        ids = {item["id"] for item in response.data["results"]}
+        self.assertIn(str(self.easy.id), ids)
+        self.assertEqual(str(self.hard.id) in ids, abs(ability - self.hard.difficulty) <= window)
+        self.assertTrue(all(abs(item["difficulty"] - ability) <= window for item in response.data["results"]))
+
+    def test_difficulty_ordering_pages_across_unfitted_questions(self):
+        """Unfitted (NULL difficulty) questions sort last and keyset cursors page past them"""
+        estimate_difficulty()
+        unfitted = [
+            Question.objects.create(creator=self.author, question=f"New {i}", type="MCQ", week="Week 23", topic="Difficulty")
+            for i in range(2)
+        ]
+        self.client.force_authenticate(self.students[0])
+
+        for ordering, fitted in (("difficulty", [self.easy, self.hard]), ("difficulty_desc", [self.hard, self.easy])):
+            seen = []
+            response = self.client.get(reverse("question-list"), {"topic": "Difficulty", "ordering": ordering, "limit": 1})
+            while True:
+                self.assertEqual(response.status_code, 200)
+                seen += [item["id"] for item in response.data["results"]]
+                if response.data["next"] is None:
+                    break
+                response = self.client.get(response.data["next"])
+            self.assertEqual(seen[:2], [str(q.id) for q in fitted])
+            self.assertEqual(sorted(seen[2:]), sorted(str(q.id) for q in unfitted))
@@ -0,0 +1,129 @@
+import re
+import unittest
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Count, Q
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from attempts import services
+from attempts.models import Attempt
+from questions.models import Question
+
+# Plan lines that mean a full pass over the attempts table
+SEQUENTIAL_SCAN = {
+    "sqlite": re.compile(r"\bSCAN attempts_attempt\b"),
+    "postgresql": re.compile(r"Seq Scan on attempts_attempt\b"),
+}
+
+# Plan lines that mean rows were sorted after the fetch instead of read in index order
+# (PostgreSQL picks Sort over a backward index scan by cost alone, so only SQLite is checked)
+EXTRA_SORT = {
+    "sqlite": re.compile(r"USE TEMP B-TREE FOR ORDER BY"),
+}
+
+
+def explain(sql):
+    """The database's plan for one captured (already interpolated) query, as text."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return "\n".join(row[-1] for row in cursor.fetchall())
+        cursor.execute(f"EXPLAIN {sql}")
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+@unittest.skipUnless(connection.vendor in SEQUENTIAL_SCAN, "query plan checks need SQLite or PostgreSQL")
+class AttemptQueryPlanTests(APITestCase):
+    """Hot attempt reads must stay on the Attempt indexes once the table has real volume"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(username=f"plan{i}@example.com", password="pw") for i in range(20)]
+        cls.questions = [
+            Question.objects.create(
+                creator=cls.users[0], question=f"Plan question {i}", type="SHORT", week="Week 41", topic="Plans",
+            )
+            for i in range(50)
+        ]
+        now = timezone.now()
+        Attempt.objects.bulk_create([
+            Attempt(
+                attempter=cls.users[i % len(cls.users)],
+                question=cls.questions[i % len(cls.questions)],
+                answer="x",
+                is_correct=i % 3 == 0,
+            )
+            for i in range(4000)
+        ], batch_size=1000)
+        # auto_now_add stamps every row with now; spread them so ordering has work to do
+        for offset, attempt in enumerate(Attempt.objects.filter(question__in=cls.questions[:5])):
+            Attempt.objects.filter(pk=attempt.pk).update(submitted_at=now - timedelta(minutes=offset))
+        services.rebuild_progress()
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        self.user = self.users[0]
+        self.client.force_authenticate(self.user)
+
+    def assertNoSequentialScan(self, queries):
+        pattern = SEQUENTIAL_SCAN[connection.vendor]
+        checked = 0
+        for query in queries:
+            if "attempts_attempt" not in query["sql"]:
+                continue
+            plan = explain(query["sql"])
+            checked += 1
+            self.assertIsNone(pattern.search(plan), f"{query['sql']}\n{plan}")
+        self.assertGreater(checked, 0)
+
+    def assertIndexOrdered(self, queries):
+        pattern = EXTRA_SORT.get(connection.vendor)
+        if pattern is None:
+            return
+        for query in queries:
+            if "attempts_attempt" in query["sql"] and "ORDER BY" in query["sql"]:
+                plan = explain(query["sql"])
+                self.assertIsNone(pattern.search(plan), f"{query['sql']}\n{plan}")
+
+    def get_planned(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return captured.captured_queries
+
+    def test_attempt_history_endpoints_use_indexes(self):
+        question = self.questions[0]
+        for url in (
+            reverse("user-attempts"),
+            reverse("question-attempts", args=[question.id]),
+            reverse("user-question-attempts", args=[question.id]),
+        ):
+            with self.subTest(url=url):
+                self.assertNoSequentialScan(self.get_planned(url))
+
+    def test_question_histories_read_in_index_order(self):
+        """Newest-first histories for a question come straight off the composite indexes"""
+        question = self.questions[0]
+        for url in (
+            reverse("question-attempts", args=[question.id]),
+            reverse("user-question-attempts", args=[question.id]),
+        ):
+            with self.subTest(url=url):
+                self.assertIndexOrdered(self.get_planned(url))
+
+    def test_progress_refresh_and_correct_counts_use_indexes(self):
+        """The per-(user, question) refresh and per-user correct count read only index ranges"""
+        with CaptureQueriesContext(connection) as captured:
+            services.refresh_progress(self.user.id, self.questions[0].id)
+            Attempt.objects.filter(attempter=self.user).aggregate(
+                correct=Count("id", filter=Q(is_correct=True)),
+            )
+            Attempt.objects.filter(attempter=self.user, is_correct=True).count()
+        self.assertNoSequentialScan(captured.captured_queries)
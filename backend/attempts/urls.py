@@ -1,6 +1,7 @@
 from django.urls import path
 from .views import (
     AttemptCreateView, 
+    BulkAttemptCreateView,
     UserAttemptListView, 
     QuestionAttemptListView, 
     UserQuestionAttemptListView,
@@ -10,6 +11,7 @@ from .views import (
 
 urlpatterns = [
     path("create/", AttemptCreateView.as_view(), name="attempt-create"),
+    path("bulk/", BulkAttemptCreateView.as_view(), name="attempt-bulk-create"),
     path("user/", UserAttemptListView.as_view(), name="user-attempts"),
     path("user/activity/", user_activity_heatmap, name="user-activity-heatmap"),
     path("user/streak/", user_streak, name="user-streak"),
@@ -1,10 +1,20 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Count, F, OuterRef, Subquery
-from django.db.models.functions import TruncDate
-from datetime import datetime, timedelta
-from .models import Attempt
+from rest_framework.exceptions import ParseError
+from rest_framework.views import APIView
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags, quote_etag
+from datetime import timedelta
+import uuid
+from .answer_keys import answer_keys
+from .models import Attempt, UserQuestionProgress, UserStreak
+from .pagination import AttemptHistoryPagination, OptionalAttemptHistoryPagination
+from .signals import attempts_bulk_created
+from . import services
 from .serializers import AttemptSerializer
 from questions.models import Question
 
@@ -13,31 +23,21 @@ class AttemptCreateView(generics.CreateAPIView):
     serializer_class = AttemptSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         question_id = request.data.get("question")
         user_answer = request.data.get("answer")
 
-        # Get the question
+        # Get the question (week/topic feed the rollups; the MCQ key comes from the answer-key cache)
         try:
-            question = Question.objects.get(id=question_id)
-        except Question.DoesNotExist:
+            question = Question.objects.only("id", "week", "topic").get(id=question_id)
+        except (Question.DoesNotExist, ValidationError):
             return Response({
                 "error": "Question not found"
             }, status=status.HTTP_404_NOT_FOUND)
 
-        is_correct = None
-
         # Check correctness for MCQ
-        if hasattr(question, "mcq_detail"):
-            correct = question.mcq_detail.correct_options
-            
-            # Handle different answer formats
-            if isinstance(user_answer, list):
-                user_answer_list = [str(ans).strip().upper() for ans in user_answer]
-            else:
-                user_answer_list = [str(user_answer).strip().upper()]
-
-            is_correct = sorted(user_answer_list) == sorted(correct)
+        is_correct = services.grade(answer_keys.get(question.id), user_answer)
 
         attempt = Attempt.objects.create(
             attempter=request.user,
@@ -46,10 +46,6 @@ class AttemptCreateView(generics.CreateAPIView):
             is_correct=is_correct
         )
 
-        # Update question's attempt count
-        question.num_attempts = question.attempts.count()
-        question.save(update_fields=['num_attempts'])
-
         return Response({
             "id": attempt.id,
             "is_correct": attempt.is_correct,
@@ -58,49 +54,153 @@ class AttemptCreateView(generics.CreateAPIView):
         }, status=status.HTTP_201_CREATED)
 
 
-class UserAttemptListView(generics.ListAPIView):
-    """Get all attempts by the current user"""
+class BulkAttemptCreateView(APIView):
+    """
+    Submit a whole practice set in one request.
+    POST {"answers": [{"question": "<uuid>", "answer": "B"}, ...]}
+    All questions are loaded in one query (MCQ keys come from the answer-key cache) and the attempts are
+    inserted with one bulk_create; counters, rollups and standings are updated once
+    per question/bucket/user. Items whose question does not exist are reported and skipped;
+    if no item is valid nothing is created and the per-item errors come back with a 400.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_answers = 100
+
+    @transaction.atomic
+    def post(self, request, *args, **kwargs):
+        answers = request.data.get("answers") if isinstance(request.data, dict) else request.data
+        if not isinstance(answers, list) or not answers:
+            return Response({"error": "answers must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(answers) > self.max_answers:
+            return Response({"error": f"At most {self.max_answers} answers per request"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        question_ids = []
+        for item in answers:
+            try:
+                question_ids.append(uuid.UUID(str(item.get("question"))))
+            except (AttributeError, ValueError):
+                question_ids.append(None)
+
+        questions = Question.objects.only("id", "week", "topic").in_bulk([qid for qid in question_ids if qid])
+        keys = answer_keys.get_many(list(questions))
+
+        results = []
+        attempts = []
+        for item, question_id in zip(answers, question_ids):
+            question = questions.get(question_id)
+            if question is None:
+                results.append({"question": item.get("question") if isinstance(item, dict) else None,
+                                "error": "Question not found"})
+                continue
+            if item.get("answer") is None:
+                results.append({"question": str(question.id), "error": "answer is required"})
+                continue
+            attempt = Attempt(
+                attempter=request.user,
+                question=question,
+                answer=item.get("answer"),
+                is_correct=services.grade(keys[question.id], item.get("answer")),
+            )
+            attempts.append(attempt)
+            results.append(attempt)
+
+        if not attempts:
+            return Response({"error": "No valid answers to submit", "results": results},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        Attempt.objects.bulk_create(attempts)
+        attempts_bulk_created.send(sender=Attempt, attempts=attempts)
+
+        return Response({
+            "created": len(attempts),
+            "correct": sum(1 for attempt in attempts if attempt.is_correct),
+            "results": [
+                item if isinstance(item, dict) else {
+                    "id": item.id,
+                    "question": str(item.question_id),
+                    "is_correct": item.is_correct,
+                    "answer": item.answer,
+                    "submitted_at": item.submitted_at,
+                }
+                for item in results
+            ],
+        }, status=status.HTTP_201_CREATED)
+
+
+class AttemptHistoryMixin:
+    """
+    Shared by the attempt list views, all ordered newest first (-submitted_at, -id):
+      ?since=<ISO datetime>  → only attempts submitted after it (incremental sync)
+      ?view=compact          → id/question/is_correct/submitted_at rows read with
+                               .values(), skipping the joins and the serializer
+    Pages come from pagination_class (see attempts.pagination).
+    """
     serializer_class = AttemptSerializer
     permission_classes = [permissions.IsAuthenticated]
+    compact_fields = ("id", "question", "is_correct", "submitted_at")
 
-    def get_queryset(self):
-        user = self.request.user
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        since = self.request.query_params.get("since")
+        if since:
+            parsed = parse_datetime(since)
+            if parsed is None:
+                raise ParseError("since must be an ISO 8601 datetime")
+            if timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed)
+            queryset = queryset.filter(submitted_at__gt=parsed)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get("view") != "compact":
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.compact_fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
 
-        latest_attempt_subquery = Attempt.objects.filter(
-            attempter=user,
-            question_id=OuterRef("question_id")
-        ).order_by("-submitted_at", "-id").values("id")[:1]
 
+class UserAttemptListView(AttemptHistoryMixin, generics.ListAPIView):
+    """Get the current user's latest attempt on each question"""
+    pagination_class = OptionalAttemptHistoryPagination
+
+    def get_queryset(self):
+        # Latest attempt per question, straight from the user's progress rows
+        latest_ids = UserQuestionProgress.objects.filter(user=self.request.user).values("last_attempt_id")
         return (
-            Attempt.objects.filter(attempter=user)
-            .annotate(latest_attempt_id=Subquery(latest_attempt_subquery))
-            .filter(pk=F("latest_attempt_id"))
+            Attempt.objects.filter(pk__in=latest_ids)
+            .select_related("attempter", "question")
             .order_by("-submitted_at", "-id")
         )
 
 
-class QuestionAttemptListView(generics.ListAPIView):
-    """Get all attempts for a specific question"""
-    serializer_class = AttemptSerializer
-    permission_classes = [permissions.IsAuthenticated]
+class QuestionAttemptListView(AttemptHistoryMixin, generics.ListAPIView):
+    """Get attempts for a specific question, one keyset page at a time"""
+    pagination_class = AttemptHistoryPagination
 
     def get_queryset(self):
         question_id = self.kwargs['question_id']
-        return Attempt.objects.filter(question_id=question_id).order_by('-submitted_at')
+        return (
+            Attempt.objects.filter(question_id=question_id)
+            .select_related("attempter", "question")
+            .order_by("-submitted_at", "-id")
+        )
 
 
-class UserQuestionAttemptListView(generics.ListAPIView):
+class UserQuestionAttemptListView(AttemptHistoryMixin, generics.ListAPIView):
     """Get all attempts for a specific question by the current user"""
-    serializer_class = AttemptSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalAttemptHistoryPagination
 
     def get_queryset(self):
         question_id = self.kwargs['question_id']
         user = self.request.user
-        return Attempt.objects.filter(
-            question_id=question_id,
-            attempter=user
-        ).order_by('-submitted_at')
+        return (
+            Attempt.objects.filter(question_id=question_id, attempter=user)
+            .select_related("attempter", "question")
+            .order_by("-submitted_at", "-id")
+        )
 
 
 @api_view(['GET'])
@@ -108,113 +208,63 @@ class UserQuestionAttemptListView(generics.ListAPIView):
 def user_activity_heatmap(request):
     """
     Get user's activity data for heatmap visualization
-    Returns attempts count grouped by date for the past 365 days
+    Returns attempts count grouped by date for the past 365 days, read from the
+    user's UserActivityYear vectors. ?layout=vector returns a `counts` list with one
+    entry per day from start_date instead of the date map. Responses carry an ETag;
+    a matching If-None-Match gets 304 Not Modified.
     """
     user = request.user
-    
+    layout = 'vector' if request.query_params.get('layout') == 'vector' else 'map'
+
     # Get date range (past 365 days / 12 months)
-    end_date = datetime.now().date()
+    end_date = timezone.localdate()
     start_date = end_date - timedelta(days=365)
-    
-    # Query attempts grouped by date
-    activity_data = (
-        Attempt.objects
-        .filter(attempter=user, submitted_at__date__gte=start_date)
-        .annotate(date=TruncDate('submitted_at'))
-        .values('date')
-        .annotate(count=Count('id'))
-        .order_by('date')
-    )
-    
-    # Convert to dictionary for easier frontend processing
-    activity_dict = {
-        str(item['date']): item['count'] 
-        for item in activity_data
-    }
-    
-    return Response({
+
+    activity, version = services.activity_between(user.id, start_date, end_date)
+    etag = quote_etag(f"{user.id}-{end_date}-{layout}-{version}")
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    data = {
         'start_date': str(start_date),
         'end_date': str(end_date),
-        'activity': activity_dict,
-        'total_attempts': sum(activity_dict.values())
-    })
+        'total_attempts': sum(activity.values()),
+    }
+    if layout == 'vector':
+        data['counts'] = [
+            activity.get(start_date + timedelta(days=offset), 0)
+            for offset in range((end_date - start_date).days + 1)
+        ]
+    else:
+        data['activity'] = {str(day): count for day, count in activity.items()}
+    return Response(data, headers=headers)
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def user_streak(request):
     """
-    Calculate user's current streak (consecutive days with attempts)
-    Returns current streak, longest streak, and today's attempt count
+    User's current streak (consecutive days with attempts), longest streak and
+    today's attempt count, read from the UserStreak row kept by attempts.signals
     """
-    user = request.user
-    today = datetime.now().date()
-    
-    # Get all unique dates where user made attempts (descending order)
-    attempt_dates = (
-        Attempt.objects
-        .filter(attempter=user)
-        .annotate(date=TruncDate('submitted_at'))
-        .values('date')
-        .annotate(count=Count('id'))
-        .order_by('-date')
-    )
-    
-    if not attempt_dates:
+    today = timezone.localdate()
+    streak = UserStreak.objects.filter(user=request.user).first()
+    if streak is None or streak.last_active_date is None:
         return Response({
             'current_streak': 0,
             'longest_streak': 0,
             'today_count': 0,
             'has_attempted_today': False
         })
-    
-    # Convert to list of dates
-    dates_with_counts = [(item['date'], item['count']) for item in attempt_dates]
-    dates = [item['date'] for item in attempt_dates]
-    
-    # Check today's attempts
-    today_count = 0
-    has_attempted_today = False
-    if dates and dates[0] == today:
-        today_count = dates_with_counts[0][1]
-        has_attempted_today = True
-    
-    # Calculate current streak
-    current_streak = 0
-    check_date = today
-    
-    # If user hasn't attempted today, check from yesterday
-    if not has_attempted_today:
-        check_date = today - timedelta(days=1)
-    
-    for date in dates:
-        if date == check_date:
-            current_streak += 1
-            check_date -= timedelta(days=1)
-        elif date < check_date:
-            # Gap found, stop counting
-            break
-    
-    # Calculate longest streak
-    longest_streak = 0
-    temp_streak = 0
-    prev_date = None
-    
-    for date in reversed(dates):
-        if prev_date is None:
-            temp_streak = 1
-        elif (date - prev_date).days == 1:
-            temp_streak += 1
-        else:
-            longest_streak = max(longest_streak, temp_streak)
-            temp_streak = 1
-        prev_date = date
-    
-    longest_streak = max(longest_streak, temp_streak)
-    
+
+    has_attempted_today = streak.last_active_date == today
+    # The stored streak is as of last_active_date; it is still alive until a full day is missed
+    current_streak = streak.current_streak if streak.last_active_date >= today - timedelta(days=1) else 0
+
     return Response({
         'current_streak': current_streak,
-        'longest_streak': longest_streak,
-        'today_count': today_count,
+        'longest_streak': streak.longest_streak,
+        'today_count': streak.last_active_count if has_attempted_today else 0,
         'has_attempted_today': has_attempted_today
     })
@@ -179,6 +179,33 @@ else:
     }
 
 
+# Cache
+# LocMem by default (development only); point CACHE_BACKEND/CACHE_LOCATION at e.g.
+# django.core.cache.backends.filebased.FileBasedCache + a directory, or
+# django.core.cache.backends.db.DatabaseCache + a table name (run `manage.py createcachetable`).
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "questify-default"),
+    }
+}
+
+# Per-process backends: a cache version bumped (or key deleted) by one gunicorn worker
+# is never seen by the others, so production must use a shared one (DB cache or Redis)
+LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def require_shared_cache(alias: str, feature: str):
+    if not DEBUG and CACHES.get(alias, {}).get("BACKEND") in LOCAL_CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f"{feature} needs a cache shared by every process in production: point the "
+            f"'{alias}' cache (CACHE_BACKEND) at django.core.cache.backends.db.DatabaseCache or Redis."
+        )
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -292,6 +319,55 @@ LEADERBOARD_ACTIVITY_MODELS = {
     # Note: "questions.Like" removed - it's a M2M field, not a separate model
 }
 
+# Leaderboard page cache
+LEADERBOARD_CACHE_ALIAS = os.getenv("LEADERBOARD_CACHE_ALIAS", "default")
+LEADERBOARD_CACHE_TIMEOUT = int(os.getenv("LEADERBOARD_CACHE_TIMEOUT", "300"))         # seconds
+LEADERBOARD_CACHE_MIN_STALENESS = int(os.getenv("LEADERBOARD_CACHE_MIN_STALENESS", "10"))  # seconds a page is reused after a write
+require_shared_cache(LEADERBOARD_CACHE_ALIAS, "The leaderboard page cache")
+
+# Recommendation candidate pools (per process) and per-user picks (in the cache)
+RECOMMENDATION_CACHE_ALIAS = os.getenv("RECOMMENDATION_CACHE_ALIAS", "default")
+RECOMMENDATION_CACHE_TIMEOUT = int(os.getenv("RECOMMENDATION_CACHE_TIMEOUT", "900"))              # seconds a user's picks are kept without a new attempt
+RECOMMENDATION_POOL_SIZE = int(os.getenv("RECOMMENDATION_POOL_SIZE", "200"))                      # candidates kept per pool
+RECOMMENDATION_POOL_MIN_STALENESS = int(os.getenv("RECOMMENDATION_POOL_MIN_STALENESS", "60"))    # seconds pools are reused after a change
+# Pools rebuild when the pool version in this cache moves, and a user's picks are dropped
+# from it on their next attempt; both must reach every process
+require_shared_cache(RECOMMENDATION_CACHE_ALIAS, "Recommendation invalidation")
+
+# Question list ?near_level=true: difficulty within this many logits of the user's ability
+QUESTION_LEVEL_WINDOW = float(os.getenv("QUESTION_LEVEL_WINDOW", "0.5"))
+
+# Replies inlined under each top-level comment; the rest load from comments/<id>/replies/
+COMMENT_INLINE_REPLIES = int(os.getenv("COMMENT_INLINE_REPLIES", "3"))
+
+# Per-process MCQ answer-key cache used for grading attempts
+ATTEMPT_ANSWER_KEY_CACHE_SIZE = int(os.getenv("ATTEMPT_ANSWER_KEY_CACHE_SIZE", "4096"))  # questions
+ATTEMPT_ANSWER_KEY_CACHE_TTL = int(os.getenv("ATTEMPT_ANSWER_KEY_CACHE_TTL", "300"))     # seconds
+ATTEMPT_ANSWER_KEY_CACHE_ALIAS = os.getenv("ATTEMPT_ANSWER_KEY_CACHE_ALIAS", "default")
+# Every process checks the answer-key version in this cache before grading, so key edits reach all workers
+require_shared_cache(ATTEMPT_ANSWER_KEY_CACHE_ALIAS, "Answer-key invalidation")
+
+# AI explanations for short-answer questions (generated by `manage.py run_ai_worker`)
+AI_COMPLETIONS_URL = os.getenv("AI_COMPLETIONS_URL", "https://api.openai.com/v1/chat/completions")
+AI_MODEL = os.getenv("AI_MODEL", "gpt-4o-mini")
+AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "5"))              # seconds
+AI_REQUEST_TIMEOUT = int(os.getenv("AI_REQUEST_TIMEOUT", "30"))                # read timeout, seconds
+AI_POOL_SIZE = int(os.getenv("AI_POOL_SIZE", "10"))                            # keep-alive connections per host
+AI_BREAKER_THRESHOLD = int(os.getenv("AI_BREAKER_THRESHOLD", "5"))             # consecutive failures that open the circuit
+AI_BREAKER_RESET_SECONDS = int(os.getenv("AI_BREAKER_RESET_SECONDS", "60"))    # open time before a trial call
+AI_JOB_MAX_ATTEMPTS = int(os.getenv("AI_JOB_MAX_ATTEMPTS", "5"))
+AI_JOB_BACKOFF_SECONDS = int(os.getenv("AI_JOB_BACKOFF_SECONDS", "30"))        # doubled after every failed try
+AI_JOB_BACKOFF_MAX_SECONDS = int(os.getenv("AI_JOB_BACKOFF_MAX_SECONDS", "3600"))
+AI_JOB_LEASE_SECONDS = int(os.getenv("AI_JOB_LEASE_SECONDS", "300"))          # a running job older than this is retried
+# Workers claim one job per call, so a lease only has to outlast one completion call
+if AI_JOB_LEASE_SECONDS <= AI_CONNECT_TIMEOUT + AI_REQUEST_TIMEOUT:
+    raise ImproperlyConfigured(
+        "AI_JOB_LEASE_SECONDS must exceed AI_CONNECT_TIMEOUT + AI_REQUEST_TIMEOUT, "
+        "or a slow completion call lets another worker re-claim (and re-send) the job."
+    )
+AI_EXPLANATION_CACHE_MAX_ENTRIES = int(os.getenv("AI_EXPLANATION_CACHE_MAX_ENTRIES", "5000"))  # least recently used are evicted
+AI_EXPLANATION_CACHE_MAX_AGE_DAYS = int(os.getenv("AI_EXPLANATION_CACHE_MAX_AGE_DAYS", "90"))
+
 # Admin-facing email safelist (lowercase). Must be managed through ADMIN_EMAILS env var.
 _admin_email_env = {email.lower() for email in env_list("ADMIN_EMAILS")}
 if not _admin_email_env and not DEBUG:
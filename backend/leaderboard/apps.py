@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class LeaderboardConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "leaderboard"
+
+    def ready(self):
+        from . import signals
+        signals.connect_activity_models()
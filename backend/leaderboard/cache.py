@@ -0,0 +1,92 @@
+# leaderboard/cache.py
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = "leaderboard:version"
+PAGE_KEY_PREFIX = "leaderboard:page:"
+
+
+def _cache():
+    return caches[getattr(settings, "LEADERBOARD_CACHE_ALIAS", "default")]
+
+
+def current_version() -> int:
+    """Version of the leaderboard data; bumped on every attempt/comment/rating write."""
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so a version evicted from the cache never repeats an old one
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _bump_version():
+    cache = _cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), None)
+
+
+def bump_version():
+    """Invalidate cached pages once the current transaction commits."""
+    transaction.on_commit(_bump_version)
+
+
+def page_key(request) -> str:
+    """Cache key for one filter set + page + page_size (plus host, since links are absolute)."""
+    params = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+    raw = json.dumps([request.get_host(), request.path, params])
+    return PAGE_KEY_PREFIX + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _not_modified(request, etag, last_modified) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        return etag in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*"
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+    return if_modified_since is not None and int(last_modified) <= if_modified_since
+
+
+def cached_response(request, build) -> Response:
+    """
+    Serve `build()` (the response payload) from the leaderboard cache.
+
+    A cached page is rebuilt only when the data version has moved on *and* the page
+    is older than LEADERBOARD_CACHE_MIN_STALENESS seconds, so bursts of writes do not
+    turn every poll into a rebuild. Responses carry ETag/Last-Modified and answer
+    conditional requests with 304.
+    """
+    cache = _cache()
+    key = page_key(request)
+    version = current_version()
+    now = time.time()
+    min_staleness = getattr(settings, "LEADERBOARD_CACHE_MIN_STALENESS", 0)
+
+    entry = cache.get(key)
+    if entry is None or (entry["version"] != version and now - entry["built_at"] >= min_staleness):
+        entry = {"version": version, "built_at": now, "data": build()}
+        cache.set(key, entry, getattr(settings, "LEADERBOARD_CACHE_TIMEOUT", 300))
+
+    etag = quote_etag(hashlib.sha1(f"{key}:{entry['version']}:{entry['built_at']}".encode()).hexdigest())
+    last_modified = entry["built_at"]
+
+    if _not_modified(request, etag, last_modified):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(entry["data"])
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
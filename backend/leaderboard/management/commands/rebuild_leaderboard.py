@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from leaderboard.services import rebuild_standings
+
+
+class Command(BaseCommand):
+    help = "Recompute every LeaderboardStanding row from attempts, comments and ratings."
+
+    def handle(self, *args, **options):
+        count = rebuild_standings()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} leaderboard standings."))
@@ -0,0 +1,58 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Max, Q
+
+
+def backfill_standings(apps, schema_editor):
+    """Populate LeaderboardStanding from existing attempts and comments"""
+    Attempt = apps.get_model("attempts", "Attempt")
+    Comment = apps.get_model("questions", "Comment")
+    LeaderboardStanding = apps.get_model("leaderboard", "LeaderboardStanding")
+
+    weights = {
+        "attempts": getattr(settings, "LEADERBOARD_POINTS_PER_ATTEMPT", 1),
+        "correct": getattr(settings, "LEADERBOARD_POINTS_BONUS_CORRECT", 9),
+        "comment_count": getattr(settings, "LEADERBOARD_POINTS_PER_COMMENT", 0),
+    }
+
+    totals = defaultdict(dict)
+    attempt_rows = Attempt.objects.values("attempter").annotate(
+        attempts=Count("id"),
+        correct=Count("id", filter=Q(is_correct=True)),
+        last_activity=Max("submitted_at"),
+    ).order_by()
+    for row in attempt_rows:
+        totals[row["attempter"]].update(
+            attempts=row["attempts"],
+            correct=row["correct"],
+            last_activity=row["last_activity"],
+        )
+    for row in Comment.objects.values("author").annotate(c=Count("id")).order_by():
+        totals[row["author"]]["comment_count"] = row["c"]
+
+    LeaderboardStanding.objects.bulk_create(
+        [
+            LeaderboardStanding(
+                user_id=user_id,
+                points=sum(values.get(field, 0) * weight for field, weight in weights.items()),
+                **values,
+            )
+            for user_id, values in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leaderboard", "0001_initial"),
+        ("attempts", "0001_initial"),
+        ("questions", "0007_savedquestion"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_standings, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,29 @@
+from django.contrib.auth.models import User
 from django.db import models
 
-# Create your models here.
+
+class LeaderboardStanding(models.Model):
+    """
+    Persisted per-user leaderboard totals.
+    Kept current by leaderboard.signals and rebuilt by `manage.py rebuild_leaderboard`.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="leaderboard_standing")
+    attempts = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    points = models.IntegerField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Matches the ranking order: points ↓, correct ↓, last_activity ↑, user ↑
+            models.Index(
+                fields=["-points", "-correct", "last_activity", "user"],
+                name="leaderboard_rank_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.points} pts"
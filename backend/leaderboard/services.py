@@ -0,0 +1,236 @@
+# leaderboard/services.py
+
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from attempts.models import Attempt
+from .cache import bump_version
+from .models import LeaderboardStanding
+
+
+# --- Scoring ---
+POINT_PER_ATTEMPT = getattr(settings, "LEADERBOARD_POINTS_PER_ATTEMPT", 1)
+BONUS_CORRECT = getattr(settings, "LEADERBOARD_POINTS_BONUS_CORRECT", 9)
+
+POINT_PER_COMMENT = getattr(settings, "LEADERBOARD_POINTS_PER_COMMENT", 0)
+POINT_PER_RATING  = getattr(settings, "LEADERBOARD_POINTS_PER_RATING", 0)
+POINT_PER_LIKE    = getattr(settings, "LEADERBOARD_POINTS_PER_LIKE", 0)
+
+# Standing counter field -> points earned per unit
+POINT_WEIGHTS = {
+    "attempts": POINT_PER_ATTEMPT,
+    "correct": BONUS_CORRECT,
+    "comment_count": POINT_PER_COMMENT,
+    "rating_count": POINT_PER_RATING,
+}
+
+# Ranking order: points ↓, correct ↓, last_activity ↑ (no activity first), user_id ↑
+STANDING_ORDER = (
+    F("points").desc(),
+    F("correct").desc(),
+    F("last_activity").asc(nulls_first=True),
+    F("user_id").asc(),
+)
+REVERSE_STANDING_ORDER = (
+    F("points").asc(),
+    F("correct").asc(),
+    F("last_activity").desc(nulls_last=True),
+    F("user_id").desc(),
+)
+
+
+def activity_field_for(label: str) -> str | None:
+    """
+    Map an activity model label (e.g. "questions.Comment") to its standing counter.
+    Only models named exactly Comment/Rating count, so "questions.QuestionRating"
+    maps to nothing and question ratings earn no leaderboard points.
+    """
+    label_lower = label.lower()
+    if label_lower.endswith(".comment"):
+        return "comment_count"
+    if label_lower.endswith(".rating"):
+        return "rating_count"
+    return None
+
+
+def get_activity_models():
+    """
+    From the models registered in settings.LEADERBOARD_ACTIVITY_MODELS,
+    return only the models that actually 'exist' in the project as [(ModelClass, user_field, counter_field)].
+    """
+    models_cfg = getattr(settings, "LEADERBOARD_ACTIVITY_MODELS", {}) or {}
+    existing = []
+    for label, meta in models_cfg.items():
+        field = activity_field_for(label)
+        if field is None:
+            continue
+        try:
+            model_cls = apps.get_model(label)
+        except LookupError:
+            continue
+        existing.append((model_cls, meta.get("user_field", "user"), field))
+    return existing
+
+
+def compute_points(counts: dict) -> int:
+    return sum(counts.get(field, 0) * weight for field, weight in POINT_WEIGHTS.items())
+
+
+# ---------- Incremental maintenance ----------
+def _latest_attempt_at():
+    """Subquery for a standing's newest remaining Attempt.submitted_at (NULL when none are left)."""
+    return Subquery(
+        Attempt.objects.filter(attempter_id=OuterRef("user_id"))
+        .order_by("-submitted_at")
+        .values("submitted_at")[:1]
+    )
+
+
+def _apply(user_id, deltas: dict, last_activity=None, create=True, recompute_last_activity=False):
+    """
+    Apply counter deltas to one user's standing in a single UPDATE.
+    Decrements never drop a counter below zero; `rebuild_standings` repairs any drift.
+    `last_activity` can only move forward; after a delete pass `recompute_last_activity`
+    so it is re-read from the user's remaining attempts (it breaks ranking ties).
+    """
+    if create:
+        LeaderboardStanding.objects.get_or_create(user_id=user_id)
+
+    updates = {"updated_at": timezone.now()}
+    for field, delta in deltas.items():
+        if delta >= 0:
+            updates[field] = F(field) + delta
+        else:
+            updates[field] = Greatest(F(field) + delta, Value(0))
+    points_delta = compute_points(deltas)
+    if points_delta:
+        updates["points"] = F("points") + points_delta
+    if recompute_last_activity:
+        updates["last_activity"] = _latest_attempt_at()
+    elif last_activity is not None:
+        updates["last_activity"] = Case(
+            When(Q(last_activity__isnull=True) | Q(last_activity__lt=last_activity), then=Value(last_activity)),
+            default=F("last_activity"),
+        )
+    LeaderboardStanding.objects.filter(user_id=user_id).update(**updates)
+    bump_version()
+
+
+def record_attempts(attempts, sign: int = 1):
+    """Fold newly created (sign=1) or deleted (sign=-1) attempts into the standings."""
+    per_user = defaultdict(lambda: {"attempts": 0, "correct": 0, "last_activity": None})
+    for attempt in attempts:
+        totals = per_user[attempt.attempter_id]
+        totals["attempts"] += sign
+        if attempt.is_correct:
+            totals["correct"] += sign
+        if attempt.submitted_at and (totals["last_activity"] is None or attempt.submitted_at > totals["last_activity"]):
+            totals["last_activity"] = attempt.submitted_at
+
+    for user_id, totals in per_user.items():
+        _apply(
+            user_id,
+            {"attempts": totals["attempts"], "correct": totals["correct"]},
+            last_activity=totals["last_activity"] if sign > 0 else None,
+            create=sign > 0,
+            recompute_last_activity=sign < 0,
+        )
+
+
+def record_activity(user_id, field: str, sign: int = 1):
+    """Count one comment/rating (sign=1) or remove one (sign=-1)."""
+    _apply(user_id, {field: sign}, create=sign > 0)
+
+
+def rebuild_standings() -> int:
+    """Recompute every standing from the source tables. Returns the number of rows written."""
+    totals = defaultdict(dict)
+
+    attempt_rows = Attempt.objects.values("attempter").annotate(
+        attempts=Count("id"),
+        correct=Count("id", filter=Q(is_correct=True)),
+        last_activity=Max("submitted_at"),
+    ).order_by()
+    for row in attempt_rows:
+        totals[row["attempter"]].update(
+            attempts=row["attempts"],
+            correct=row["correct"],
+            last_activity=row["last_activity"],
+        )
+
+    for model_cls, user_field, field in get_activity_models():
+        for row in model_cls.objects.values(user_field).annotate(c=Count("pk")).order_by():
+            totals[row[user_field]][field] = row["c"]
+
+    standings = [
+        LeaderboardStanding(user_id=user_id, points=compute_points(values), **values)
+        for user_id, values in totals.items()
+    ]
+    with transaction.atomic():
+        LeaderboardStanding.objects.all().delete()
+        LeaderboardStanding.objects.bulk_create(standings, batch_size=1000)
+        bump_version()
+    return len(standings)
+
+
+# ---------- Ranking reads ----------
+def ranked_standings():
+    """Standings that appear on the leaderboard, in rank order."""
+    return (
+        LeaderboardStanding.objects
+        .filter(Q(attempts__gt=0) | Q(points__gt=0))
+        .select_related("user", "user__profile")
+        .order_by(*STANDING_ORDER)
+    )
+
+
+def rank_key(row):
+    return (row["points"], row["correct"], row["last_activity"])
+
+
+def ranked_ahead_of(key) -> Q:
+    """Q matching standings whose ranking key is strictly better than `key`."""
+    points, correct, last_activity = key
+    ahead = Q(points__gt=points) | Q(points=points, correct__gt=correct)
+    if last_activity is not None:
+        ahead |= Q(points=points, correct=correct, last_activity__isnull=True)
+        ahead |= Q(points=points, correct=correct, last_activity__lt=last_activity)
+    return ahead
+
+
+def dense_rank(key) -> int:
+    """Dense rank of `key`: one more than the number of distinct better keys."""
+    better = (
+        ranked_standings()
+        .filter(ranked_ahead_of(key))
+        .order_by()
+        .values("points", "correct", "last_activity")
+        .distinct()
+        .count()
+    )
+    return better + 1
+
+
+def ordered_before(key, user_id) -> Q:
+    """Q matching standings listed before (`key`, `user_id`) in STANDING_ORDER."""
+    points, correct, last_activity = key
+    if last_activity is None:
+        same_key = Q(points=points, correct=correct, last_activity__isnull=True)
+    else:
+        same_key = Q(points=points, correct=correct, last_activity=last_activity)
+    return ranked_ahead_of(key) | (same_key & Q(user_id__lt=user_id))
+
+
+def standing_window(standing, size: int):
+    """Up to `size` ranked standings either side of `standing` (inclusive), in rank order."""
+    key = (standing.points, standing.correct, standing.last_activity)
+    before_q = ordered_before(key, standing.user_id)
+    before = list(ranked_standings().filter(before_q).order_by(*REVERSE_STANDING_ORDER)[:size])
+    after = list(ranked_standings().exclude(before_q).exclude(user_id=standing.user_id)[:size])
+    return before[::-1] + [standing] + after
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from attempts.models import Attempt
+from attempts.signals import attempts_bulk_created
+from . import services
+
+
+@receiver(post_save, sender=Attempt)
+def add_attempt_to_standing(sender, instance, created, **kwargs):
+    if created:
+        services.record_attempts([instance])
+        return
+    # Updated attempt: move it out of the stored totals and back in (see attempts.signals)
+    stored = getattr(instance, "_stored_attempt", None)
+    if stored is not None:
+        services.record_attempts([stored], sign=-1)
+        services.record_attempts([instance])
+
+
+@receiver(attempts_bulk_created, sender=Attempt)
+def add_bulk_attempts_to_standing(sender, attempts, **kwargs):
+    services.record_attempts(attempts)
+
+
+@receiver(post_delete, sender=Attempt)
+def remove_attempt_from_standing(sender, instance, **kwargs):
+    services.record_attempts([instance], sign=-1)
+
+
+def connect_activity_models():
+    """Keep comment/rating counters current for every configured activity model."""
+    for model_cls, user_field, field in services.get_activity_models():
+        user_attr = f"{user_field}_id"
+
+        def on_save(sender, instance, created, _attr=user_attr, _field=field, **kwargs):
+            if created:
+                services.record_activity(getattr(instance, _attr), _field)
+
+        def on_delete(sender, instance, _attr=user_attr, _field=field, **kwargs):
+            services.record_activity(getattr(instance, _attr), _field, sign=-1)
+
+        uid = f"leaderboard-{model_cls._meta.label_lower}"
+        post_save.connect(on_save, sender=model_cls, weak=False, dispatch_uid=f"{uid}-save")
+        post_delete.connect(on_delete, sender=model_cls, weak=False, dispatch_uid=f"{uid}-delete")
@@ -0,0 +1,11 @@
+import pytest
+from django.core.cache import caches
+from django.conf import settings
+
+
+@pytest.fixture(autouse=True)
+def clear_leaderboard_cache():
+    """Cached leaderboard pages must not leak between tests (rolled-back writes never bump the version)."""
+    caches[settings.LEADERBOARD_CACHE_ALIAS].clear()
+    yield
+    caches[settings.LEADERBOARD_CACHE_ALIAS].clear()
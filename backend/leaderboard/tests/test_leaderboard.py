@@ -93,4 +93,176 @@ def test_my_leaderboard_view_without_data():
     data = res.json()
     assert data["user_id"] == user.id
     assert data["attempts"] == 0
-    assert data["rank"] == data["total_users"] + 1
\ No newline at end of file
+    assert data["rank"] == data["total_users"] + 1
+
+def test_standing_updated_on_attempt_and_comment():
+    """Attempts and comments fold into the persisted standing; question ratings earn no points."""
+    from django.conf import settings
+    from leaderboard.models import LeaderboardStanding
+    from questions.models import Comment, QuestionRating
+
+    user = User.objects.create_user(username="scorer", password="x")
+    q = Question.objects.create(question="Q?", type="SHORT", week="W1", topic="Math", creator=user)
+    Attempt.objects.create(attempter=user, question=q, is_correct=True)
+    Attempt.objects.create(attempter=user, question=q, is_correct=False)
+    Comment.objects.create(question=q, author=user, content="hi")
+    QuestionRating.objects.create(question=q, user=user, score=4)
+
+    standing = LeaderboardStanding.objects.get(user=user)
+    assert standing.attempts == 2
+    assert standing.correct == 1
+    assert standing.comment_count == 1
+    assert standing.rating_count == 0
+    assert standing.points == (
+        2 * settings.LEADERBOARD_POINTS_PER_ATTEMPT
+        + settings.LEADERBOARD_POINTS_BONUS_CORRECT
+        + settings.LEADERBOARD_POINTS_PER_COMMENT
+    )
+    assert standing.last_activity is not None
+
+    Comment.objects.filter(author=user).delete()
+    standing.refresh_from_db()
+    assert standing.comment_count == 0
+
+
+def test_unfiltered_leaderboard_reads_standings_with_dense_rank():
+    """Unfiltered leaderboard is ordered by points with ties sharing a rank."""
+    client = APIClient()
+    alice = User.objects.create_user(username="lb_alice", password="x")
+    bob = User.objects.create_user(username="lb_bob", password="x")
+    carol = User.objects.create_user(username="lb_carol", password="x")
+    client.force_authenticate(alice)
+    q = Question.objects.create(question="Q?", type="SHORT", week="W1", topic="Math", creator=alice)
+
+    Attempt.objects.create(attempter=alice, question=q, is_correct=True)
+    Attempt.objects.create(attempter=alice, question=q, is_correct=True)
+    Attempt.objects.create(attempter=bob, question=q, is_correct=True)
+    Attempt.objects.create(attempter=carol, question=q, is_correct=False)
+
+    res = client.get(reverse("leaderboard-list") + "?page_size=2&page=2")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["count"] == 3
+    assert [r["display_name"] for r in data["results"]] == ["lb_carol"]
+    assert data["results"][0]["rank"] == 3
+
+    res = client.get(reverse("leaderboard-list"))
+    results = res.json()["results"]
+    assert [r["user_id"] for r in results] == [alice.id, bob.id, carol.id]
+    assert [r["rank"] for r in results] == [1, 2, 3]
+
+
+def test_rebuild_leaderboard_command_repairs_drift():
+    """rebuild_leaderboard recomputes standings from source rows."""
+    from django.core.management import call_command
+    from leaderboard.models import LeaderboardStanding
+
+    user = User.objects.create_user(username="drift", password="x")
+    q = Question.objects.create(question="Q?", type="SHORT", week="W1", topic="Math", creator=user)
+    Attempt.objects.create(attempter=user, question=q, is_correct=True)
+    LeaderboardStanding.objects.filter(user=user).update(attempts=99, points=999)
+
+    call_command("rebuild_leaderboard")
+
+    standing = LeaderboardStanding.objects.get(user=user)
+    assert standing.attempts == 1
+    assert standing.correct == 1
+    assert standing.points < 999
+
+
+def test_deleting_newest_attempt_moves_last_activity_back():
+    """The last_activity tie-break is re-read from the remaining attempts after a delete."""
+    from leaderboard.models import LeaderboardStanding
+
+    client = APIClient()
+    bob = User.objects.create_user(username="tie_bob", password="x")
+    alice = User.objects.create_user(username="tie_alice", password="x")
+    client.force_authenticate(alice)
+    q = Question.objects.create(question="Q?", type="SHORT", week="W1", topic="Math", creator=alice)
+
+    first = Attempt.objects.create(attempter=alice, question=q, is_correct=False)
+    Attempt.objects.create(attempter=bob, question=q, is_correct=False)
+    newest = Attempt.objects.create(attempter=alice, question=q, is_correct=False)
+    newest.delete()
+
+    # Same points and correct; alice's remaining attempt is older, so she ranks first
+    assert LeaderboardStanding.objects.get(user=alice).last_activity == first.submitted_at
+    results = client.get(reverse("leaderboard-list")).json()["results"]
+    assert [r["user_id"] for r in results] == [alice.id, bob.id]
+
+    first.delete()
+    assert LeaderboardStanding.objects.get(user=alice).last_activity is None
+
+
+def test_my_leaderboard_rank_and_around_window(django_assert_max_num_queries):
+    """/me/ ranks via standings and ?around=N returns the surrounding window."""
+    client = APIClient()
+    users = [User.objects.create_user(username=f"win_{i}", password="x") for i in range(5)]
+    q = Question.objects.create(question="Q?", type="SHORT", week="W1", topic="Math", creator=users[0])
+    # win_0 has 5 attempts, win_1 has 4, ... win_4 has 1
+    for i, user in enumerate(users):
+        for _ in range(5 - i):
+            Attempt.objects.create(attempter=user, question=q, is_correct=False)
+
+    client.force_authenticate(users[2])
+    with django_assert_max_num_queries(6):
+        res = client.get(reverse("leaderboard-me"))
+    data = res.json()
+    assert data["rank"] == 3
+    assert data["total_users"] == 5
+
+    res = client.get(reverse("leaderboard-me") + "?around=1")
+    assert res.status_code == 200
+    data = res.json()
+    assert data["me"]["user_id"] == users[2].id
+    assert [r["user_id"] for r in data["around"]] == [users[1].id, users[2].id, users[3].id]
+    assert [r["rank"] for r in data["around"]] == [2, 3, 4]
+
+    client.force_authenticate(users[0])
+    res = client.get(reverse("leaderboard-me") + "?around=2")
+    assert [r["user_id"] for r in res.json()["around"]] == [users[0].id, users[1].id, users[2].id]
+
+
+def test_leaderboard_page_cache_etag_and_invalidation(settings, django_capture_on_commit_callbacks):
+    """Pages are served from cache with an ETag, answer 304, and refresh after a write."""
+    settings.LEADERBOARD_CACHE_MIN_STALENESS = 0
+    client = APIClient()
+    user = User.objects.create_user(username="cached", password="x")
+    client.force_authenticate(user)
+    q = Question.objects.create(question="Q?", type="SHORT", week="W1", topic="Math", creator=user)
+    with django_capture_on_commit_callbacks(execute=True):
+        Attempt.objects.create(attempter=user, question=q, is_correct=True)
+
+    url = reverse("leaderboard-list")
+    res = client.get(url)
+    assert res.status_code == 200
+    etag = res["ETag"]
+    assert res["Last-Modified"]
+    assert res.json()["results"][0]["attempts"] == 1
+
+    res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Attempt.objects.create(attempter=user, question=q, is_correct=False)
+
+    res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res["ETag"] != etag
+    assert res.json()["results"][0]["attempts"] == 2
+
+
+def test_leaderboard_min_staleness_window_reuses_page(settings, django_capture_on_commit_callbacks):
+    """Within the staleness window a write does not force a rebuild."""
+    settings.LEADERBOARD_CACHE_MIN_STALENESS = 3600
+    client = APIClient()
+    user = User.objects.create_user(username="stale", password="x")
+    client.force_authenticate(user)
+    q = Question.objects.create(question="Q?", type="SHORT", week="W1", topic="Math", creator=user)
+
+    url = reverse("leaderboard-list")
+    assert client.get(url).json()["count"] == 0
+    with django_capture_on_commit_callbacks(execute=True):
+        Attempt.objects.create(attempter=user, question=q, is_correct=True)
+    assert client.get(url).json()["count"] == 0
+    assert client.get(url + "?page_size=5").json()["count"] == 1
@@ -2,29 +2,34 @@
 
 from datetime import datetime, timezone, date
 
-from django.apps import apps
-from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q, Max, IntegerField, F, Value
+from django.db.models import Sum, Q, Max, IntegerField, F, Value
 from django.db.models.functions import Coalesce
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from attempts.models import Attempt
+from attempts.models import AttemptDailyRollup
+from .cache import cached_response
+from .models import LeaderboardStanding
 from .serializers import LeaderboardRowSerializer, MyLeaderboardSerializer
+from .services import (
+    POINT_PER_ATTEMPT,
+    BONUS_CORRECT,
+    POINT_WEIGHTS,
+    REVERSE_STANDING_ORDER,
+    ranked_standings,
+    rank_key,
+    dense_rank,
+    standing_window,
+)
 
 
 User = get_user_model()
 
-# --- Scoring ---
-POINT_PER_ATTEMPT = getattr(settings, "LEADERBOARD_POINTS_PER_ATTEMPT", 1)
-BONUS_CORRECT = getattr(settings, "LEADERBOARD_POINTS_BONUS_CORRECT", 9)
-
-POINT_PER_COMMENT = getattr(settings, "LEADERBOARD_POINTS_PER_COMMENT", 0)
-POINT_PER_RATING  = getattr(settings, "LEADERBOARD_POINTS_PER_RATING", 0)
-POINT_PER_LIKE    = getattr(settings, "LEADERBOARD_POINTS_PER_LIKE", 0)
+FILTER_PARAMS = ("week", "topic", "from", "to")
+MAX_AROUND = 25
 
 def _safe_dt(dt):
     """Convert None to a comparable datetime (for sorting purposes)."""
@@ -39,35 +44,30 @@ def _parse_date(s: str | None) -> date | None:
     except Exception:
         return None
 
-def _get_existing_activity_models():
-    """
-    From the models registered in settings.LEADERBOARD_ACTIVITY_MODELS,
-    return only the models that actually 'exist' in the project as [(ModelClass, user_field, label)].
-    """
-    models_cfg = getattr(settings, "LEADERBOARD_ACTIVITY_MODELS", {}) or {}
-    existing = []
-    for label, meta in models_cfg.items():
+def _display_fields(user, request) -> dict:
+    """display_name (profile name, falling back to username) and absolute profile picture URL."""
+    profile = getattr(user, "profile", None)
+    display_name = profile.display_name if profile and profile.display_name else user.username
+    profile_picture_url = None
+    if profile and profile.profile_picture:
         try:
-            model_cls = apps.get_model(label)
-        except LookupError:
-            continue
-        if model_cls is None:
-            continue
-        user_field = meta.get("user_field", "user")
-        existing.append((model_cls, user_field, label))
-    return existing
-
-def _count_by_user(model_cls, user_field: str, filters: dict | None = None) -> dict[int, int]:
-    """
-    Aggregate the count per user from the given model using values(<user_field>)
-    and return as a {user_id: count} dictionary.
-    """
-    qs = model_cls.objects.all()
-    if filters:
-        qs = qs.filter(**filters)
-    rows = qs.values(user_field).annotate(c=Count("id"))
-    # When using values(user_field), the user_field value is stored in the <field_name> key.
-    return {row[user_field]: row["c"] for row in rows}
+            profile_picture_url = request.build_absolute_uri(profile.profile_picture.url)
+        except Exception:
+            profile_picture_url = profile.profile_picture.url
+    return {
+        "display_name": display_name,
+        "profile_picture_url": profile_picture_url,
+    }
+
+def _has_filters(request) -> bool:
+    return any(request.query_params.get(name) for name in FILTER_PARAMS)
+
+def _parse_around(request) -> int | None:
+    """?around=N → rows either side of the caller (capped at MAX_AROUND); None when absent/invalid."""
+    try:
+        return max(0, min(int(request.query_params["around"]), MAX_AROUND))
+    except (KeyError, TypeError, ValueError):
+        return None
 
 
 # ---------- Pagination ----------
@@ -78,14 +78,14 @@ class LeaderboardPagination(PageNumberPagination):
 
 
 # ---------- Filters ----------
-def _filtered_attempts(qs, request):
+def _filtered_rollups(qs, request):
     """
     쿼리스트링 필터:
       ?week=W1,W2
       ?topic=Physics
       ?from=2025-01-01&to=2025-03-31
-    Attempt.question(→ Question)의 week/topic을 가정한다.
-    Attempt의 타임스탬프 필드는 'submitted_at'을 사용한다.
+    AttemptDailyRollup은 Attempt를 (user, date, week, topic) 단위로 미리 집계한 테이블이다.
+    week/topic은 시도 당시 Question의 값, date는 submitted_at의 날짜이다.
     """
     week = request.query_params.get("week")
     topic = request.query_params.get("topic")
@@ -94,35 +94,35 @@ def _filtered_attempts(qs, request):
 
     if week:
         weeks = [w.strip() for w in week.split(",") if w.strip()]
-        qs = qs.filter(question__week__in=weeks)
+        qs = qs.filter(week__in=weeks)
     if topic:
-        qs = qs.filter(question__topic__iexact=topic)
+        qs = qs.filter(topic__iexact=topic)
     if date_from:
-        qs = qs.filter(submitted_at__date__gte=date_from)
+        qs = qs.filter(date__gte=date_from)
     if date_to:
-        qs = qs.filter(submitted_at__date__lte=date_to)
+        qs = qs.filter(date__lte=date_to)
     return qs
 
 
 # ---------- Core Aggregation ----------
 def _base_rows(request):
     """
-    Aggregate per user:
+    Aggregate per user over the filtered AttemptDailyRollup buckets:
       attempts: total number of attempts
       correct: number of correct answers
-      points: base attempt/correct score + activity weights (comments/ratings/likes)
-      last_activity: maximum value of Attempt.submitted_at
+      points: base attempt/correct score + activity weights (comments/ratings)
+      last_activity: latest Attempt.submitted_at within the filter
     Then sort in Python and assign dense rank.
     """
-    # 1) Base aggregation from Attempt
-    qs = _filtered_attempts(Attempt.objects.all(), request)
+    # 1) Base aggregation from the attempt rollup
+    qs = _filtered_rollups(AttemptDailyRollup.objects.all(), request)
 
     agg_qs = (
         qs.values("attempter")
           .annotate(
-              attempts=Count("id"),
-              correct=Count("id", filter=Q(is_correct=True)),
-              last_activity=Max("submitted_at"),
+              attempts=Sum("attempts"),
+              correct=Sum("correct"),
+              last_activity=Max("last_submitted_at"),
           )
           .annotate(
               points=Coalesce(
@@ -131,25 +131,15 @@ def _base_rows(request):
                   output_field=IntegerField(),
               )
           )
+          .filter(attempts__gt=0)
+          .order_by()
     )
     agg = list(agg_qs)  # Evaluate query
 
     # 2) User display name and profile picture map
     user_ids_from_attempts = [r["attempter"] for r in agg]
     users = User.objects.filter(id__in=user_ids_from_attempts).select_related('profile')
-    user_map = {}
-    for u in users:
-        display_name = u.profile.display_name if hasattr(u, 'profile') and u.profile.display_name else u.username
-        profile_picture_url = None
-        if hasattr(u, 'profile') and u.profile.profile_picture:
-            try:
-                profile_picture_url = request.build_absolute_uri(u.profile.profile_picture.url)
-            except Exception:
-                profile_picture_url = u.profile.profile_picture.url
-        user_map[u.id] = {
-            'display_name': display_name,
-            'profile_picture_url': profile_picture_url
-        }
+    user_map = {u.id: _display_fields(u, request) for u in users}
 
     # 3) Build base rows
     rows = [
@@ -166,75 +156,75 @@ def _base_rows(request):
     ]
     rows_by_id = {r["user_id"]: r for r in rows}
 
-    # 4) Reflect activity model (comments/ratings/likes, etc.) scores
-    #    - Aggregate only existing models from those registered in settings.LEADERBOARD_ACTIVITY_MODELS
-    #    - Add count per user * activity weight to points
-    activity_models = _get_existing_activity_models()
-
-    for model_cls, user_field, label in activity_models:
-        label_lower = label.lower()
-        if label_lower.endswith(".comment"):
-            pts = POINT_PER_COMMENT
-        elif label_lower.endswith(".rating"):
-            pts = POINT_PER_RATING
-        elif label_lower.endswith(".like"):
-            pts = POINT_PER_LIKE
-        else:
-            pts = 0  # Undefined models get 0 points (can change policy if desired)
-
-        if pts == 0:
-            continue
-
-        count_map = _count_by_user(model_cls, user_field)
-
-        # Whether to include users who only have activity but no Attempts in rows:
-        # - If included, they will appear in the overall ranking (implemented to include them here).
-        extra_user_ids = set(count_map.keys()) - set(rows_by_id.keys())
-        if extra_user_ids:
-            # Fill in display_name and profile_picture_url
-            missing_users = User.objects.filter(id__in=list(extra_user_ids)).select_related('profile')
-            for u in missing_users:
-                display_name = u.profile.display_name if hasattr(u, 'profile') and u.profile.display_name else u.username
-                profile_picture_url = None
-                if hasattr(u, 'profile') and u.profile.profile_picture:
-                    try:
-                        profile_picture_url = request.build_absolute_uri(u.profile.profile_picture.url)
-                    except Exception:
-                        profile_picture_url = u.profile.profile_picture.url
-                rows_by_id[u.id] = {
-                    "user_id": u.id,
-                    "display_name": display_name,
-                    "profile_picture_url": profile_picture_url,
+    # 4) Reflect activity (comments/ratings) scores
+    #    - Activity is not filtered by week/topic/date; the counts come from LeaderboardStanding
+    #    - Users with activity points but no matching attempts are included in the ranking
+    activity_weights = {
+        field: POINT_WEIGHTS[field]
+        for field in ("comment_count", "rating_count")
+        if POINT_WEIGHTS.get(field)
+    }
+    if activity_weights:
+        has_activity = Q()
+        for field in activity_weights:
+            has_activity |= Q(**{f"{field}__gt": 0})
+        active = LeaderboardStanding.objects.filter(has_activity).select_related("user", "user__profile")
+        for standing in active:
+            activity_points = sum(getattr(standing, field) * pts for field, pts in activity_weights.items())
+            r = rows_by_id.get(standing.user_id)
+            if r is None:
+                r = rows_by_id[standing.user_id] = {
+                    "user_id": standing.user_id,
+                    **_display_fields(standing.user, request),
                     "attempts": 0,
                     "correct": 0,
                     "points": 0,
                     "last_activity": None,
                 }
-
-        # Add points
-        for uid, cnt in count_map.items():
-            r = rows_by_id.get(uid)
-            if r:
-                r["points"] += cnt * pts
+            r["points"] += activity_points
 
     # 5) Reconstruct dict → list
     rows = list(rows_by_id.values())
 
-    # 6) Sort: points ↓, correct ↓, last_activity ↓, user_id ↑
+    # 6) Sort: points ↓, correct ↓, last_activity ↑, user_id ↑
     rows.sort(
         key=lambda x: (-x["points"], -x["correct"], _safe_dt(x["last_activity"]), x["user_id"])
     )
 
     # 7) Dense rank
-    rank = 0
+    _assign_dense_ranks(rows)
+    return rows
+
+
+def _assign_dense_ranks(rows, first_rank: int = 1):
+    """Assign dense ranks to already-sorted rows, starting from `first_rank`."""
+    rank = first_rank - 1
     prev_key = None
     for r in rows:
-        key = (r["points"], r["correct"], r["last_activity"])
+        key = rank_key(r)
         if key != prev_key:
             rank += 1
             prev_key = key
         r["rank"] = rank
+    return rows
+
+
+def _standing_row(standing, request) -> dict:
+    return {
+        "user_id": standing.user_id,
+        **_display_fields(standing.user, request),
+        "attempts": standing.attempts,
+        "correct": standing.correct,
+        "points": standing.points,
+        "last_activity": standing.last_activity,
+    }
 
+
+def _standing_page_rows(standings, request):
+    """Rows for one page of ranked standings; only the page's first rank needs a query."""
+    rows = [_standing_row(s, request) for s in standings]
+    if rows:
+        _assign_dense_ranks(rows, first_rank=dense_rank(rank_key(rows[0])))
     return rows
 
 
@@ -244,61 +234,98 @@ class LeaderboardView(ListAPIView):
     GET /api/leaderboard/
     GET /api/leaderboard/?week=W1,W2&topic=Physics&from=2025-01-01&to=2025-03-31
     전체(혹은 필터된) 순위를 페이지네이션하여 반환한다.
+    Unfiltered requests page through the persisted LeaderboardStanding table.
+    Pages are cached per filter set + page + page_size (see leaderboard.cache).
     """
     permission_classes = [IsAuthenticated]
     pagination_class = LeaderboardPagination
     serializer_class = LeaderboardRowSerializer
 
     def get_queryset(self):
-        # Only exists for DRF generic view interface requirements (actual queryset is not used)
-        return User.objects.none()
+        return ranked_standings()
 
     def list(self, request, *args, **kwargs):
-        rows = _base_rows(request)
-        page = self.paginate_queryset(rows)
+        return cached_response(request, lambda: self._page_data(request))
+
+    def _page_data(self, request):
+        if _has_filters(request):
+            page = self.paginate_queryset(_base_rows(request))
+        else:
+            page = _standing_page_rows(self.paginate_queryset(self.get_queryset()), request)
         ser = self.get_serializer(page, many=True)
-        return self.get_paginated_response(ser.data)
+        return self.get_paginated_response(ser.data).data
 
 
 class MyLeaderboardView(RetrieveAPIView):
     """
     GET /api/leaderboard/me/
+    GET /api/leaderboard/me/?around=3
+
+    Without filters the caller's rank is one "distinct better keys" count over
+    LeaderboardStanding, so the cost does not grow with the number of ranked users.
+    With ?around=N the response becomes {"me": row, "around": [rows]}, where
+    `around` is the contiguous window of up to N rows either side of the caller
+    (the caller included).
     """
     permission_classes = [IsAuthenticated]
     serializer_class = LeaderboardRowSerializer
 
     def retrieve(self, request, *args, **kwargs):
+        around = _parse_around(request)
+        if _has_filters(request):
+            me, window = self._from_rows(request, around)
+        else:
+            me, window = self._from_standings(request, around)
+
+        if around is None:
+            return Response(self.get_serializer(me).data)
+        return Response(MyLeaderboardSerializer({"me": me, "around": window}).data)
+
+    def _unranked_row(self, request, total_users):
+        # User has no activity records, return default values and use display_name
+        return {
+            "user_id": request.user.id,
+            **_display_fields(request.user, request),
+            "attempts": 0,
+            "correct": 0,
+            "points": 0,
+            "last_activity": None,
+            "rank": total_users + 1,
+            "total_users": total_users,
+        }
+
+    def _from_standings(self, request, around):
+        ranked = ranked_standings()
+        total_users = ranked.count()
+        standing = ranked.filter(user=request.user).first()
+
+        if standing is None:
+            me = self._unranked_row(request, total_users)
+            window = []
+            if around:
+                tail = list(ranked.order_by(*REVERSE_STANDING_ORDER)[:around])[::-1]
+                window = _standing_page_rows(tail, request)
+            return me, window + [me]
+
+        me = _standing_row(standing, request)
+        me["rank"] = dense_rank(rank_key(me))
+        me["total_users"] = total_users
+
+        window = None
+        if around is not None:
+            window = _standing_page_rows(standing_window(standing, around), request)
+        return me, window
+
+    def _from_rows(self, request, around):
         rows = _base_rows(request)
         my_id = request.user.id
         idx = next((i for i, r in enumerate(rows) if r["user_id"] == my_id), None)
 
         if idx is None:
-            # User has no activity records, return default values and use display_name
-            display_name = (
-                request.user.profile.display_name 
-                if hasattr(request.user, 'profile') and request.user.profile.display_name 
-                else request.user.username
-            )
-            profile_picture_url = None
-            if hasattr(request.user, 'profile') and request.user.profile.profile_picture:
-                try:
-                    profile_picture_url = request.build_absolute_uri(request.user.profile.profile_picture.url)
-                except Exception:
-                    profile_picture_url = request.user.profile.profile_picture.url
-            me = {
-                "user_id": my_id,
-                "display_name": display_name,
-                "profile_picture_url": profile_picture_url,
-                "attempts": 0,
-                "correct": 0,
-                "points": 0,
-                "last_activity": None,
-                "rank": len(rows) + 1,
-                "total_users": len(rows),
-            }
+            me = self._unranked_row(request, len(rows))
+            window = (rows[-around:] if around else []) + [me]
         else:
             me = rows[idx].copy()
             me["total_users"] = len(rows)
-
-        ser = self.get_serializer(me)
-        return Response(ser.data)
+            window = rows[max(0, idx - (around or 0)): idx + (around or 0) + 1]
+        return me, window
@@ -0,0 +1,26 @@
+# questions/ai.py
+
+from .ai_client import get_client
+
+# Prefix of the text older releases stored in ai_answer when generation failed
+FALLBACK_PREFIX = "AI explanation failed"
+
+# AICompletionCall.purpose of explanation requests
+PURPOSE = "explanation"
+
+
+def build_prompt(question_text, answer_text):
+    return f"""
+        You are an assistant generating explanations for short-answer questions.
+        Question: {question_text}
+        Expected answer: {answer_text}
+        Please provide a clear, short explanation that helps a student understand the answer.
+        """
+
+
+def generate_explanation(question_text, answer_text):
+    """
+    Ask the completions API to explain an answer. Returns a Completion (text plus call
+    metrics for ai_client.record_call); raises ai_client.CompletionError on any failure.
+    """
+    return get_client().complete([{"role": "user", "content": build_prompt(question_text, answer_text)}])
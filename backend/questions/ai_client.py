@@ -0,0 +1,188 @@
+# questions/ai_client.py
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+class CompletionError(Exception):
+    """A completion request failed; `metrics` describes the call (None if it was never sent)."""
+
+    def __init__(self, message, metrics=None):
+        super().__init__(message)
+        self.metrics = metrics
+
+
+class CircuitOpenError(CompletionError):
+    """The circuit breaker is open, so the request was not sent."""
+
+
+@dataclass
+class CallMetrics:
+    status: str                      # "ok", "error" or "circuit_open"
+    latency_ms: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    error: str = ""
+
+
+@dataclass
+class Completion:
+    content: str
+    metrics: CallMetrics
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls for `reset_seconds`.
+    It then lets a single trial call through: success closes it, failure reopens it.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class CompletionsClient:
+    """
+    Chat completions over one pooled keep-alive session, with separate connect/read
+    timeouts and a circuit breaker. Safe to share between threads.
+    """
+
+    def __init__(self, pool_size: int, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _headers(self):
+        headers = {
+            "Authorization": f"Bearer {os.environ.get('OPENAI_API_KEY') or settings.OPENAI_API_KEY}",
+            "Content-Type": "application/json",
+        }
+        project_id = os.environ.get("OPENAI_PROJECT_ID") or getattr(settings, "OPENAI_PROJECT_ID", None)
+        if project_id:
+            headers["OpenAI-Project"] = project_id
+        return headers
+
+    def complete(self, messages, model=None) -> Completion:
+        """Return the first choice's text. Raises CompletionError (CircuitOpenError when short-circuited)."""
+        if not self.breaker.allow():
+            raise CircuitOpenError("completions API circuit is open", CallMetrics(status="circuit_open"))
+
+        payload = {"model": model or settings.AI_MODEL, "messages": messages}
+        started = time.monotonic()
+        try:
+            response = self.session.post(
+                settings.AI_COMPLETIONS_URL,
+                headers=self._headers(),
+                json=payload,
+                timeout=(settings.AI_CONNECT_TIMEOUT, settings.AI_REQUEST_TIMEOUT),
+            )
+            response.raise_for_status()
+            data = response.json()
+            content = data["choices"][0]["message"]["content"].strip()
+            if not content:
+                raise ValueError("empty completion")
+        except (requests.RequestException, ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            self.breaker.record_failure()
+            metrics = CallMetrics(status="error", latency_ms=_elapsed_ms(started), error=str(e)[:500])
+            raise CompletionError(str(e), metrics) from e
+
+        self.breaker.record_success()
+        usage = data.get("usage") or {}
+        return Completion(
+            content=content,
+            metrics=CallMetrics(
+                status="ok",
+                latency_ms=_elapsed_ms(started),
+                prompt_tokens=usage.get("prompt_tokens") or 0,
+                completion_tokens=usage.get("completion_tokens") or 0,
+            ),
+        )
+
+
+def _elapsed_ms(started) -> int:
+    return int((time.monotonic() - started) * 1000)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> CompletionsClient:
+    """The process-wide client, built from settings on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = CompletionsClient(
+                pool_size=settings.AI_POOL_SIZE,
+                breaker=CircuitBreaker(settings.AI_BREAKER_THRESHOLD, settings.AI_BREAKER_RESET_SECONDS),
+            )
+        return _client
+
+
+def reset_client():
+    """Drop the shared client (closing its connections), e.g. after changing AI settings."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.session.close()
+        _client = None
+
+
+def record_call(metrics, purpose: str):
+    """Store one call's latency and token usage; call from the thread that owns the DB connection."""
+    from .models import AICompletionCall
+
+    if metrics is None:
+        return
+    AICompletionCall.objects.create(
+        purpose=purpose,
+        status=metrics.status,
+        latency_ms=metrics.latency_ms,
+        prompt_tokens=metrics.prompt_tokens,
+        completion_tokens=metrics.completion_tokens,
+        error=metrics.error,
+    )
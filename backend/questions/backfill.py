@@ -0,0 +1,120 @@
+# questions/backfill.py
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.db.models import Q
+
+from . import explanation_cache
+from .ai import FALLBACK_PREFIX, PURPOSE, generate_explanation
+from .ai_client import CompletionError, record_call
+from .models import ExplanationJob, ShortAnswerQuestion
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads; rate <= 0 disables it."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(max(start - now, 0))
+
+
+def needs_backfill():
+    """Short answers with no explanation or the old failure text, excluding ones a worker job still owns."""
+    active = ExplanationJob.objects.filter(
+        status__in=[ExplanationJob.Status.PENDING, ExplanationJob.Status.RUNNING],
+    ).values("short_answer_id")
+    return (
+        ShortAnswerQuestion.objects
+        .filter(Q(ai_answer__isnull=True) | Q(ai_answer="") | Q(ai_answer__startswith=FALLBACK_PREFIX))
+        .exclude(id__in=active)
+        .select_related("question")
+        .order_by("id")
+    )
+
+
+def _read_checkpoint(path):
+    if path and Path(path).exists():
+        return json.loads(Path(path).read_text()).get("last_id", 0)
+    return 0
+
+
+def _write_checkpoint(path, last_id):
+    if path:
+        Path(path).write_text(json.dumps({"last_id": last_id}))
+
+
+def backfill_explanations(concurrency=4, rate=0.0, batch_size=50, checkpoint=None, limit=None, log=None):
+    """
+    Regenerate missing or failed explanations. Each batch is generated on a pool of
+    `concurrency` threads (only the HTTP calls run there), written with one bulk_update
+    and then checkpointed, so an interrupted run resumes after the last written batch.
+    Returns {"processed", "repaired", "failed"}.
+    """
+    limiter = RateLimiter(rate)
+    totals = {"processed": 0, "repaired": 0, "failed": 0}
+    last_id = _read_checkpoint(checkpoint)
+
+    def generate(short_answer):
+        """Runs on the pool: returns (text or None, metrics); DB writes stay on the main thread."""
+        limiter.wait()
+        try:
+            completion = generate_explanation(short_answer.question.question, short_answer.answer)
+        except CompletionError as e:
+            if log:
+                log(f"Question {short_answer.question_id}: {e}")
+            return None, e.metrics
+        return completion.content, completion.metrics
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        while limit is None or totals["processed"] < limit:
+            size = batch_size if limit is None else min(batch_size, limit - totals["processed"])
+            batch = list(needs_backfill().filter(id__gt=last_id)[:size])
+            if not batch:
+                break
+
+            explanations = {}
+            uncached = []
+            for short_answer in batch:
+                cached = explanation_cache.lookup(short_answer.question.question, short_answer.answer, record=False)
+                if cached:
+                    explanations[short_answer.pk] = cached
+                else:
+                    uncached.append(short_answer)
+            for short_answer, (explanation, metrics) in zip(uncached, pool.map(generate, uncached)):
+                record_call(metrics, PURPOSE)
+                if explanation:
+                    explanation_cache.store(short_answer.question.question, short_answer.answer, explanation)
+                    explanations[short_answer.pk] = explanation
+
+            repaired = []
+            for short_answer in batch:
+                if short_answer.pk in explanations:
+                    short_answer.ai_answer = explanations[short_answer.pk]
+                    repaired.append(short_answer)
+            ShortAnswerQuestion.objects.bulk_update(repaired, ["ai_answer"])
+            ExplanationJob.objects.filter(
+                short_answer__in=repaired, status=ExplanationJob.Status.FAILED,
+            ).update(status=ExplanationJob.Status.DONE, last_error="")
+
+            last_id = batch[-1].pk
+            _write_checkpoint(checkpoint, last_id)
+            totals["processed"] += len(batch)
+            totals["repaired"] += len(repaired)
+            totals["failed"] += len(batch) - len(repaired)
+            if log:
+                log(f"Up to id {last_id}: {totals['repaired']} repaired, {totals['failed']} failed")
+    return totals
@@ -0,0 +1,88 @@
+# questions/explanation_cache.py
+
+import hashlib
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ExplanationCacheCounter, ExplanationCacheEntry
+
+HITS = "hits"
+MISSES = "misses"
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text) -> str:
+    """Case- and whitespace-insensitive form of question/answer text."""
+    return _SPACE_RE.sub(" ", (text or "").strip().lower())
+
+
+def cache_key(question_text, answer_text) -> str:
+    material = f"{normalize_text(question_text)}\x1f{normalize_text(answer_text)}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _expiry_cutoff():
+    return timezone.now() - timedelta(days=settings.AI_EXPLANATION_CACHE_MAX_AGE_DAYS)
+
+
+def _count(name):
+    updated = ExplanationCacheCounter.objects.filter(name=name).update(value=F("value") + 1)
+    if not updated:
+        try:
+            with transaction.atomic():
+                ExplanationCacheCounter.objects.create(name=name, value=1)
+        except IntegrityError:
+            ExplanationCacheCounter.objects.filter(name=name).update(value=F("value") + 1)
+
+
+def lookup(question_text, answer_text, record: bool = True):
+    """
+    Cached explanation for this question/answer pair, or None. `record` counts the
+    lookup as a hit or miss; the worker re-checks with record=False.
+    """
+    key = cache_key(question_text, answer_text)
+    entry = ExplanationCacheEntry.objects.filter(key=key, created_at__gte=_expiry_cutoff()).first()
+    if entry is None:
+        if record:
+            _count(MISSES)
+        return None
+    ExplanationCacheEntry.objects.filter(pk=entry.pk).update(hits=F("hits") + 1, last_used_at=timezone.now())
+    if record:
+        _count(HITS)
+    return entry.explanation
+
+
+def store(question_text, answer_text, explanation):
+    ExplanationCacheEntry.objects.update_or_create(
+        key=cache_key(question_text, answer_text),
+        defaults={"explanation": explanation, "created_at": timezone.now(), "last_used_at": timezone.now()},
+    )
+    evict()
+
+
+def evict() -> int:
+    """Drop entries past AI_EXPLANATION_CACHE_MAX_AGE_DAYS, then the least recently used beyond MAX_ENTRIES."""
+    removed, _ = ExplanationCacheEntry.objects.filter(created_at__lt=_expiry_cutoff()).delete()
+    overflow = ExplanationCacheEntry.objects.count() - settings.AI_EXPLANATION_CACHE_MAX_ENTRIES
+    if overflow > 0:
+        stale = ExplanationCacheEntry.objects.order_by("last_used_at", "id").values_list("id", flat=True)[:overflow]
+        removed += ExplanationCacheEntry.objects.filter(id__in=list(stale)).delete()[0]
+    return removed
+
+
+def stats() -> dict:
+    counters = dict(ExplanationCacheCounter.objects.values_list("name", "value"))
+    hits = counters.get(HITS, 0)
+    misses = counters.get(MISSES, 0)
+    return {
+        "entries": ExplanationCacheEntry.objects.count(),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else None,
+    }
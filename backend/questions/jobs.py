@@ -0,0 +1,110 @@
+# questions/jobs.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import explanation_cache
+from .ai import PURPOSE, generate_explanation
+from .ai_client import CircuitOpenError, CompletionError, record_call
+from .models import ExplanationJob, ShortAnswerQuestion
+
+
+def enqueue_explanation(short_answer):
+    """Queue an AI explanation for `short_answer`; a worker fills ai_answer later."""
+    return ExplanationJob.objects.create(short_answer=short_answer)
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the `attempts`-th failed try, capped at AI_JOB_BACKOFF_MAX_SECONDS."""
+    seconds = settings.AI_JOB_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.AI_JOB_BACKOFF_MAX_SECONDS))
+
+
+def claim_jobs(limit: int, exclude=()):
+    """
+    Mark up to `limit` due jobs (other than the ids in `exclude`) RUNNING and return them.
+    Jobs left RUNNING longer than AI_JOB_LEASE_SECONDS (a worker died mid-call) are due
+    again. On PostgreSQL the claim skips rows another worker has locked, so workers never
+    share a job.
+    """
+    now = timezone.now()
+    due = (
+        Q(status=ExplanationJob.Status.PENDING, run_after__lte=now)
+        | Q(status=ExplanationJob.Status.RUNNING, locked_at__lt=now - timedelta(seconds=settings.AI_JOB_LEASE_SECONDS))
+    )
+    with transaction.atomic():
+        ids = list(
+            ExplanationJob.objects.select_for_update(skip_locked=True)
+            .filter(due).exclude(id__in=exclude).order_by("run_after", "id").values_list("id", flat=True)[:limit]
+        )
+        ExplanationJob.objects.filter(id__in=ids).update(
+            status=ExplanationJob.Status.RUNNING,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+    return list(ExplanationJob.objects.select_related("short_answer__question").filter(id__in=ids).order_by("run_after", "id"))
+
+
+def run_job(job) -> bool:
+    """Generate the explanation for a claimed job. Failures are retried with backoff until AI_JOB_MAX_ATTEMPTS."""
+    short_answer = job.short_answer
+    question_text = short_answer.question.question
+    # A duplicate queued before the first one finished is answered from the cache
+    explanation = explanation_cache.lookup(question_text, short_answer.answer, record=False)
+    try:
+        if explanation is None:
+            completion = generate_explanation(question_text, short_answer.answer)
+            record_call(completion.metrics, PURPOSE)
+            explanation = completion.content
+            explanation_cache.store(question_text, short_answer.answer, explanation)
+    except CompletionError as e:
+        record_call(e.metrics, PURPOSE)
+        job.last_error = str(e)[:2000]
+        if isinstance(e, CircuitOpenError):
+            # Never sent, so it does not use up one of the job's tries
+            job.attempts -= 1
+            job.status = ExplanationJob.Status.PENDING
+            job.run_after = timezone.now() + timedelta(seconds=settings.AI_BREAKER_RESET_SECONDS)
+        elif job.attempts >= settings.AI_JOB_MAX_ATTEMPTS:
+            job.status = ExplanationJob.Status.FAILED
+        else:
+            job.status = ExplanationJob.Status.PENDING
+            job.run_after = timezone.now() + backoff_delay(job.attempts)
+        job.locked_at = None
+        job.save(update_fields=["status", "attempts", "run_after", "locked_at", "last_error", "updated_at"])
+        return False
+
+    with transaction.atomic():
+        ShortAnswerQuestion.objects.filter(pk=short_answer.pk).update(ai_answer=explanation)
+        job.status = ExplanationJob.Status.DONE
+        job.last_error = ""
+        job.locked_at = None
+        job.save(update_fields=["status", "locked_at", "last_error", "updated_at"])
+    short_answer.ai_answer = explanation
+    return True
+
+
+def run_pending(limit: int = 10) -> tuple[int, int]:
+    """
+    Run up to `limit` due jobs, each at most once. Every job is claimed just before it runs,
+    so its lease only has to outlast one completion call (settings checks
+    AI_JOB_LEASE_SECONDS against the timeouts), never a whole batch. Returns (succeeded, failed).
+    """
+    succeeded = failed = 0
+    seen = []
+    for _ in range(limit):
+        claimed = claim_jobs(1, exclude=seen)
+        if not claimed:
+            break
+        job = claimed[0]
+        seen.append(job.id)
+        if run_job(job):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from questions.backfill import backfill_explanations, needs_backfill
+
+
+class Command(BaseCommand):
+    help = "Regenerate empty or failed AI explanations for short-answer questions, several at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=4, help="Completion requests in flight at once.")
+        parser.add_argument("--rate", type=float, default=2.0, help="Maximum requests per second (0 for no limit).")
+        parser.add_argument("--batch-size", type=int, default=50, help="Rows generated and written per batch.")
+        parser.add_argument("--checkpoint", help="JSON file recording the last written id; an existing file resumes after it.")
+        parser.add_argument("--limit", type=int, help="Stop after this many rows.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows need an explanation.")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            self.stdout.write(f"{needs_backfill().count()} short answers need an explanation.")
+            return
+        totals = backfill_explanations(
+            concurrency=options["concurrency"],
+            rate=options["rate"],
+            batch_size=options["batch_size"],
+            checkpoint=options["checkpoint"],
+            limit=options["limit"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {totals['processed']} short answers: {totals['repaired']} repaired, {totals['failed']} failed."
+        ))
@@ -0,0 +1,85 @@
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Lower, Replace
+
+from questions.models import Question, normalize_week
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the question list week/topic filters against the legacy Replace(Lower()) "
+        "annotation on a seeded question table. Seed rows are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--questions", type=int, default=50000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["questions"])
+                self.report(options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def seed(self, count):
+        creator, _ = User.objects.get_or_create(username="__benchmark__")
+        rng = random.Random(0)
+        weeks = [f"Week {n}" for n in range(1, 13)]
+        topics = [f"Topic {n}" for n in range(1, 16)]
+        questions = []
+        for i in range(count):
+            week = rng.choice(weeks)
+            questions.append(Question(
+                creator=creator,
+                question=f"Benchmark question {i}",
+                week=week,
+                normalized_week=normalize_week(week),
+                topic=rng.choice(topics),
+                type=rng.choice(Question.Type.values),
+                rating=rng.randint(0, 50) / 10,
+                num_attempts=rng.randint(0, 100),
+            ))
+        Question.objects.bulk_create(questions, batch_size=2000)
+        self.stdout.write(f"Seeded {count} questions")
+
+    def report(self, repeat):
+        wanted = ["week4"]
+        cases = {
+            "week (legacy annotate)": lambda: Question.objects.annotate(
+                week_normalized=Replace(Lower("week"), Value(" "), Value(""))
+            ).filter(week_normalized__in=wanted).order_by("-created_at", "-id"),
+            "week (normalized_week)": lambda: Question.objects.filter(
+                normalized_week__in=wanted
+            ).order_by("-created_at", "-id"),
+            "topic + newest": lambda: Question.objects.filter(topic="Topic 3").order_by("-created_at", "-id"),
+            "type + top rated": lambda: Question.objects.filter(type="MCQ").order_by("-rating", "-created_at", "-id"),
+        }
+        # A page is what a paginated client pays; count is the ?page=N total
+        runs = {
+            "first page": lambda qs: list(qs.values_list("id", flat=True)[:20]),
+            "count": lambda qs: qs.count(),
+        }
+        for label, build in cases.items():
+            for run_label, run in runs.items():
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    run(build())
+                    timings.append(time.perf_counter() - started)
+                timings.sort()
+                self.stdout.write(
+                    f"{label:<26} {run_label:<10} median {timings[len(timings) // 2] * 1000:7.2f} ms"
+                    f"   p95 {timings[int(len(timings) * 0.95) - 1] * 1000:7.2f} ms"
+                )
@@ -0,0 +1,48 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from questions.similarity import attempt_matrix, top_neighbors
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the item-item similarity computation on a synthetic attempt matrix "
+        "(no database access): full build and an incremental refresh of a few questions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--questions", type=int, default=20000)
+        parser.add_argument("--attempts-per-user", type=int, default=40)
+        parser.add_argument("--top-k", type=int, default=20)
+        parser.add_argument("--min-common", type=int, default=2)
+        parser.add_argument("--refresh", type=int, default=500, help="Questions recomputed in the incremental case.")
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        users, questions = options["users"], options["questions"]
+        per_user = options["attempts_per_user"]
+
+        # Popularity is skewed: a few questions get most attempts, as on the live site
+        popularity = 1.0 / np.arange(1, questions + 1) ** 0.8
+        popularity /= popularity.sum()
+        item_index = rng.choice(questions, size=users * per_user, p=popularity)
+        user_index = np.repeat(np.arange(users), per_user)
+
+        started = time.perf_counter()
+        matrix = attempt_matrix(user_index, item_index, users, questions)
+        built = time.perf_counter()
+        stored = sum(len(block[0]) for block in top_neighbors(matrix, options["top_k"], options["min_common"]))
+        full = time.perf_counter()
+        refresh = rng.choice(questions, size=min(options["refresh"], questions), replace=False)
+        refreshed = sum(
+            len(block[0]) for block in top_neighbors(matrix, options["top_k"], options["min_common"], refresh)
+        )
+        incremental = time.perf_counter()
+
+        self.stdout.write(f"{users} users x {questions} questions, {matrix.nnz} attempted pairs")
+        self.stdout.write(f"matrix build        {(built - started) * 1000:9.1f} ms")
+        self.stdout.write(f"full top-k          {(full - built) * 1000:9.1f} ms   {stored} neighbours")
+        self.stdout.write(f"refresh {len(refresh):>5} items {(incremental - full) * 1000:9.1f} ms   {refreshed} neighbours")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from questions.similarity import build_neighbors
+
+
+class Command(BaseCommand):
+    help = "Compute each question's top co-attempt neighbours (\"students who attempted this also attempted\")."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=20, help="Neighbours kept per question.")
+        parser.add_argument("--min-common", type=int, default=2, help="Users two questions must share to be neighbours.")
+        parser.add_argument(
+            "--incremental", action="store_true",
+            help="Only recompute questions with new attempters since the last run (full run if there is none).",
+        )
+
+    def handle(self, *args, **options):
+        totals = build_neighbors(
+            top_k=options["top_k"],
+            min_common=options["min_common"],
+            incremental=options["incremental"],
+            log=self.stdout.write,
+        )
+        mode = "incremental" if totals["incremental"] else "full"
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {totals['neighbors']} neighbours for {totals['questions']} questions ({mode} run)."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from questions.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rewrite every question search document (and the SQLite FTS index) from the question table."
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} questions for search."))
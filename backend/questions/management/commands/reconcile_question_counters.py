@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from questions.services import reconcile_comment_likes, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Question.num_attempts, rating aggregates and Comment.like_count from "
+        "attempts, ratings and likes, repairing drift."
+    )
+
+    def handle(self, *args, **options):
+        count = reconcile_counters()
+        self.stdout.write(self.style.SUCCESS(f"Repaired counters on {count} questions."))
+        count = reconcile_comment_likes()
+        self.stdout.write(self.style.SUCCESS(f"Repaired like counts on {count} comments."))
@@ -0,0 +1,45 @@
+import time
+import traceback
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from questions.jobs import run_pending
+
+# Longest wait between polls after repeated errors (database down, etc.)
+MAX_ERROR_SLEEP = 60.0
+
+
+class Command(BaseCommand):
+    help = "Generate queued AI explanations for short-answer questions, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=10, help="Jobs run per poll (each claimed just before it runs).")
+        parser.add_argument("--sleep", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due instead of polling.")
+
+    def handle(self, *args, **options):
+        error_sleep = options["sleep"]
+        while True:
+            if not options["burst"]:
+                # Long-running: drop connections the database closed (restart, idle timeout) before reuse
+                close_old_connections()
+            try:
+                succeeded, failed = run_pending(options["batch"])
+            except Exception:
+                if options["burst"]:
+                    raise
+                # Keep the worker alive: report, drop the connection and back off before the next poll
+                self.stderr.write(self.style.ERROR(f"AI worker poll failed:\n{traceback.format_exc()}"))
+                close_old_connections()
+                time.sleep(error_sleep)
+                error_sleep = min(error_sleep * 2, MAX_ERROR_SLEEP)
+                continue
+            error_sleep = options["sleep"]
+            if succeeded or failed:
+                self.stdout.write(f"Explained {succeeded} questions, {failed} failed.")
+                continue
+            if options["burst"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS("No AI explanation jobs due."))
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.5 on 2026-10-17 16:24
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copies of questions.search as of this migration; later changes to that
+# module must not alter what this migration does.
+POSTGRES_INSTALL = [
+    'CREATE INDEX IF NOT EXISTS "question_search_gin" ON "questions_questionsearchdocument" '
+    "USING gin ((to_tsvector('english'::regconfig, COALESCE(\"content\", ''))))",
+]
+POSTGRES_UNINSTALL = [
+    'DROP INDEX IF EXISTS "question_search_gin"',
+]
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS questions_search_fts USING fts5("
+    "content, content='questions_questionsearchdocument', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS questions_search_fts_ai AFTER INSERT ON questions_questionsearchdocument BEGIN "
+    "INSERT INTO questions_search_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS questions_search_fts_ad AFTER DELETE ON questions_questionsearchdocument BEGIN "
+    "INSERT INTO questions_search_fts(questions_search_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS questions_search_fts_au AFTER UPDATE ON questions_questionsearchdocument BEGIN "
+    "INSERT INTO questions_search_fts(questions_search_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    "INSERT INTO questions_search_fts(rowid, content) VALUES (new.id, new.content); END",
+    "INSERT INTO questions_search_fts(questions_search_fts) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS questions_search_fts_ai",
+    "DROP TRIGGER IF EXISTS questions_search_fts_ad",
+    "DROP TRIGGER IF EXISTS questions_search_fts_au",
+    "DROP TABLE IF EXISTS questions_search_fts",
+]
+
+
+def document_text(question_text, topic, week, username):
+    week = week or ""
+    parts = [question_text or "", topic or "", week, re.sub(r"\s+", "", week), username or ""]
+    return "\n".join(part for part in parts if part)
+
+
+def backfill_documents(apps, schema_editor):
+    """Create a search document for every existing question"""
+    Question = apps.get_model("questions", "Question")
+    QuestionSearchDocument = apps.get_model("questions", "QuestionSearchDocument")
+    QuestionSearchDocument.objects.bulk_create(
+        [
+            QuestionSearchDocument(
+                question_id=q.pk,
+                content=document_text(q.question, q.topic, q.week, q.creator.username),
+            )
+            for q in Question.objects.select_related("creator").iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+def _run(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def install_search_index(apps, schema_editor):
+    """GIN index on PostgreSQL, FTS5 table + triggers on SQLite, nothing elsewhere"""
+    _run(schema_editor, {"postgresql": POSTGRES_INSTALL, "sqlite": SQLITE_INSTALL})
+
+
+def uninstall_search_index(apps, schema_editor):
+    _run(schema_editor, {"postgresql": POSTGRES_UNINSTALL, "sqlite": SQLITE_UNINSTALL})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0007_savedquestion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='questions.question')),
+            ],
+        ),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-17 17:24
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def normalize_week(value):
+    """Frozen copy of questions.models.normalize_week as of this migration."""
+    return re.sub(r"\s+", "", (value or "").lower())
+
+
+def backfill_normalized_week(apps, schema_editor):
+    """Populate normalized_week for every existing question"""
+    Question = apps.get_model("questions", "Question")
+    questions = list(Question.objects.only("id", "week"))
+    for question in questions:
+        question.normalized_week = normalize_week(question.week)
+    Question.objects.bulk_update(questions, ["normalized_week"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0008_questionsearchdocument'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='normalized_week',
+            field=models.CharField(blank=True, default='', editable=False, max_length=50),
+        ),
+        migrations.RunPython(backfill_normalized_week, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['normalized_week', '-created_at'], name='question_week_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['topic', '-created_at'], name='question_topic_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['type', '-created_at'], name='question_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['verify_status', '-created_at'], name='question_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-created_at', '-id'], name='question_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-rating', '-created_at'], name='question_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-num_attempts', '-created_at'], name='question_attempts_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-17 17:28
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_rating_sum(apps, schema_editor):
+    """Set rating_sum from the stored ratings of every question"""
+    Question = apps.get_model("questions", "Question")
+    QuestionRating = apps.get_model("questions", "QuestionRating")
+    totals = (
+        QuestionRating.objects.filter(question=OuterRef("pk"))
+        .order_by().values("question").annotate(total=Sum("score")).values("total")
+    )
+    Question.objects.update(rating_sum=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0009_question_normalized_week'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sum, migrations.RunPython.noop),
+    ]
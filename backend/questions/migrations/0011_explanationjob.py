@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-17 17:31
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0010_question_rating_sum'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExplanationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('short_answer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='explanation_jobs', to='questions.shortanswerquestion')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'run_after'], name='explanation_job_due_idx')],
+            },
+        ),
+    ]
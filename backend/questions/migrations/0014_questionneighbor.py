@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-17 18:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0013_aicompletioncall'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionNeighbor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('co_attempts', models.PositiveIntegerField()),
+                ('computed_at', models.DateTimeField(db_index=True)),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbor_of', to='questions.question')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='questions.question')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('question', 'rank'), name='question_neighbor_rank_unique')],
+            },
+        ),
+    ]
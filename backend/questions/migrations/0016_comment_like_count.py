@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-17 18:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_like_count(apps, schema_editor):
+    """Set like_count from the stored likes of every comment"""
+    Comment = apps.get_model("questions", "Comment")
+    Like = Comment.likes.through
+    totals = (
+        Like.objects.filter(comment=OuterRef("pk"))
+        .order_by().values("comment").annotate(total=Count("id")).values("total")
+    )
+    Comment.objects.update(like_count=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0015_question_difficulty'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_like_count, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,14 @@
+import re
 import uuid
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models import Avg, Count
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+
+def normalize_week(value):
+    """Lowercase and drop whitespace, so "Week 4", "week4" and "WEEK 4" compare equal."""
+    return re.sub(r"\s+", "", (value or "").lower())
 
 
 class Question(models.Model):
@@ -34,20 +41,49 @@ class Question(models.Model):
     week = models.CharField(max_length=50, blank=True, null=True)
     topic = models.CharField(max_length=100, blank=True, null=True)
     type = models.CharField(max_length=50, choices=Type.choices, null=True)
+    # rating is rating_sum / rating_count, maintained incrementally by questions.services
     rating = models.FloatField(default=0.0)
+    rating_sum = models.PositiveIntegerField(default=0)
     rating_count = models.PositiveIntegerField(default=0)
     num_attempts = models.PositiveIntegerField(default=0)
+    # normalize_week(week), maintained by save(); the list view filters on it
+    normalized_week = models.CharField(max_length=50, blank=True, default="", editable=False)
+    # 1PL IRT difficulty (logits, 0 = average) from first-attempt MCQ outcomes; written by
+    # `manage.py estimate_question_difficulty`, null until the question has graded attempts
+    difficulty = models.FloatField(null=True, blank=True)
+    difficulty_responses = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["normalized_week", "-created_at"], name="question_week_created_idx"),
+            models.Index(fields=["topic", "-created_at"], name="question_topic_created_idx"),
+            models.Index(fields=["type", "-created_at"], name="question_type_created_idx"),
+            models.Index(fields=["verify_status", "-created_at"], name="question_status_created_idx"),
+            models.Index(fields=["-created_at", "-id"], name="question_created_idx"),
+            models.Index(fields=["-rating", "-created_at"], name="question_rating_idx"),
+            models.Index(fields=["-num_attempts", "-created_at"], name="question_attempts_idx"),
+            models.Index(fields=["difficulty"], name="question_difficulty_idx"),
+        ]
 
     def __str__(self):
         return self.question[:40]
 
+    def save(self, *args, **kwargs):
+        self.normalized_week = normalize_week(self.week)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "week" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "normalized_week"}
+        super().save(*args, **kwargs)
+
     def recalculate_rating(self):
-        aggregate = self.ratings.aggregate(avg=Avg("score"), count=Count("id"))
-        average = aggregate.get("avg") or 0.0
+        """Recompute the rating aggregates from scratch; QuestionRatingView applies deltas instead."""
+        aggregate = self.ratings.aggregate(total=Sum("score"), count=Count("id"))
+        total = aggregate.get("total") or 0
         count = aggregate.get("count") or 0
-        self.rating = round(float(average), 2) if average else 0.0
+        self.rating = round(total / count, 2) if count else 0.0
+        self.rating_sum = total
         self.rating_count = count
-        self.save(update_fields=["rating", "rating_count", "updated_at"])
+        self.save(update_fields=["rating", "rating_sum", "rating_count", "updated_at"])
 
 
 class MCQQuestion(models.Model):
@@ -74,17 +110,23 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     likes = models.ManyToManyField(User, related_name='liked_comments', blank=True)
+    like_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # A question's thread page and a comment's reply page, both (created_at, id) keyset order
+            models.Index(
+                fields=['question', 'created_at', 'id'],
+                name='comment_thread_idx',
+                condition=models.Q(parent__isnull=True),
+            ),
+            models.Index(fields=['parent', 'created_at', 'id'], name='comment_reply_idx'),
+        ]
 
     def __str__(self):
         return f'{self.author.username}: {self.content[:20]}'
 
-    @property
-    def like_count(self):
-        return self.likes.count()
-
 
 class QuestionRating(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name="ratings")
@@ -115,4 +157,105 @@ class SavedQuestion(models.Model):
         unique_together = ("user", "question")
 
     def __str__(self):
-        return f"{self.user.username} saved {self.question.id}"
\ No newline at end of file
+        return f"{self.user.username} saved {self.question.id}"
+
+class QuestionSearchDocument(models.Model):
+    """
+    Denormalised search text for one question (question, topic, week, creator username).
+    Indexed per database by questions.search and kept in sync by questions.signals;
+    `manage.py rebuild_search_index` rebuilds it from scratch.
+    """
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, related_name="search_document")
+    content = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"search document for {self.question_id}"
+
+
+class ExplanationJob(models.Model):
+    """
+    Queued AI explanation for a short-answer question. Created by QuestionCreateView,
+    claimed and run by `manage.py run_ai_worker` (see questions.jobs).
+    """
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    short_answer = models.ForeignKey(ShortAnswerQuestion, on_delete=models.CASCADE, related_name="explanation_jobs")
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="explanation_job_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"explanation job {self.pk} ({self.status}) for {self.short_answer.question_id}"
+
+
+class ExplanationCacheEntry(models.Model):
+    """
+    AI explanation keyed by a hash of the normalised question and expected answer
+    (see questions.explanation_cache), so repeated questions skip the completions API.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    explanation = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"explanation cache {self.key[:12]} ({self.hits} hits)"
+
+
+class ExplanationCacheCounter(models.Model):
+    """Lifetime hit/miss totals of the explanation cache (entries may be evicted, counters are not)."""
+    name = models.CharField(max_length=20, unique=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class AICompletionCall(models.Model):
+    """Latency and token usage of one completions API call (see questions.ai_client.record_call)."""
+    purpose = models.CharField(max_length=30)
+    status = models.CharField(max_length=20)
+    latency_ms = models.PositiveIntegerField(default=0)
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    completion_tokens = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.purpose} {self.status} {self.latency_ms}ms"
+
+
+class QuestionNeighbor(models.Model):
+    """
+    One of a question's top-k co-attempt neighbours ("students who attempted this also
+    attempted"), rank 0 first. Written by `manage.py build_question_similarity`.
+    """
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name="neighbors")
+    neighbor = models.ForeignKey(Question, on_delete=models.CASCADE, related_name="neighbor_of")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()                       # cosine similarity of the two attempter sets
+    co_attempts = models.PositiveIntegerField()       # users who attempted both
+    computed_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["question", "rank"], name="question_neighbor_rank_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.question_id} #{self.rank}: {self.neighbor_id} ({self.score:.3f})"
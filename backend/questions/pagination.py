@@ -0,0 +1,188 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _resolve(obj, path):
+    """Read a (possibly related, e.g. "creator__username") ordering field from an instance."""
+    for attr in path.split("__"):
+        obj = getattr(obj, attr)
+    return obj
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination over the queryset's own ORDER BY.
+
+    The cursor stores the ordering values of the last row served, and the next
+    page is `WHERE (ordering) > (cursor values) LIMIT n`, so every page costs the
+    same however deep the client scrolls. The ordering must end in a unique
+    column (e.g. id). Ordering fields are field names, or F(...).asc()/.desc()
+    with nulls_last=True or nulls_first=True for nullable columns.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    page_size = 20
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        """[(field, descending, nulls_last)]; nulls_last is None for non-nullable string fields."""
+        ordering = []
+        for field in queryset.query.order_by:
+            if isinstance(field, str):
+                ordering.append((field.lstrip("-"), field.startswith("-"), None))
+            elif isinstance(field, OrderBy) and isinstance(field.expression, F) and (field.nulls_last or field.nulls_first):
+                ordering.append((field.expression.name, field.descending, bool(field.nulls_last)))
+            else:
+                raise TypeError("KeysetPagination requires field names or F() orderings with explicit NULL placement")
+        return ordering
+
+    def encode_cursor(self, values):
+        raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request, width):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != width:
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def seek_filter(self, ordering, values):
+        """Rows strictly after `values` in `ordering`: OR of (equal prefix AND next field past)."""
+        condition = Q()
+        equal_prefix = Q()
+        for (field, descending, nulls_last), value in zip(ordering, values):
+            if value is None:
+                # Only a nullable field can hold NULL; the non-NULL rows follow it when NULLs sort first
+                if not nulls_last:
+                    condition |= equal_prefix & Q(**{f"{field}__isnull": False})
+                equal_prefix &= Q(**{f"{field}__isnull": True})
+                continue
+            past = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+            if nulls_last:
+                past |= Q(**{f"{field}__isnull": True})
+            condition |= equal_prefix & past
+            equal_prefix &= Q(**{field: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        ordering = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request, len(ordering))
+        if cursor is not None:
+            queryset = queryset.filter(self.seek_filter(ordering, cursor))
+
+        rows = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        self.next_values = None
+        if self.has_next and rows:
+            self.next_values = [self.value_of(rows[-1], field) for field, _descending, _nulls_last in ordering]
+        return rows
+
+    def value_of(self, row, field):
+        if isinstance(row, dict):
+            return row[field]
+        return _resolve(row, field)
+
+    def get_next_link(self):
+        if self.next_values is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_values))
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+
+class QuestionPageNumberPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class QuestionListPagination(BasePagination):
+    """
+    Pagination for /api/questions/, chosen by query params:
+      ?cursor=<token> or ?limit=N  → keyset pages following the requested `ordering`
+      ?page=N / ?page_size=N       → page-number pages ({count, next, previous, results})
+      neither                      → page 1 of page-number pages, so responses stay bounded
+      ?all=true                    → the full list, unpaginated (explicit opt-in for legacy clients)
+    """
+    all_query_param = "all"
+
+    def __init__(self):
+        self.keyset = KeysetPagination()
+        self.page_number = QuestionPageNumberPagination()
+        self.active = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if KeysetPagination.cursor_query_param in params or KeysetPagination.page_size_query_param in params:
+            self.active = self.keyset
+        elif params.get(self.all_query_param, "").lower() in {"true", "1", "yes"}:
+            self.active = None
+            return None
+        else:
+            self.active = self.page_number
+        return self.active.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+
+class CommentThreadPagination(KeysetPagination):
+    """
+    Keyset pages of a question's top-level comments, oldest first (created_at, id).
+    Always on: ?limit=N sizes the page and ?cursor=<token> continues from `next`.
+    """
+    page_size = 20
+    max_page_size = 100
+
+
+class CommentReplyPagination(KeysetPagination):
+    """
+    Keyset pages of one comment's replies, oldest first (created_at, id). The first
+    page starts after the replies inlined in the thread (see CommentSerializer.replies_next).
+    """
+    page_size = 20
+    max_page_size = 100
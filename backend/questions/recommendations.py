@@ -0,0 +1,203 @@
+# questions/recommendations.py
+
+import threading
+import time
+from random import sample
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+
+from .models import Question
+
+POOL_VERSION_KEY = "recommendations:pool-version"
+USER_KEY_PREFIX = "recommendations:user:"
+
+# Question counts per strategy, and how many top candidates each one samples from
+SAME_TOPIC = (3, 10)
+HIGH_RATED = (2, 8)
+POPULAR = (1, 5)
+TOTAL = 6
+
+HIGH_RATED_MIN_RATING = 3.5
+POPULAR_MIN_ATTEMPTS = 5
+
+PRIORITY = {
+    Question.VerifyStatus.APPROVED: 1000,
+    Question.VerifyStatus.PENDING: 100,
+}
+
+
+def _cache():
+    # Must be shared by every process (enforced in production by settings.require_shared_cache):
+    # the pool version and per-user keys are how writes in one process reach the others
+    return caches[getattr(settings, "RECOMMENDATION_CACHE_ALIAS", "default")]
+
+
+def _pool_version() -> int:
+    cache = _cache()
+    version = cache.get(POOL_VERSION_KEY)
+    if version is None:
+        # Start from the clock so a version evicted from the cache never repeats an old one
+        cache.add(POOL_VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(POOL_VERSION_KEY)
+    return version
+
+
+def _bump_pool_version():
+    cache = _cache()
+    try:
+        cache.incr(POOL_VERSION_KEY)
+    except ValueError:
+        cache.set(POOL_VERSION_KEY, int(time.time() * 1000), None)
+
+
+def mark_pools_stale():
+    """Questions, ratings or attempt counters changed: rebuild the pools once this transaction commits."""
+    transaction.on_commit(_bump_pool_version)
+
+
+def forget_user(user_id):
+    """Drop a user's cached recommendations (they attempted something) once this transaction commits."""
+    transaction.on_commit(lambda: _cache().delete(f"{USER_KEY_PREFIX}{user_id}"))
+
+
+class CandidatePools:
+    """
+    The best `size` questions overall, per topic, rated >= 3.5 and with >= 5 attempts,
+    as (id, topic) lists in recommendation order. Built with one query and kept in this
+    process; rebuilt when the shared pool version has moved and the pools are at least
+    RECOMMENDATION_POOL_MIN_STALENESS seconds old, so a burst of attempts costs one rebuild.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.version = None
+            self.built_at = 0.0
+            self.overall = []
+            self.high_rated = []
+            self.popular = []
+            self.by_topic = {}
+            self.truncated = False
+
+    def current(self):
+        version = _pool_version()
+        min_staleness = getattr(settings, "RECOMMENDATION_POOL_MIN_STALENESS", 60)
+        with self._lock:
+            fresh = self.version == version or (
+                self.version is not None and time.monotonic() - self.built_at < min_staleness
+            )
+            if not fresh:
+                self._build(version)
+            return self
+
+    def _build(self, version):
+        size = getattr(settings, "RECOMMENDATION_POOL_SIZE", 200)
+        rows = [
+            (PRIORITY.get(status, 0), rating, num_attempts, created_at, question_id, topic)
+            for question_id, topic, status, rating, num_attempts, created_at in Question.objects.values_list(
+                "id", "topic", "verify_status", "rating", "num_attempts", "created_at",
+            ).iterator()
+        ]
+        # Verified first, then rating, popularity and newness (the view's original ordering)
+        rows.sort(key=lambda row: (row[0], row[1], row[2], row[3]), reverse=True)
+        by_popularity = sorted(
+            (row for row in rows if row[2] >= POPULAR_MIN_ATTEMPTS),
+            key=lambda row: (row[0], row[2], row[1]),
+            reverse=True,
+        )
+
+        by_topic = {}
+        for row in rows:
+            pool = by_topic.setdefault(row[5], [])
+            if len(pool) < size:
+                pool.append((row[4], row[5]))
+
+        self.overall = [(row[4], row[5]) for row in rows[:size]]
+        self.high_rated = [(row[4], row[5]) for row in rows if row[1] >= HIGH_RATED_MIN_RATING][:size]
+        self.popular = [(row[4], row[5]) for row in by_popularity[:size]]
+        self.by_topic = by_topic
+        self.truncated = len(rows) > size
+        self.version = version
+        self.built_at = time.monotonic()
+
+
+pools = CandidatePools()
+
+
+def _top(pool, excluded, limit, skip_topic=None):
+    found = []
+    for question_id, topic in pool:
+        if question_id in excluded or (skip_topic is not None and topic == skip_topic):
+            continue
+        found.append(question_id)
+        if len(found) == limit:
+            break
+    return found
+
+
+def _pick(candidates, count):
+    return sample(candidates, count) if len(candidates) >= count else candidates
+
+
+def choose_questions(attempted, recent_topic):
+    """
+    Recommended question ids for a user who attempted `attempted` (a set of ids) and
+    last worked on `recent_topic`: 3 from that topic, 2 highly rated from other topics,
+    1 popular, then filler - each sampled from the top of its pool.
+    """
+    current = pools.current()
+    chosen = []
+
+    def excluded():
+        return attempted | set(chosen)
+
+    if recent_topic:
+        count, depth = SAME_TOPIC
+        chosen += _pick(_top(current.by_topic.get(recent_topic, []), excluded(), depth), count)
+    count, depth = HIGH_RATED
+    chosen += _pick(_top(current.high_rated, excluded(), depth, skip_topic=recent_topic), count)
+    count, depth = POPULAR
+    chosen += _pick(_top(current.popular, excluded(), depth), count)
+
+    if len(chosen) < TOTAL:
+        remaining = TOTAL - len(chosen)
+        filler = _top(current.overall, excluded(), remaining * 2)
+        if len(filler) < remaining and current.truncated:
+            # The user has attempted most of the overall pool; look past it
+            filler = list(
+                Question.objects.exclude(id__in=excluded())
+                .annotate(priority_score=Case(
+                    *[When(verify_status=status, then=Value(score)) for status, score in PRIORITY.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ))
+                .order_by("-priority_score", "-rating", "-num_attempts", "-created_at")
+                .values_list("id", flat=True)[:remaining * 2]
+            )
+        chosen += _pick(filler, remaining)
+    return chosen
+
+
+def recommended_ids(user):
+    """The user's recommended question ids, cached until their next attempt (or the cache timeout)."""
+    from attempts.models import UserQuestionProgress
+
+    cache = _cache()
+    key = f"{USER_KEY_PREFIX}{user.pk}"
+    ids = cache.get(key)
+    if ids is None:
+        progress = list(
+            UserQuestionProgress.objects.filter(user=user)
+            .order_by("-last_submitted_at")
+            .values_list("question_id", "question__topic")
+        )
+        recent_topic = (progress[0][1] or None) if progress else None
+        ids = choose_questions({question_id for question_id, _topic in progress}, recent_topic)
+        cache.set(key, ids, getattr(settings, "RECOMMENDATION_CACHE_TIMEOUT", 900))
+    return ids
@@ -0,0 +1,154 @@
+# questions/search.py
+
+import re
+
+from django.db import connection, transaction
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Question, QuestionSearchDocument
+
+# Fields of Question that feed the search document
+INDEXED_FIELDS = {"question", "topic", "week", "creator", "creator_id"}
+
+# Both are created by migration 0008, which freezes its own DDL
+SQLITE_FTS_TABLE = "questions_search_fts"
+SEARCH_CONFIG = "english"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_tokens(text: str) -> list[str]:
+    """Split free text into lowercase word tokens; punctuation never reaches the query syntax."""
+    return [token.lower() for token in _TOKEN_RE.findall(text or "")]
+
+
+def document_text(question_text, topic, week, username) -> str:
+    """
+    Text indexed for one question. The week is also added without spaces so
+    "Week4" finds questions stored as "Week 4", as the week filter does.
+    """
+    week = week or ""
+    parts = [question_text or "", topic or "", week, re.sub(r"\s+", "", week), username or ""]
+    return "\n".join(part for part in parts if part)
+
+
+def document_for(question) -> str:
+    return document_text(question.question, question.topic, question.week, question.creator.username)
+
+
+# ---------- Backends ----------
+class IContainsSearchBackend:
+    """Portable fallback: OR of icontains over the indexed fields, no ranking."""
+    vendor = None
+
+    def refresh(self):
+        pass
+
+    def search(self, queryset, text):
+        return queryset.filter(
+            Q(question__icontains=text) |
+            Q(topic__icontains=text) |
+            Q(week__icontains=text) |
+            Q(creator__username__icontains=text)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class PostgresSearchBackend(IContainsSearchBackend):
+    """
+    to_tsvector/to_tsquery over QuestionSearchDocument.content, served by the
+    question_search_gin expression index (same SearchVector as the query uses).
+    """
+    vendor = "postgresql"
+
+    def _vector(self, field):
+        from django.contrib.postgres.search import SearchVector
+        return SearchVector(field, config=SEARCH_CONFIG)
+
+    def _has_lexemes(self, raw_query):
+        """False when the query is only stop words ("the", "of a"), which to_tsquery reduces to nothing."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT numnode(to_tsquery(%s::regconfig, %s))", [SEARCH_CONFIG, raw_query])
+            return cursor.fetchone()[0] > 0
+
+    def search(self, queryset, text):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        tokens = search_tokens(text)
+        # Prefix-match every token so partially typed words still hit
+        raw_query = " & ".join(f"{token}:*" for token in tokens)
+        if not tokens or not self._has_lexemes(raw_query):
+            return super().search(queryset, text)
+        query = SearchQuery(raw_query, search_type="raw", config=SEARCH_CONFIG)
+        vector = self._vector("search_document__content")
+        return queryset.annotate(search_vector=vector).filter(search_vector=query).annotate(
+            search_rank=SearchRank(vector, query),
+        )
+
+
+class SQLiteFTSSearchBackend(IContainsSearchBackend):
+    """
+    FTS5 external-content table over QuestionSearchDocument, kept in step with it
+    by triggers. Relevance is bm25 (negated so that higher is better).
+    """
+    vendor = "sqlite"
+
+    def refresh(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')")
+
+    def search(self, queryset, text):
+        tokens = search_tokens(text)
+        if not tokens:
+            return super().search(queryset, text)
+        match = " AND ".join(f'"{token}"*' for token in tokens)
+        fts = SQLITE_FTS_TABLE
+        doc = QuestionSearchDocument._meta.db_table
+        question = Question._meta.db_table
+        matching = RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", (match,))
+        rank = RawSQL(
+            f"SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND rowid = "
+            f"(SELECT id FROM {doc} WHERE {doc}.question_id = {question}.id)",
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(search_document__id__in=matching).annotate(search_rank=rank)
+
+
+BACKENDS = {
+    backend.vendor: backend
+    for backend in (PostgresSearchBackend(), SQLiteFTSSearchBackend())
+}
+
+
+def get_backend(vendor=None):
+    return BACKENDS.get(vendor or connection.vendor, IContainsSearchBackend())
+
+
+# ---------- Public API ----------
+def search_questions(queryset, text):
+    """
+    Restrict `queryset` to questions matching `text`, annotated with `search_rank`
+    (higher is more relevant). Combines with any other filter on the queryset.
+    """
+    return get_backend().search(queryset, text)
+
+
+def update_document(question):
+    QuestionSearchDocument.objects.update_or_create(
+        question=question,
+        defaults={"content": document_for(question)},
+    )
+
+
+def rebuild_index() -> int:
+    """Rewrite every search document from the question table. Returns the number indexed."""
+    questions = Question.objects.select_related("creator").only(
+        "id", "question", "topic", "week", "creator__username",
+    )
+    documents = [QuestionSearchDocument(question=q, content=document_for(q)) for q in questions.iterator()]
+    with transaction.atomic():
+        QuestionSearchDocument.objects.all().delete()
+        QuestionSearchDocument.objects.bulk_create(documents, batch_size=1000)
+        get_backend().refresh()
+    return len(documents)
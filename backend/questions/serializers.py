@@ -1,6 +1,9 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
 from .models import Question, MCQQuestion, ShortAnswerQuestion, Comment, QuestionRating, SavedQuestion
-from attempts.models import Attempt
+from .pagination import CommentReplyPagination
+from attempts.models import UserQuestionProgress
 from user.models import UserProfile
 
 
@@ -49,6 +52,7 @@ class QuestionSerializer(serializers.ModelSerializer):
             "ratingCount",
             "userRating",
             "numAttempts",
+            "difficulty",
             "attempted",
             "source",
             "verify_status",
@@ -73,7 +77,11 @@ class QuestionSerializer(serializers.ModelSerializer):
         user = self.context["request"].user
         if not user.is_authenticated:
             return False
-        return Attempt.objects.filter(attempter=user, question=obj).exists()
+        # Annotated by questions.views.with_requester_state
+        annotated = getattr(obj, "requester_attempted", None)
+        if annotated is not None:
+            return annotated
+        return UserQuestionProgress.objects.filter(user=user, question=obj).exists()
 
     def get_verified(self, obj):
         return obj.verify_status == Question.VerifyStatus.APPROVED
@@ -83,8 +91,8 @@ class QuestionSerializer(serializers.ModelSerializer):
         if not user.is_authenticated:
             return None
         prefetch_result = getattr(obj, "user_rating_for_requester", None)
-        if prefetch_result:
-            return prefetch_result[0].score
+        if prefetch_result is not None:
+            return prefetch_result[0].score if prefetch_result else None
         rating = obj.ratings.filter(user=user).first()
         return rating.score if rating else None
 
@@ -92,6 +100,9 @@ class QuestionSerializer(serializers.ModelSerializer):
         user = self.context["request"].user
         if not user.is_authenticated:
             return False
+        annotated = getattr(obj, "requester_saved", None)
+        if annotated is not None:
+            return annotated
         return SavedQuestion.objects.filter(user=user, question=obj).exists()
 
 
@@ -164,6 +175,17 @@ class AuthorSerializer(serializers.Serializer):
         url = profile.profile_picture.url
         return request.build_absolute_uri(url) if request else url
 
+def _is_liked_by_requester(context, obj):
+    # CommentViewSet puts the liked ids of every comment being serialized in the context
+    liked = context.get('liked_comment_ids')
+    if liked is not None:
+        return obj.id in liked
+    request = context.get('request')
+    if not request:
+        return False
+    user = request.user
+    return user.is_authenticated and obj.likes.filter(id=user.id).exists()
+
 class ReplySerializer(serializers.ModelSerializer):
     author = AuthorSerializer(source='*', read_only=True)
     like_count = serializers.IntegerField(read_only=True)
@@ -174,32 +196,55 @@ class ReplySerializer(serializers.ModelSerializer):
         fields = ['id', 'author', 'content', 'created_at', 'like_count', 'is_liked_by_user']
 
     def get_is_liked_by_user(self, obj):
-        request = self.context.get('request')
-        if not request:
-            return False
-        user = request.user
-        return user.is_authenticated and obj.likes.filter(id=user.id).exists()
+        return _is_liked_by_requester(self.context, obj)
 
 class CommentSerializer(serializers.ModelSerializer):
     author = AuthorSerializer(source='*', read_only=True)
     like_count = serializers.IntegerField(read_only=True)
     is_liked_by_user = serializers.SerializerMethodField()
     replies = serializers.SerializerMethodField()
+    reply_count = serializers.SerializerMethodField()
+    replies_next = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
-        fields = ['id', 'author', 'content', 'created_at', 'like_count', 'is_liked_by_user', 'replies']
+        fields = [
+            'id', 'author', 'content', 'created_at', 'like_count', 'is_liked_by_user',
+            'replies', 'reply_count', 'replies_next',
+        ]
+
+    @staticmethod
+    def inline_replies(obj):
+        """The first COMMENT_INLINE_REPLIES replies; CommentViewSet prefetches them as `first_replies` for lists."""
+        replies = getattr(obj, 'first_replies', None)
+        if replies is None:
+            limit = getattr(settings, 'COMMENT_INLINE_REPLIES', 3)
+            replies = obj.first_replies = list(
+                obj.replies.select_related('author', 'author__profile').order_by('created_at', 'id')[:limit]
+            )
+        return replies
 
     def get_replies(self, obj):
-        serializer = ReplySerializer(obj.replies.all(), many=True, context=self.context)
+        serializer = ReplySerializer(self.inline_replies(obj), many=True, context=self.context)
         return serializer.data
 
-    def get_is_liked_by_user(self, obj):
+    def get_reply_count(self, obj):
+        reply_count = getattr(obj, 'reply_count', None)
+        return obj.replies.count() if reply_count is None else reply_count
+
+    def get_replies_next(self, obj):
+        """Link to the replies after the inlined ones, or None when all are shown."""
+        replies = self.inline_replies(obj)
+        if self.get_reply_count(obj) <= len(replies):
+            return None
+        last = replies[-1]
+        cursor = CommentReplyPagination().encode_cursor([last.created_at, last.id])
+        url = f"{reverse('comment-replies', kwargs={'pk': obj.pk})}?{CommentReplyPagination.cursor_query_param}={cursor}"
         request = self.context.get('request')
-        if not request:
-            return False
-        user = request.user
-        return user.is_authenticated and obj.likes.filter(id=user.id).exists()
+        return request.build_absolute_uri(url) if request else url
+
+    def get_is_liked_by_user(self, obj):
+        return _is_liked_by_requester(self.context, obj)
 
 
 
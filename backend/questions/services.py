@@ -0,0 +1,126 @@
+# questions/services.py
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Round
+from django.utils import timezone
+
+from .models import Comment, Question, QuestionRating
+from .recommendations import mark_pools_stale
+
+
+def apply_rating_change(question, score_delta: int, count_delta: int):
+    """
+    Fold one rating change into the question's stored sum/count and average with a
+    single UPDATE, then refresh those fields on `question`.
+    New rating: (score, 1); changed score: (new - old, 0); removed rating: (-score, -1).
+    """
+    new_sum = F("rating_sum") + score_delta
+    new_count = F("rating_count") + count_delta
+    Question.objects.filter(pk=question.pk).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Case(
+            When(rating_count__gt=-count_delta, then=Round(Cast(new_sum, FloatField()) / new_count, 2)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        updated_at=timezone.now(),
+    )
+    question.refresh_from_db(fields=["rating", "rating_sum", "rating_count"])
+    mark_pools_stale()
+
+
+def record_question_attempts(question_ids, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) one attempt per entry in `question_ids` from Question.num_attempts."""
+    counts = {}
+    for question_id in question_ids:
+        counts[question_id] = counts.get(question_id, 0) + sign
+    for question_id, delta in counts.items():
+        queryset = Question.objects.filter(pk=question_id)
+        if delta < 0:
+            queryset = queryset.filter(num_attempts__gte=-delta)
+        queryset.update(num_attempts=F("num_attempts") + delta)
+    if counts:
+        mark_pools_stale()
+
+
+def set_comment_like(comment_id, user, liked: bool) -> int:
+    """
+    Like (liked=True) or unlike a comment for `user`, adjusting the stored like_count
+    with a single UPDATE only when the like actually changed. The comment row is locked
+    so concurrent likes of the same comment cannot double count.
+    Returns the new like_count; raises Comment.DoesNotExist.
+    """
+    Like = Comment.likes.through
+    with transaction.atomic():
+        comment = Comment.objects.select_for_update().only("id").get(pk=comment_id)
+        like = Like.objects.filter(comment_id=comment.pk, user_id=user.pk)
+        if liked:
+            changed = not like.exists()
+            if changed:
+                Like.objects.create(comment_id=comment.pk, user_id=user.pk)
+            delta = 1
+        else:
+            changed = like.delete()[0] > 0
+            delta = -1
+        if changed:
+            Comment.objects.filter(pk=comment.pk).update(like_count=F("like_count") + delta)
+        return Comment.objects.values_list("like_count", flat=True).get(pk=comment.pk)
+
+
+def liked_comment_ids(user, comment_ids) -> set:
+    """The subset of `comment_ids` that `user` has liked, in one query."""
+    if not user.is_authenticated or not comment_ids:
+        return set()
+    return set(
+        Comment.likes.through.objects.filter(user_id=user.pk, comment_id__in=comment_ids)
+        .values_list("comment_id", flat=True)
+    )
+
+
+def reconcile_counters() -> int:
+    """
+    Recompute num_attempts and rating_sum/rating_count/rating from the attempt and
+    rating tables, writing only questions that drifted. Returns the number repaired.
+    """
+    from attempts.models import Attempt
+
+    attempts = Attempt.objects.filter(question=OuterRef("pk")).order_by().values("question")
+    ratings = QuestionRating.objects.filter(question=OuterRef("pk")).order_by().values("question")
+    actual = Question.objects.annotate(
+        actual_attempts=Coalesce(Subquery(attempts.annotate(n=Count("id")).values("n")), 0),
+        actual_sum=Coalesce(Subquery(ratings.annotate(s=Sum("score")).values("s")), 0),
+        actual_count=Coalesce(Subquery(ratings.annotate(n=Count("id")).values("n")), 0),
+    ).only("id", "num_attempts", "rating", "rating_sum", "rating_count")
+
+    drifted = []
+    for question in actual.iterator():
+        rating = round(question.actual_sum / question.actual_count, 2) if question.actual_count else 0.0
+        if (
+            question.num_attempts != question.actual_attempts
+            or question.rating_sum != question.actual_sum
+            or question.rating_count != question.actual_count
+            or question.rating != rating
+        ):
+            question.num_attempts = question.actual_attempts
+            question.rating_sum = question.actual_sum
+            question.rating_count = question.actual_count
+            question.rating = rating
+            drifted.append(question)
+
+    Question.objects.bulk_update(
+        drifted, ["num_attempts", "rating_sum", "rating_count", "rating"], batch_size=1000,
+    )
+    return len(drifted)
+
+
+def reconcile_comment_likes() -> int:
+    """
+    Recompute Comment.like_count from the likes table (likes vanish without a count
+    update when a user is deleted), writing only comments that drifted. Returns the number repaired.
+    """
+    likes = Comment.likes.through.objects.filter(comment=OuterRef("pk")).order_by().values("comment")
+    actual = Coalesce(Subquery(likes.annotate(n=Count("id")).values("n")), 0)
+    drifted = list(Comment.objects.exclude(like_count=actual).values_list("pk", flat=True))
+    return Comment.objects.filter(pk__in=drifted).update(like_count=actual)
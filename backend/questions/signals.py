@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Question
+from .recommendations import mark_pools_stale
+from .search import INDEXED_FIELDS, update_document
+
+
+@receiver(post_save, sender=Question)
+def index_question(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Keep the question's search document current; rating/attempt-only saves are skipped."""
+    if raw:
+        return
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    update_document(instance)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def refresh_recommendation_pools(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_pools_stale()
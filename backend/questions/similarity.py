@@ -0,0 +1,112 @@
+# questions/similarity.py
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from scipy import sparse
+
+from .models import QuestionNeighbor
+
+
+def attempt_matrix(user_index, item_index, n_users, n_items):
+    """Binary users x questions CSR matrix: 1 where the user attempted the question."""
+    matrix = sparse.csr_matrix(
+        (np.ones(len(user_index), dtype=np.float32), (user_index, item_index)),
+        shape=(n_users, n_items),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix
+
+
+def top_neighbors(matrix, top_k=20, min_common=2, items=None, block_size=1024):
+    """
+    Cosine item-item similarity over the columns of `matrix`, keeping each item's
+    `top_k` best neighbours that share at least `min_common` users.
+
+    Co-attempt counts for a block of items are one sparse product (items x users @
+    users x items), so memory is bounded by `block_size` rows at a time; filtering,
+    scoring and ranking within a block are array operations. `items` limits the
+    computation to those column indexes (incremental refresh).
+    Yields (item, neighbor, score, co_attempts, rank) arrays, one set per block.
+    """
+    by_item = matrix.T.tocsr()
+    norms = np.sqrt(np.asarray(matrix.sum(axis=0)).ravel())
+    targets = np.arange(matrix.shape[1]) if items is None else np.asarray(items, dtype=np.int64)
+
+    for start in range(0, len(targets), block_size):
+        block = targets[start:start + block_size]
+        co = (by_item[block] @ matrix).tocoo()
+        item = block[co.row]
+        keep = (co.col != item) & (co.data >= min_common)
+        item, neighbor, co_attempts = item[keep], co.col[keep], co.data[keep]
+        score = co_attempts / (norms[item] * norms[neighbor])
+
+        # Best first within each item; ties go to the lower column index
+        order = np.lexsort((neighbor, -score, item))
+        item, neighbor, score, co_attempts = item[order], neighbor[order], score[order], co_attempts[order]
+        _, first, counts = np.unique(item, return_index=True, return_counts=True)
+        rank = np.arange(len(item)) - np.repeat(first, counts)
+        keep = rank < top_k
+        yield item[keep], neighbor[keep], score[keep], co_attempts[keep].astype(np.int64), rank[keep]
+
+
+def build_neighbors(top_k=20, min_common=2, incremental=False, log=None) -> dict:
+    """
+    Recompute QuestionNeighbor from UserQuestionProgress (one row per user and question
+    attempted). A full run rewrites every list. An incremental run recomputes only
+    questions that gained a new attempter since the last run; their lists are exact,
+    but other questions' lists keep the old scores against them until the next full run.
+    Returns {"questions", "neighbors", "incremental"}.
+    """
+    from attempts.models import UserQuestionProgress
+
+    started = timezone.now()
+    since = QuestionNeighbor.objects.aggregate(last=Max("computed_at"))["last"] if incremental else None
+    incremental = since is not None
+
+    users, questions = {}, {}
+    user_index, item_index = [], []
+    for user_id, question_id in UserQuestionProgress.objects.values_list("user_id", "question_id").iterator():
+        user_index.append(users.setdefault(user_id, len(users)))
+        item_index.append(questions.setdefault(question_id, len(questions)))
+    matrix = attempt_matrix(user_index, item_index, len(users), len(questions))
+    question_ids = list(questions)
+
+    items = None
+    if incremental:
+        touched = set(
+            UserQuestionProgress.objects.filter(first_attempt__submitted_at__gt=since)
+            .values_list("question_id", flat=True)
+        )
+        items = sorted(questions[question_id] for question_id in touched if question_id in questions)
+    if log:
+        log(f"{len(users)} users x {len(questions)} questions, {matrix.nnz} attempted pairs; "
+            f"recomputing {len(questions) if items is None else len(items)} questions")
+
+    neighbors = []
+    for item, neighbor, score, co_attempts, rank in top_neighbors(matrix, top_k, min_common, items):
+        neighbors.extend(
+            QuestionNeighbor(
+                question_id=question_ids[i],
+                neighbor_id=question_ids[n],
+                score=float(s),
+                co_attempts=int(c),
+                rank=int(r),
+                computed_at=started,
+            )
+            for i, n, s, c, r in zip(item.tolist(), neighbor.tolist(), score.tolist(), co_attempts.tolist(), rank.tolist())
+        )
+
+    with transaction.atomic():
+        if items is None:
+            QuestionNeighbor.objects.all().delete()
+        else:
+            QuestionNeighbor.objects.filter(question_id__in=[question_ids[i] for i in items]).delete()
+        QuestionNeighbor.objects.bulk_create(neighbors, batch_size=2000)
+    return {
+        "questions": len(questions) if items is None else len(items),
+        "neighbors": len(neighbors),
+        "incremental": incremental,
+    }
@@ -0,0 +1,88 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.core.cache import caches
+
+from questions.ai_client import reset_client
+from questions.recommendations import pools
+
+
+class StubCompletionServer:
+    """
+    Local stand-in for the chat completions API. Replies with `reply` (an explanation
+    echoing the prompt's first line) or, while `fail_next` > 0, with HTTP 500.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.client_ports = set()
+        self.fail_next = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"    # keep-alive, so tests can see connection reuse
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append(body)
+                stub.client_ports.add(self.client_address[1])
+                if stub.fail_next > 0:
+                    stub.fail_next -= 1
+                    self.send_response(500)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                prompt = body["messages"][0]["content"]
+                question = next(line.strip() for line in prompt.splitlines() if "Question:" in line)
+                payload = json.dumps({
+                    "choices": [{"message": {"content": f"Explained {question}"}}],
+                    "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 3},
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1/chat/completions"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def completion_server(settings):
+    """Point AI_COMPLETIONS_URL at a local stub server for the duration of a test."""
+    with StubCompletionServer() as server:
+        settings.AI_COMPLETIONS_URL = server.url
+        settings.AI_JOB_BACKOFF_SECONDS = 0
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def fresh_ai_client():
+    """Each test gets its own pooled session and a closed circuit breaker."""
+    reset_client()
+    yield
+    reset_client()
+
+
+@pytest.fixture(autouse=True)
+def fresh_recommendations(settings):
+    """Pools and per-user picks must not leak between tests (rolled-back writes never bump the version)."""
+    settings.RECOMMENDATION_POOL_MIN_STALENESS = 0
+    pools.clear()
+    caches[settings.RECOMMENDATION_CACHE_ALIAS].clear()
+    yield
+    pools.clear()
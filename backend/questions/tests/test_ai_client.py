@@ -0,0 +1,110 @@
+import pytest
+
+from questions.ai import generate_explanation
+from questions.ai_client import CircuitOpenError, CompletionError, get_client
+from questions.jobs import run_pending
+from questions.models import AICompletionCall, ExplanationJob, Question, ShortAnswerQuestion
+
+
+def test_completions_reuse_one_pooled_connection(completion_server):
+    first = generate_explanation("What is a loop?", "Repetition.")
+    second = generate_explanation("What is a branch?", "A decision.")
+
+    assert first.content == "Explained Question: What is a loop?"
+    assert second.metrics.status == "ok"
+    assert second.metrics.completion_tokens == 3
+    assert len(completion_server.client_ports) == 1
+
+
+def test_circuit_opens_after_repeated_failures_and_recovers(completion_server, settings):
+    settings.AI_BREAKER_THRESHOLD = 2
+    settings.AI_BREAKER_RESET_SECONDS = 0.2
+    completion_server.fail_next = 2
+
+    for _ in range(2):
+        with pytest.raises(CompletionError):
+            generate_explanation("Q", "A")
+    with pytest.raises(CircuitOpenError):
+        generate_explanation("Q", "A")
+    assert len(completion_server.requests) == 2
+    assert get_client().breaker.state == "open"
+
+    # After the reset period one trial call goes through and closes the circuit
+    import time
+    time.sleep(0.25)
+    assert generate_explanation("Q", "A").metrics.status == "ok"
+    assert get_client().breaker.state == "closed"
+
+
+@pytest.mark.django_db
+def test_worker_records_each_call_and_keeps_tries_while_circuit_is_open(completion_server, settings, django_user_model):
+    settings.AI_BREAKER_THRESHOLD = 1
+    user = django_user_model.objects.create_user(username="breaker", password="pass")
+    question = Question.objects.create(creator=user, question="Why?", type="SHORT")
+    job = ExplanationJob.objects.create(
+        short_answer=ShortAnswerQuestion.objects.create(question=question, answer="Because.", ai_answer=""),
+    )
+    completion_server.fail_next = 1
+
+    assert run_pending() == (0, 1)
+    ExplanationJob.objects.filter(pk=job.pk).update(run_after=job.created_at)
+    assert run_pending() == (0, 1)
+
+    job.refresh_from_db()
+    assert job.attempts == 1          # the short-circuited try is not counted
+    assert "circuit is open" in job.last_error
+    assert list(AICompletionCall.objects.values_list("status", flat=True).order_by("id")) == ["error", "circuit_open"]
+
+
+@pytest.mark.django_db
+def test_worker_claims_each_job_just_before_running_it(completion_server, monkeypatch, django_user_model):
+    from questions import jobs
+
+    user = django_user_model.objects.create_user(username="oneatatime", password="pass")
+    created = [
+        ExplanationJob.objects.create(short_answer=ShortAnswerQuestion.objects.create(
+            question=Question.objects.create(creator=user, question=f"Why {i}?", type="SHORT"), answer="Because.",
+        ))
+        for i in range(2)
+    ]
+    statuses_while_running = []
+    real_run_job = jobs.run_job
+
+    def run_job(job):
+        statuses_while_running.append(list(ExplanationJob.objects.filter(pk__in=[j.pk for j in created])
+                                           .order_by("run_after", "id").values_list("status", flat=True)))
+        return real_run_job(job)
+
+    monkeypatch.setattr(jobs, "run_job", run_job)
+    assert run_pending(10) == (2, 0)
+    # The second job was still PENDING (unleased) while the first one ran
+    assert statuses_while_running == [["RUNNING", "PENDING"], ["DONE", "RUNNING"]]
+
+
+def test_worker_survives_a_failed_poll(monkeypatch):
+    from io import StringIO
+    from django.core.management import call_command
+    from django.db import OperationalError
+    from questions.management.commands import run_ai_worker
+
+    outcomes = [OperationalError("server closed the connection unexpectedly"), (1, 0), KeyboardInterrupt()]
+
+    def run_pending(batch):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    closes, sleeps = [], []
+    monkeypatch.setattr(run_ai_worker, "run_pending", run_pending)
+    monkeypatch.setattr(run_ai_worker, "close_old_connections", lambda: closes.append(1))
+    monkeypatch.setattr(run_ai_worker.time, "sleep", sleeps.append)
+    out, err = StringIO(), StringIO()
+
+    with pytest.raises(KeyboardInterrupt):
+        call_command("run_ai_worker", stdout=out, stderr=err)
+
+    assert "server closed the connection" in err.getvalue()
+    assert "Explained 1 questions" in out.getvalue()
+    assert sleeps == [2.0]
+    assert len(closes) == 4     # before each of the three polls, plus once after the failure
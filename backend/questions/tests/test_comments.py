@@ -1,6 +1,8 @@
 import pytest
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
 from questions.models import Question, Comment, ShortAnswerQuestion
+from questions.services import reconcile_comment_likes, set_comment_like
+from questions.views import CommentViewSet
 from user.models import UserProfile
 import uuid
 
@@ -63,8 +65,9 @@ class TestCommentAPI:
         url = f"/api/questions/{question.id}/comments/"
         response = client.get(url)
         assert response.status_code == 200
-        assert len(response.data) == 2
-        assert "content" in response.data[0]
+        assert len(response.data["results"]) == 2
+        assert response.data["next"] is None
+        assert "content" in response.data["results"][0]
 
     def test_reply_comment(self, setup_data):
         user = setup_data["user1"]
@@ -105,3 +108,110 @@ class TestCommentAPI:
         assert response.status_code == 200
         comment.refresh_from_db()
         assert comment.likes.count() == 0
+
+    def test_like_is_idempotent_and_count_is_stored(self, setup_data):
+        user1 = setup_data["user1"]
+        user2 = setup_data["user2"]
+        comment = Comment.objects.create(author=user1, question=setup_data["question"], content="Counted")
+
+        client = APIClient()
+        client.force_authenticate(user=user2)
+        like_url = f"/api/questions/comments/{comment.id}/like/"
+        unlike_url = f"/api/questions/comments/{comment.id}/unlike/"
+
+        assert client.post(like_url).data == {"like_count": 1}
+        assert client.post(like_url).data == {"like_count": 1}
+        client.force_authenticate(user=user1)
+        assert client.post(like_url).data == {"like_count": 2}
+        assert client.post(unlike_url).data == {"like_count": 1}
+        assert client.post(unlike_url).data == {"like_count": 1}
+        comment.refresh_from_db()
+        assert comment.like_count == 1
+        assert list(comment.likes.all()) == [user2]
+
+        missing = client.post(f"/api/questions/comments/{uuid.uuid4()}/like/")
+        assert missing.status_code == 404
+
+    def test_thread_liked_flags_use_one_lookup(self, setup_data, django_assert_max_num_queries):
+        user1 = setup_data["user1"]
+        user2 = setup_data["user2"]
+        question = setup_data["question"]
+        liked = set()
+        for i in range(10):
+            root = Comment.objects.create(author=user1, question=question, content=f"Root {i}")
+            reply = Comment.objects.create(author=user2, question=question, parent=root, content=f"Reply {i}")
+            for comment in (root, reply)[: i % 3]:
+                set_comment_like(comment.id, user2, liked=True)
+                liked.add(str(comment.id))
+
+        client = APIClient()
+        client.force_authenticate(user=user2)
+        with django_assert_max_num_queries(5):
+            response = client.get(f"/api/questions/{question.id}/comments/")
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 10
+        for item in response.data["results"]:
+            assert item["is_liked_by_user"] == (str(item["id"]) in liked)
+            assert item["like_count"] == int(str(item["id"]) in liked)
+            for reply in item["replies"]:
+                assert reply["is_liked_by_user"] == (str(reply["id"]) in liked)
+
+    def test_reconcile_comment_likes(self, setup_data):
+        user1 = setup_data["user1"]
+        comment = Comment.objects.create(author=user1, question=setup_data["question"], content="Drift")
+        comment.likes.add(user1, setup_data["user2"])
+        assert reconcile_comment_likes() == 1
+        comment.refresh_from_db()
+        assert comment.like_count == 2
+        assert reconcile_comment_likes() == 0
+
+    def test_thread_pages_and_reply_pages(self, setup_data, settings, django_assert_max_num_queries):
+        settings.COMMENT_INLINE_REPLIES = 2
+        user1 = setup_data["user1"]
+        user2 = setup_data["user2"]
+        question = setup_data["question"]
+        roots = [Comment.objects.create(author=user1, question=question, content=f"Root {i}") for i in range(5)]
+        replies = [
+            Comment.objects.create(author=user2, question=question, parent=roots[0], content=f"Reply {i}")
+            for i in range(5)
+        ]
+        Comment.objects.create(author=user2, question=question, parent=roots[1], content="Only reply")
+
+        client = APIClient()
+        client.force_authenticate(user=user2)
+        url = f"/api/questions/{question.id}/comments/"
+        with django_assert_max_num_queries(5):
+            first = client.get(url, {"limit": 3})
+        assert [item["content"] for item in first.data["results"]] == ["Root 0", "Root 1", "Root 2"]
+        second = client.get(first.data["next"])
+        assert [item["content"] for item in second.data["results"]] == ["Root 3", "Root 4"]
+        assert second.data["next"] is None
+
+        busy, quiet = first.data["results"][:2]
+        assert busy["reply_count"] == 5
+        assert [reply["content"] for reply in busy["replies"]] == ["Reply 0", "Reply 1"]
+        assert quiet["reply_count"] == 1
+        assert quiet["replies_next"] is None
+
+        more = client.get(f"{busy['replies_next']}&limit=2")
+        assert more.status_code == 200
+        assert [reply["id"] for reply in more.data["results"]] == [str(r.id) for r in replies[2:4]]
+        rest = client.get(more.data["next"])
+        assert [reply["id"] for reply in rest.data["results"]] == [str(replies[4].id)]
+        assert rest.data["next"] is None
+
+        assert client.get(f"/api/questions/comments/{replies[0].id}/replies/").status_code == 404
+
+    def test_updated_comment_reports_liked_replies(self, setup_data):
+        user1 = setup_data["user1"]
+        root = Comment.objects.create(author=user1, question=setup_data["question"], content="Before")
+        reply = Comment.objects.create(author=user1, question=setup_data["question"], parent=root, content="Reply")
+        set_comment_like(reply.id, user1, liked=True)
+
+        request = APIRequestFactory().patch(f"/comments/{root.id}/", {"content": "After"}, format="json")
+        force_authenticate(request, user=user1)
+        response = CommentViewSet.as_view({"patch": "partial_update"})(request, pk=root.id)
+        assert response.status_code == 200
+        assert response.data["content"] == "After"
+        assert response.data["is_liked_by_user"] is False
+        assert [(r["id"], r["is_liked_by_user"]) for r in response.data["replies"]] == [(str(reply.id), True)]
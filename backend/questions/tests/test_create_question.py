@@ -1,11 +1,12 @@
 import pytest
 from django.urls import reverse
+from django.core.management import call_command
 from rest_framework.test import APIClient
-from questions.models import Question, ShortAnswerQuestion, MCQQuestion
+from questions.models import ExplanationJob, Question, ShortAnswerQuestion, MCQQuestion
 
 
 @pytest.mark.django_db
-def test_create_short_answer_question(django_user_model):
+def test_create_short_answer_question(django_user_model, completion_server):
     client = APIClient()
     user = django_user_model.objects.create_user(username="realuser", password="realpass")
     client.force_authenticate(user=user)
@@ -29,11 +30,18 @@ def test_create_short_answer_question(django_user_model):
     assert data["answer"] == "To promote code reuse and model hierarchical relationships between classes."
     assert data["creator"] == "realuser"
 
-    assert "ai_answer" in data
-    assert len(data["ai_answer"]) > 0
+    # The explanation is generated off the request path
+    assert data["ai_answer"] == ""
+    assert data["ai_status"] == "PENDING"
+    assert completion_server.requests == []
 
     assert ShortAnswerQuestion.objects.count() == before_count + 1
 
+    call_command("run_ai_worker", "--burst")
+    short_answer = ShortAnswerQuestion.objects.get(question_id=data["id"])
+    assert short_answer.ai_answer == "Explained Question: Why do we use inheritance in OOP?"
+    assert short_answer.explanation_jobs.get().status == ExplanationJob.Status.DONE
+
 
 @pytest.mark.django_db
 def test_create_mcq_question(django_user_model):
@@ -68,3 +76,77 @@ def test_create_mcq_question(django_user_model):
     assert data["creator"] == "realuser2"
 
     assert MCQQuestion.objects.count() == before_count + 1
+
+
+@pytest.mark.django_db
+def test_repeated_short_answer_question_uses_explanation_cache(django_user_model, completion_server):
+    from questions import explanation_cache
+
+    client = APIClient()
+    user = django_user_model.objects.create_user(username="repeater", password="realpass")
+    client.force_authenticate(user=user)
+    payload = {"type": "SHORT", "question": "What is a  class?", "answer": "A blueprint.", "week": "Week 2", "topic": "Classes"}
+
+    first = client.post(reverse("question-create"), payload, format="json").json()
+    assert first["ai_status"] == "PENDING"
+    call_command("run_ai_worker", "--burst")
+
+    # Same text up to case and whitespace: answered at once, no job, no API call
+    payload["question"] = "what is a class?"
+    second = client.post(reverse("question-create"), payload, format="json").json()
+    assert second["ai_status"] == "DONE"
+    assert second["ai_answer"] == "Explained Question: What is a  class?"
+    assert not ExplanationJob.objects.filter(short_answer__question_id=second["id"]).exists()
+    assert len(completion_server.requests) == 1
+
+    stats = explanation_cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+@pytest.mark.django_db
+def test_explanation_cache_evicts_by_age_and_size(settings):
+    from datetime import timedelta
+    from django.utils import timezone
+    from questions import explanation_cache
+    from questions.models import ExplanationCacheEntry
+
+    settings.AI_EXPLANATION_CACHE_MAX_ENTRIES = 2
+    explanation_cache.store("q1", "a", "one")
+    explanation_cache.store("q2", "a", "two")
+    assert explanation_cache.lookup("q1", "a") == "one"   # q2 is now least recently used
+    explanation_cache.store("q3", "a", "three")
+    assert explanation_cache.lookup("q2", "a") is None
+    assert explanation_cache.lookup("q3", "a") == "three"
+
+    ExplanationCacheEntry.objects.update(created_at=timezone.now() - timedelta(days=settings.AI_EXPLANATION_CACHE_MAX_AGE_DAYS + 1))
+    assert explanation_cache.lookup("q1", "a") is None
+    assert explanation_cache.evict() == 2
+
+
+@pytest.mark.django_db
+def test_backfill_ai_explanations_repairs_and_resumes(django_user_model, completion_server, tmp_path):
+    user = django_user_model.objects.create_user(username="backfiller", password="realpass")
+    rows = []
+    for text, ai_answer in [("Q one", ""), ("Q two", "AI explanation failed: timeout"), ("Q three", ""), ("Q four", "Fine already")]:
+        question = Question.objects.create(creator=user, question=text, type="SHORT")
+        rows.append(ShortAnswerQuestion.objects.create(question=question, answer="A", ai_answer=ai_answer))
+    queued = Question.objects.create(creator=user, question="Q queued", type="SHORT")
+    ExplanationJob.objects.create(short_answer=ShortAnswerQuestion.objects.create(question=queued, answer="A", ai_answer=""))
+
+    checkpoint = tmp_path / "backfill.json"
+    completion_server.fail_next = 1
+    call_command("backfill_ai_explanations", "--concurrency", "1", "--rate", "0", "--batch-size", "2", "--checkpoint", str(checkpoint))
+
+    answers = [ShortAnswerQuestion.objects.get(pk=row.pk).ai_answer for row in rows]
+    assert answers[0] == ""      # the one failed request
+    assert answers[1:] == ["Explained Question: Q two", "Explained Question: Q three", "Fine already"]
+    # Rows owned by a queued worker job are left to the worker
+    assert ShortAnswerQuestion.objects.get(question=queued).ai_answer == ""
+
+    # Resuming from the checkpoint skips everything already processed
+    call_command("backfill_ai_explanations", "--checkpoint", str(checkpoint))
+    assert ShortAnswerQuestion.objects.get(pk=rows[0].pk).ai_answer == ""
+    assert len(completion_server.requests) == 3
+
+    call_command("backfill_ai_explanations", "--rate", "0")
+    assert ShortAnswerQuestion.objects.get(pk=rows[0].pk).ai_answer == "Explained Question: Q one"
@@ -4,6 +4,7 @@ from questions.models import Question, Comment, ShortAnswerQuestion
 from user.models import UserProfile
 import uuid
 from django.urls import reverse
+from django.utils import timezone
 
 @pytest.mark.django_db
 def test_create_invalid_type(django_user_model):
@@ -36,16 +37,19 @@ def test_create_mcq_missing_options(django_user_model):
 
 
 @pytest.mark.django_db
-def test_ai_explanation_exception(monkeypatch, django_user_model):
-    """Mock requests.post to raise error, covering except branch."""
+def test_ai_explanation_exception(monkeypatch, settings, django_user_model):
+    """Failed completions are retried with backoff, then the job is marked FAILED."""
     import requests
+    from questions.jobs import run_pending
+    from questions.models import ExplanationJob, ShortAnswerQuestion
     client = APIClient()
     user = django_user_model.objects.create_user(username="aiexc", password="123")
     client.force_authenticate(user=user)
 
     def fake_post(*args, **kwargs):
         raise requests.RequestException("fake error")
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    settings.AI_JOB_MAX_ATTEMPTS = 2
 
     payload = {
         "type": "SHORT",
@@ -57,7 +61,22 @@ def test_ai_explanation_exception(monkeypatch, django_user_model):
     url = reverse("question-create")
     res = client.post(url, payload, format="json")
     assert res.status_code == 201
-    assert "AI explanation failed" in res.json()["ai_answer"]
+    job = ExplanationJob.objects.get(short_answer__question_id=res.json()["id"])
+
+    assert run_pending() == (0, 1)
+    job.refresh_from_db()
+    assert job.status == ExplanationJob.Status.PENDING
+    assert job.run_after > timezone.now()
+    assert "fake error" in job.last_error
+
+    # Not due until the backoff has passed
+    assert run_pending() == (0, 0)
+    ExplanationJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    assert run_pending() == (0, 1)
+    job.refresh_from_db()
+    assert job.status == ExplanationJob.Status.FAILED
+    assert job.attempts == 2
+    assert ShortAnswerQuestion.objects.get(pk=job.short_answer_id).ai_answer == ""
 
 @pytest.mark.django_db
 def test_question_list_filters_and_ordering(django_user_model):
@@ -73,7 +92,7 @@ def test_question_list_filters_and_ordering(django_user_model):
     # search
     res = client.get(base_url + "?search=Inherit")
     assert res.status_code == 200
-    assert any("Inheritance" in q["question"] for q in res.json())
+    assert any("Inheritance" in q["question"] for q in res.json()["results"])
 
     # week filter
     res = client.get(base_url + "?week=Week4")
@@ -0,0 +1,88 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from attempts.models import Attempt
+from questions.models import Question, MCQQuestion, ShortAnswerQuestion, QuestionRating, SavedQuestion
+
+
+def _make_questions(creator, count):
+    questions = []
+    for i in range(count):
+        if i % 2:
+            q = Question.objects.create(
+                creator=creator, question=f"MCQ {i}", type="MCQ", week=f"Week{i % 12 + 1}", topic="Generics",
+            )
+            MCQQuestion.objects.create(
+                question=q, option_a="a", option_b="b", option_c="c", option_d="d", option_e="e",
+                correct_options=["A"],
+            )
+        else:
+            q = Question.objects.create(
+                creator=creator, question=f"Short {i}", type="SHORT", week=f"Week{i % 12 + 1}", topic="Generics",
+            )
+            ShortAnswerQuestion.objects.create(question=q, answer="x", ai_answer="y")
+        questions.append(q)
+    return questions
+
+
+@pytest.fixture
+def populated(django_user_model):
+    user = django_user_model.objects.create_user(username="counter", password="pass123")
+    author = django_user_model.objects.create_user(username="author", password="pass123")
+    questions = _make_questions(author, 12)
+    for q in questions[:4]:
+        Attempt.objects.create(attempter=user, question=q, answer="A", is_correct=True)
+        SavedQuestion.objects.create(user=user, question=q)
+        QuestionRating.objects.create(question=q, user=user, score=4)
+    _make_questions(user, 6)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, questions
+
+
+@pytest.mark.django_db
+def test_question_list_query_count(populated, django_assert_max_num_queries):
+    client, questions = populated
+    # Default page-number page: COUNT(*) plus the same two queries as the full list
+    with django_assert_max_num_queries(3):
+        response = client.get(reverse("question-list"))
+    assert response.status_code == 200
+    by_id = {item["id"]: item for item in response.json()["results"]}
+    attempted = by_id[str(questions[0].id)]
+    assert attempted["attempted"] is True
+    assert attempted["is_saved"] is True
+    assert attempted["userRating"] == 4
+    fresh = by_id[str(questions[-1].id)]
+    assert fresh["attempted"] is False
+    assert fresh["is_saved"] is False
+    assert fresh["userRating"] is None
+
+
+@pytest.mark.django_db
+def test_question_detail_query_count(populated, django_assert_max_num_queries):
+    client, questions = populated
+    with django_assert_max_num_queries(2):
+        response = client.get(reverse("question-detail", kwargs={"pk": questions[1].id}))
+    assert response.status_code == 200
+    assert response.json()["attempted"] is True
+    assert response.json()["mcq_detail"]["correct_options"] == ["A"]
+
+
+@pytest.mark.django_db
+def test_user_questions_query_count(populated, django_assert_max_num_queries):
+    client, _questions = populated
+    with django_assert_max_num_queries(2):
+        response = client.get(reverse("user-questions"))
+    assert response.status_code == 200
+    assert len(response.json()) == 6
+
+
+@pytest.mark.django_db
+def test_recommended_questions_query_count(populated, django_assert_max_num_queries):
+    client, questions = populated
+    with django_assert_max_num_queries(10):
+        response = client.get(reverse("recommended-questions"))
+    assert response.status_code == 200
+    recommended_ids = {item["id"] for item in response.json()}
+    assert not recommended_ids & {str(q.id) for q in questions[:4]}
@@ -1,7 +1,11 @@
 import pytest
+from unittest import mock
+from django.db import connection
+from django.db.models.query import QuerySet
 from django.urls import reverse
 from rest_framework.test import APIClient
 from questions.models import Question, ShortAnswerQuestion, MCQQuestion
+from questions.search import PostgresSearchBackend, get_backend
 
 
 @pytest.mark.django_db
@@ -48,7 +52,7 @@ def test_question_list_authenticated_with_questions(django_user_model):
     assert response.status_code == 200
     data = response.json()
 
-    questions = [q["question"] for q in data]
+    questions = [q["question"] for q in data["results"]]
     assert "What is Python?" in questions
     assert "What is Django?" in questions
 
@@ -65,7 +69,11 @@ def test_question_list_authenticated_empty(django_user_model):
 
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == existing_count
+    assert data["count"] == existing_count
+    assert len(data["results"]) == min(existing_count, 20)
+
+    # The full list is an explicit opt-in
+    assert len(client.get(url, {"all": "true"}).json()) == existing_count
 
 
 @pytest.mark.django_db
@@ -132,3 +140,171 @@ def test_question_detail_mcq(django_user_model):
     assert data["mcq_detail"]["options"]["B"] == "Jupiter"
     assert data["short_detail"] is None
     assert data["creator"] == "testuser4"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ["newest", "oldest", "rating", "rating_asc", "attempts", "attempts_asc", "author_asc", "author_desc"])
+def test_question_list_keyset_pages_cover_every_question_once(django_user_model, ordering):
+    client = APIClient()
+    user = django_user_model.objects.create_user(username="pager", password="pass123")
+    other = django_user_model.objects.create_user(username="another", password="pass123")
+    client.force_authenticate(user=user)
+    for i in range(11):
+        Question.objects.create(
+            creator=user if i % 2 else other,
+            question=f"Paged {i}",
+            type="SHORT",
+            week="Week 1",
+            topic="Paging",
+            rating=float(i % 3),      # plenty of ties to exercise the id tiebreaker
+            num_attempts=i % 2,
+        )
+
+    expected = [q["id"] for q in client.get(reverse("question-list"), {"ordering": ordering, "topic": "Paging", "all": "true"}).json()]
+
+    seen = []
+    response = client.get(reverse("question-list"), {"ordering": ordering, "topic": "Paging", "limit": 4})
+    while True:
+        data = response.json()
+        assert len(data["results"]) <= 4
+        seen.extend(item["id"] for item in data["results"])
+        if not data["next"]:
+            break
+        response = client.get(data["next"])
+
+    assert seen == expected
+    assert len(seen) == 11
+
+
+@pytest.mark.django_db
+def test_question_list_page_number_fallback(django_user_model):
+    client = APIClient()
+    user = django_user_model.objects.create_user(username="pager2", password="pass123")
+    client.force_authenticate(user=user)
+    for i in range(5):
+        Question.objects.create(creator=user, question=f"Numbered {i}", type="SHORT", topic="Numbered")
+
+    response = client.get(reverse("question-list"), {"topic": "Numbered", "page": 2, "page_size": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 5
+    assert len(data["results"]) == 2
+    assert data["previous"] is not None
+
+
+@pytest.mark.django_db
+def test_question_list_invalid_cursor(django_user_model):
+    client = APIClient()
+    user = django_user_model.objects.create_user(username="pager3", password="pass123")
+    client.force_authenticate(user=user)
+    response = client.get(reverse("question-list"), {"cursor": "not-a-cursor"})
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_question_list_search_ranks_and_combines_with_filters(django_user_model):
+    client = APIClient()
+    user = django_user_model.objects.create_user(username="searcher", password="pass123")
+    client.force_authenticate(user=user)
+    strong = Question.objects.create(creator=user, question="Recursion: recursion with recursion", type="SHORT", topic="Recursion", week="Week 13")
+    weak = Question.objects.create(creator=user, question="Loops versus recursion", type="SHORT", topic="Loops", week="Week 13")
+    Question.objects.create(creator=user, question="Recursive MCQ on recursion", type="MCQ", topic="Loops", week="Week 13")
+    Question.objects.create(creator=user, question="Unrelated", type="SHORT", topic="Sorting", week="Week 13")
+
+    ids = [q["id"] for q in client.get(reverse("question-list"), {"search": "recurs", "type": "short"}).json()["results"]]
+    assert ids == [str(strong.id), str(weak.id)]
+
+    # Week search matches with or without the space, like the week filter
+    assert len(client.get(reverse("question-list"), {"search": "week13"}).json()["results"]) == 4
+
+
+@pytest.mark.django_db
+def test_question_search_document_follows_edits(django_user_model):
+    client = APIClient()
+    user = django_user_model.objects.create_user(username="editor", password="pass123")
+    client.force_authenticate(user=user)
+    question = Question.objects.create(creator=user, question="Binary trees", type="SHORT", topic="Trees")
+
+    question.question = "Hash tables"
+    question.save()
+
+    assert client.get(reverse("question-list"), {"search": "binary"}).json()["results"] == []
+    assert [q["id"] for q in client.get(reverse("question-list"), {"search": "hash"}).json()["results"]] == [str(question.id)]
+
+
+@pytest.mark.django_db
+def test_stop_word_only_search_falls_back_to_substring_match(django_user_model):
+    client = APIClient()
+    user = django_user_model.objects.create_user(username="stopper", password="pass123")
+    client.force_authenticate(user=user)
+    question = Question.objects.create(creator=user, question="What is the stack?", type="SHORT", topic="Stopwords")
+
+    ids = [q["id"] for q in client.get(reverse("question-list"), {"search": "the", "topic": "Stopwords"}).json()["results"]]
+    assert ids == [str(question.id)]
+
+
+@pytest.mark.django_db
+def test_search_index_is_installed_for_the_database_vendor():
+    assert get_backend().vendor == connection.vendor
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT indexdef FROM pg_indexes WHERE indexname = 'question_search_gin'")
+            assert "to_tsvector('english'::regconfig" in cursor.fetchone()[0]
+        else:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name LIKE 'questions_search_fts%'")
+            assert {"questions_search_fts", "questions_search_fts_ai", "questions_search_fts_ad", "questions_search_fts_au"} <= {row[0] for row in cursor.fetchall()}
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="PostgreSQL full-text search only")
+def test_postgres_search_detects_stop_word_only_queries():
+    backend = PostgresSearchBackend()
+    assert not backend._has_lexemes("the:* & of:*")
+    assert backend._has_lexemes("the:* & stack:*")
+
+
+@pytest.mark.django_db
+def test_question_rating_applies_incremental_deltas(django_user_model):
+    client = APIClient()
+    first = django_user_model.objects.create_user(username="rater1", password="pass123")
+    second = django_user_model.objects.create_user(username="rater2", password="pass123")
+    question = Question.objects.create(creator=first, question="Rate me", type="SHORT")
+    url = reverse("question-rating", args=[question.id])
+
+    client.force_authenticate(user=first)
+    client.post(url, {"score": 5}, format="json")
+    client.force_authenticate(user=second)
+    data = client.post(url, {"score": 2}, format="json").json()
+    assert (data["average"], data["count"]) == (3.5, 2)
+
+    # Re-rating moves the sum without changing the count
+    data = client.post(url, {"score": 3}, format="json").json()
+    assert (data["average"], data["count"]) == (4.0, 2)
+
+    assert client.delete(url).status_code == 204
+    question.refresh_from_db()
+    assert (question.rating, question.rating_sum, question.rating_count) == (5.0, 5, 1)
+
+    client.force_authenticate(user=first)
+    client.delete(url)
+    question.refresh_from_db()
+    assert (question.rating, question.rating_sum, question.rating_count) == (0.0, 0, 0)
+
+
+@pytest.mark.django_db
+def test_concurrent_first_rating_is_applied_as_a_change(django_user_model):
+    client = APIClient()
+    user = django_user_model.objects.create_user(username="racer", password="pass123")
+    question = Question.objects.create(creator=user, question="Rate me twice", type="SHORT")
+    url = reverse("question-rating", args=[question.id])
+    client.force_authenticate(user=user)
+    client.post(url, {"score": 2}, format="json")
+
+    # The other request's insert lands between this request's lookup and its insert
+    with mock.patch.object(QuerySet, "first", return_value=None):
+        response = client.post(url, {"score": 4}, format="json")
+
+    assert response.status_code == 200
+    question.refresh_from_db()
+    assert (question.rating, question.rating_sum, question.rating_count) == (4.0, 4, 1)
+    assert question.ratings.get().score == 4
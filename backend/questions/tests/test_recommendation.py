@@ -200,3 +200,37 @@ class RecommendationSystemTest(TestCase):
         # Should have more than one topic (diversity)
         self.assertGreater(len(topics), 1, 
                           "Recommendations should include diverse topics")
+
+    def test_recommendations_cached_until_next_attempt(self):
+        """Repeat loads reuse the user's picks; an attempt drops them"""
+        self.client.force_authenticate(user=self.user1)
+        first = [q['id'] for q in self.client.get('/api/questions/recommended/').data]
+
+        # Only the requester-specific question fields are read for cached picks
+        with self.assertNumQueries(2):
+            again = [q['id'] for q in self.client.get('/api/questions/recommended/').data]
+        self.assertEqual(again, first)
+
+        attempted = Question.objects.get(id=first[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            Attempt.objects.create(attempter=self.user1, question=attempted, answer="x", is_correct=True)
+        after = [q['id'] for q in self.client.get('/api/questions/recommended/').data]
+        self.assertNotIn(first[0], after)
+
+    def test_recommendation_pools_follow_question_changes(self):
+        """A committed question write rebuilds the candidate pools on next use"""
+        from questions.recommendations import pools
+
+        self.assertIn(self.q3.id, [qid for qid, _topic in pools.current().by_topic["Classes and Objects"]])
+        with self.captureOnCommitCallbacks(execute=True):
+            q6 = Question.objects.create(
+                question="What is a constructor?",
+                source="STUDENT",
+                creator=self.user2,
+                topic="Classes and Objects",
+                week="Week2",
+                type="SHORT",
+                verify_status=Question.VerifyStatus.APPROVED,
+                rating=5.0,
+            )
+        self.assertEqual(pools.current().by_topic["Classes and Objects"][0], (q6.id, "Classes and Objects"))
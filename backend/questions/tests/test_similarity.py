@@ -0,0 +1,88 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from attempts.models import Attempt
+from questions.models import Question, QuestionNeighbor
+from questions.similarity import attempt_matrix, build_neighbors, top_neighbors
+
+
+def _neighbors(matrix, **kwargs):
+    found = {}
+    for item, neighbor, score, co_attempts, rank in top_neighbors(matrix, **kwargs):
+        for i, n, s, c, r in zip(item, neighbor, score, co_attempts, rank):
+            found[(int(i), int(r))] = (int(n), round(float(s), 3), int(c))
+    return found
+
+
+def test_top_neighbors_scores_and_ranks():
+    # users: 0 -> q0 q1 q2, 1 -> q0 q1, 2 -> q0 q2 (twice), 3 -> q1
+    matrix = attempt_matrix([0, 0, 0, 1, 1, 2, 2, 2, 3], [0, 1, 2, 0, 1, 0, 2, 2, 1], 4, 3)
+
+    found = _neighbors(matrix, top_k=5, min_common=1)
+    assert found[(0, 0)] == (2, 0.816, 2)      # 2 / sqrt(3 * 2)
+    assert found[(0, 1)] == (1, 0.667, 2)      # 2 / sqrt(3 * 3)
+    assert found[(2, 0)] == (0, 0.816, 2)
+    assert found[(2, 1)] == (1, 0.408, 1)
+
+    strict = _neighbors(matrix, top_k=1, min_common=2)
+    assert strict == {(0, 0): (2, 0.816, 2), (1, 0): (0, 0.667, 2), (2, 0): (0, 0.816, 2)}
+    assert _neighbors(matrix, top_k=5, min_common=1, items=[1], block_size=1) == {
+        (1, 0): (0, 0.667, 2), (1, 1): (2, 0.408, 1),
+    }
+
+
+@pytest.fixture
+def coattempts(django_user_model):
+    author = django_user_model.objects.create_user(username="sim-author", password="pass123")
+    questions = [
+        Question.objects.create(creator=author, question=f"Similar {i}", type="SHORT", week="Week 17", topic="Similarity")
+        for i in range(4)
+    ]
+    users = [django_user_model.objects.create_user(username=f"sim{i}", password="pass123") for i in range(3)]
+    for user in users[:2]:
+        for question in questions[:3]:
+            Attempt.objects.create(attempter=user, question=question, answer="x")
+    for question in (questions[0], questions[3]):
+        Attempt.objects.create(attempter=users[2], question=question, answer="x")
+    return questions, users
+
+
+@pytest.mark.django_db
+def test_similar_questions_endpoint(coattempts):
+    questions, users = coattempts
+    call_command("build_question_similarity")
+
+    assert list(
+        QuestionNeighbor.objects.filter(question=questions[1]).order_by("rank").values_list("neighbor_id", "co_attempts")
+    ) == [(questions[2].id, 2), (questions[0].id, 2)]
+
+    client = APIClient()
+    client.force_authenticate(user=users[2])
+    response = client.get(reverse("recommended-questions"), {"similar_to": str(questions[0].id)})
+    assert response.status_code == 200
+    # q3 shares a single attempter with q0 (below --min-common); q0 itself is never its own neighbour
+    assert {item["id"] for item in response.json()} == {str(questions[1].id), str(questions[2].id)}
+
+    response = client.get(reverse("recommended-questions"), {"similar_to": "not-a-uuid"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_incremental_refresh_recomputes_touched_questions(coattempts, django_user_model):
+    questions, users = coattempts
+    assert build_neighbors()["incremental"] is False
+    untouched = QuestionNeighbor.objects.get(question=questions[2], rank=0)
+
+    newcomer = django_user_model.objects.create_user(username="sim-new", password="pass123")
+    for question in (questions[0], questions[3]):
+        Attempt.objects.create(attempter=newcomer, question=question, answer="x")
+
+    totals = build_neighbors(incremental=True)
+    assert totals["incremental"] is True
+    assert totals["questions"] == 2
+    assert list(
+        QuestionNeighbor.objects.filter(question=questions[3]).values_list("neighbor_id", "co_attempts")
+    ) == [(questions[0].id, 2)]
+    assert QuestionNeighbor.objects.get(pk=untouched.pk).computed_at == untouched.computed_at
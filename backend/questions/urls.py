@@ -22,6 +22,7 @@ urlpatterns = [
     path("<uuid:pk>/verify/", QuestionVerifyView.as_view(), name="question-verify"),
     path("<uuid:question_id>/rating/", QuestionRatingView.as_view(), name="question-rating"),
     path("<uuid:question_id>/comments/", CommentViewSet.as_view({"get": "list", "post": "create"}), name="comment-list"),
+    path("comments/<uuid:pk>/replies/", CommentViewSet.as_view({'get': 'replies'}), name="comment-replies"),
     path("comments/<uuid:pk>/reply/", CommentViewSet.as_view({'post': 'reply'}), name="comment-reply"),
     path("comments/<uuid:pk>/like/", CommentViewSet.as_view({'post': 'like'}), name="comment-like"),
     path("comments/<uuid:pk>/unlike/", CommentViewSet.as_view({'post': 'unlike'}), name="comment-unlike"),
@@ -1,19 +1,25 @@
 from rest_framework import generics, status, permissions, viewsets
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.views import APIView
-from django.db.models import Q, Prefetch, Value, Case, When, IntegerField, Count
-from django.db.models.functions import Lower, Replace
-from .models import Question, ShortAnswerQuestion, MCQQuestion, Comment, QuestionRating, SavedQuestion
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q, F, Prefetch, Count, Exists, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from .models import normalize_week, ExplanationJob, Question, ShortAnswerQuestion, MCQQuestion, Comment, QuestionRating, SavedQuestion
+from . import explanation_cache
+from .jobs import enqueue_explanation
+from .pagination import CommentReplyPagination, CommentThreadPagination, QuestionListPagination
+from .recommendations import recommended_ids
+from .search import search_questions
+from .services import apply_rating_change, liked_comment_ids, set_comment_like
 from .serializers import QuestionCreateSerializer, QuestionSerializer, CommentSerializer, ReplySerializer, SavedQuestionSerializer
-from attempts.models import Attempt
-import os
+from attempts.models import UserAbility, UserQuestionProgress
 import re
-import requests
-from django.conf import settings
+import uuid
 from django.shortcuts import get_object_or_404
-from random import sample
 
 
 DEFAULT_WEEK_OPTIONS = [
@@ -71,10 +77,32 @@ def week_sort_key(value):
     return (int(match.group()) if match else float("inf"), value or "")
 
 
+def with_requester_state(queryset, user):
+    """
+    Load everything QuestionSerializer reads for `user` in the page query itself:
+    creator profile and MCQ/short details are joined, attempted/is_saved are
+    EXISTS annotations and the requester's rating is one prefetch per page.
+    """
+    queryset = queryset.select_related("creator", "creator__profile", "mcq_detail", "short_detail")
+    if not user.is_authenticated:
+        return queryset
+    return queryset.annotate(
+        requester_attempted=Exists(UserQuestionProgress.objects.filter(user=user, question=OuterRef("pk"))),
+        requester_saved=Exists(SavedQuestion.objects.filter(user=user, question=OuterRef("pk"))),
+    ).prefetch_related(
+        Prefetch(
+            "ratings",
+            queryset=QuestionRating.objects.filter(user=user),
+            to_attr="user_rating_for_requester",
+        )
+    )
+
+
 class QuestionCreateView(generics.CreateAPIView):
     serializer_class = QuestionCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         type = request.data.get("type")
 
@@ -93,21 +121,23 @@ class QuestionCreateView(generics.CreateAPIView):
         if type == "SHORT":
             answer = request.data.get("answer", "")
 
-            # create ai explanation using openai api
-            ai_answer = self.get_ai_explanation(question.question, answer)
-            # store the SAQ
-            ShortAnswerQuestion.objects.create(
+            # reuse a cached explanation of the same question/answer, else queue one for the worker (questions.jobs)
+            ai_answer = explanation_cache.lookup(question.question, answer) or ""
+            short_answer = ShortAnswerQuestion.objects.create(
                 question=question,
                 answer=answer,
-                ai_answer = ai_answer
+                ai_answer=ai_answer
             )
+            if not ai_answer:
+                enqueue_explanation(short_answer)
             return Response({
                 "id": question.id,
                 "question": question.question,
                 "type": "SHORT",
                 "creator": user.username,
                 "answer": answer,
-                "ai_answer": ai_answer
+                "ai_answer": ai_answer,
+                "ai_status": ExplanationJob.Status.DONE if ai_answer else ExplanationJob.Status.PENDING,
             }, status=status.HTTP_201_CREATED)
 
         elif type == "MCQ":
@@ -154,89 +184,29 @@ class QuestionCreateView(generics.CreateAPIView):
                             status=status.HTTP_400_BAD_REQUEST)
 
 
-    # def get_ai_explanation(self, question_text, answer_text):
-    #     client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    #     prompt = f"""
-    #     You are an assistant generating explanations for short-answer questions.
-    #     Question: {question_text}
-    #     Expected answer: {answer_text}
-    #     Please provide a clear, short explanation that helps a student understand the answer.
-    #     """
-    #     try:
-    #         response = client.chat.completions.create(
-    #             model="gpt-4o-mini",
-    #             messages=[{"role": "user", "content": prompt}],
-    #         )
-    #         return response.choices[0].message.content
-    #     except Exception as e:
-    #         return f"AI explanation failed: {e}"
-
-    def get_ai_explanation(self, question_text, answer_text):
-        prompt = f"""
-        You are an assistant generating explanations for short-answer questions.
-        Question: {question_text}
-        Expected answer: {answer_text}
-        Please provide a clear, short explanation that helps a student understand the answer.
-        """
-
-        try:
-            headers = {
-                "Authorization": f"Bearer {os.environ.get('OPENAI_API_KEY') or settings.OPENAI_API_KEY}",
-                "Content-Type": "application/json",
-            }
-            project_id = os.environ.get("OPENAI_PROJECT_ID") or getattr(settings, "OPENAI_PROJECT_ID", None)
-            if project_id:
-                headers["OpenAI-Project"] = project_id
-            payload = {
-                "model": "gpt-4o-mini",
-                "messages": [{"role": "user", "content": prompt}],
-            }
-
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
-
-        except Exception as e:
-            return f"AI explanation failed: {e}"
-
-
 class QuestionListView(generics.ListAPIView):
-    """Get all questions"""
+    """
+    Get all questions.
+    Page-number pages by default (?page=/?page_size=); ?cursor=/?limit= gives keyset pages
+    and ?all=true the full unpaginated list (see questions.pagination.QuestionListPagination).
+    """
     serializer_class = QuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = QuestionListPagination
 
     def get_queryset(self):
-        queryset = Question.objects.all().select_related("creator")
+        queryset = Question.objects.all()
 
         params = self.request.query_params
-        search = params.get("search")
+        search = (params.get("search") or "").strip()
         if search:
-            search = search.strip()
-            if search:
-                queryset = queryset.filter(
-                    Q(question__icontains=search) |
-                    Q(topic__icontains=search) |
-                    Q(week__icontains=search) |
-                    Q(creator__username__icontains=search)
-                )
+            queryset = search_questions(queryset, search)
 
         weeks = params.getlist("week")
         if weeks:
-            normalized_weeks = [
-                re.sub(r"\s+", "", week.strip().lower())
-                for week in weeks
-                if week and week.strip()
-            ]
+            normalized_weeks = [normalize_week(week) for week in weeks if week and week.strip()]
             if normalized_weeks:
-                queryset = queryset.annotate(
-                    week_normalized=Replace(Lower("week"), Value(" "), Value(""))
-                ).filter(week_normalized__in=normalized_weeks)
+                queryset = queryset.filter(normalized_week__in=normalized_weeks)
 
         topics = params.getlist("topic")
         if topics:
@@ -273,7 +243,20 @@ class QuestionListView(generics.ListAPIView):
         if creator_id:
             queryset = queryset.filter(creator_id=creator_id)
 
-        ordering_param = params.get("ordering", "newest")
+        # Questions whose estimated difficulty is within level_window of the user's ability
+        near_level = params.get("near_level")
+        if near_level in {"true", "1", "yes"}:
+            ability = (
+                UserAbility.objects.filter(user=self.request.user).values_list("ability", flat=True).first() or 0.0
+            )
+            try:
+                window = float(params.get("level_window", settings.QUESTION_LEVEL_WINDOW))
+            except ValueError:
+                window = settings.QUESTION_LEVEL_WINDOW
+            queryset = queryset.filter(difficulty__range=(ability - window, ability + window))
+
+        # Search results default to relevance order; without a search it means newest
+        ordering_param = params.get("ordering", "relevance" if search else "newest")
         ordering_map = {
             "newest": "-created_at",
             "oldest": "created_at",
@@ -283,34 +266,35 @@ class QuestionListView(generics.ListAPIView):
             "attempts_desc": "-num_attempts",
             "attempts": "-num_attempts",
             "attempts_asc": "num_attempts",
+            # Difficulty stays NULL until estimate_question_difficulty has fitted the question
+            "difficulty": F("difficulty").asc(nulls_last=True),
+            "difficulty_asc": F("difficulty").asc(nulls_last=True),
+            "difficulty_desc": F("difficulty").desc(nulls_last=True),
             "author_asc": "creator__username",
             "author_desc": "-creator__username",
         }
+        if search:
+            ordering_map["relevance"] = "-search_rank"
         order_by = ordering_map.get(ordering_param, "-created_at")
-        if isinstance(order_by, str):
+        if not isinstance(order_by, list):
             order_by = [order_by]
-        if "-created_at" not in order_by:
+        if not any(isinstance(field, str) and field.lstrip("-") == "created_at" for field in order_by):
             order_by.append("-created_at")
+        # Unique tiebreaker so keyset cursors are stable
+        order_by.append("-id")
         queryset = queryset.order_by(*order_by)
 
-        user = self.request.user
-        if user.is_authenticated:
-            queryset = queryset.prefetch_related(
-                Prefetch(
-                    "ratings",
-                    queryset=QuestionRating.objects.filter(user=user),
-                    to_attr="user_rating_for_requester",
-                )
-            )
-        return queryset.prefetch_related("mcq_detail", "short_detail")
+        return with_requester_state(queryset, self.request.user)
 
 
 class QuestionDetailView(generics.RetrieveAPIView):
     """Get specific question details"""
-    queryset = Question.objects.all()
     serializer_class = QuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        return with_requester_state(Question.objects.all(), self.request.user)
+
 
 class UserQuestionsView(generics.ListAPIView):
     """Get all questions created by the current user"""
@@ -318,31 +302,68 @@ class UserQuestionsView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Question.objects.filter(creator=self.request.user).order_by('-created_at')
-    
+        queryset = Question.objects.filter(creator=self.request.user).order_by('-created_at')
+        return with_requester_state(queryset, self.request.user)
+
 
 
 class CommentViewSet(viewsets.ModelViewSet):
+    """
+    A question's discussion. The list is keyset-paged top-level comments (see
+    CommentThreadPagination), each with its reply_count and its first
+    COMMENT_INLINE_REPLIES replies; replies_next links to the rest, served a page
+    at a time by the `replies` action.
+    """
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = CommentThreadPagination
 
     def get_queryset(self):
         question_id = self.kwargs.get("question_id") or self.request.query_params.get("question_id")
+        queryset = Comment.objects.filter(parent__isnull=True).select_related("author", "author__profile")
+        if self.action not in ("list", "retrieve"):
+            return queryset
         if question_id:
-            return Comment.objects.filter(
-                question_id=question_id,
-                parent__isnull=True
-            ).select_related("author", "author__profile").prefetch_related(
-                "likes",
-                "replies__author",
-                "replies__author__profile",
-                "replies__likes",
-            )
-        return Comment.objects.filter(parent__isnull=True).select_related(
-            "author", "author__profile"
-        ).prefetch_related("likes", "replies__author", "replies__author__profile", "replies__likes")
+            queryset = queryset.filter(question_id=question_id)
+        elif self.action == "list":
+            raise ParseError("question_id is required")
+
+        replies = Comment.objects.filter(parent=OuterRef("pk")).order_by().values("parent")
+        first_replies = Comment.objects.select_related("author", "author__profile").order_by("created_at", "id")
+        return queryset.annotate(
+            reply_count=Coalesce(Subquery(replies.annotate(n=Count("id")).values("n")), 0),
+        ).prefetch_related(
+            Prefetch(
+                "replies",
+                queryset=first_replies[:getattr(settings, "COMMENT_INLINE_REPLIES", 3)],
+                to_attr="first_replies",
+            ),
+        ).order_by("created_at", "id")
+
+    def get_serializer_class(self):
+        if self.action == "replies":
+            return ReplySerializer
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        # Look up which of the comments (and their inlined replies) the requester liked in one query
+        instance = args[0] if args else kwargs.get("instance")
+        if instance is not None:
+            comments = instance if isinstance(instance, (list, QuerySet)) else [instance]
+            threads = self.get_serializer_class() is CommentSerializer
+            comment_ids = []
+            for comment in comments:
+                comment_ids.append(comment.id)
+                if threads:
+                    comment_ids.extend(reply.id for reply in CommentSerializer.inline_replies(comment))
+            kwargs["context"] = {
+                **self.get_serializer_context(),
+                "liked_comment_ids": liked_comment_ids(self.request.user, comment_ids),
+            }
+        return super().get_serializer(*args, **kwargs)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         question_id = self.kwargs.get("question_id")
         question = get_object_or_404(Question, pk=question_id)
@@ -354,6 +375,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         return context
 
     @action(detail=True, methods=['post'])
+    @transaction.atomic
     def reply(self, request, pk=None):
         parent_comment = self.get_object()
         content = request.data.get('content')
@@ -369,29 +391,33 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer = ReplySerializer(reply, context=self.get_serializer_context())
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=True, methods=['get'])
+    def replies(self, request, pk=None):
+        """A page of replies to a top-level comment, oldest first; start from the thread's replies_next."""
+        parent_comment = self.get_object()
+        queryset = parent_comment.replies.select_related("author", "author__profile").order_by("created_at", "id")
+        paginator = CommentReplyPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=True, methods=['post'])
     def like(self, request, pk=None):
         # Get comment/reply directly without queryset filtering
         try:
-            comment = Comment.objects.get(pk=pk)
+            like_count = set_comment_like(pk, request.user, liked=True)
         except Comment.DoesNotExist:
             return Response({'error': 'Comment not found'}, status=status.HTTP_404_NOT_FOUND)
-        
-        user = request.user
-        comment.likes.add(user)
-        return Response({'like_count': comment.likes.count()})
+        return Response({'like_count': like_count})
 
     @action(detail=True, methods=['post'])
     def unlike(self, request, pk=None):
         # Get comment/reply directly without queryset filtering
         try:
-            comment = Comment.objects.get(pk=pk)
+            like_count = set_comment_like(pk, request.user, liked=False)
         except Comment.DoesNotExist:
             return Response({'error': 'Comment not found'}, status=status.HTTP_404_NOT_FOUND)
-        
-        user = request.user
-        comment.likes.remove(user)
-        return Response({'like_count': comment.likes.count()})
+        return Response({'like_count': like_count})
 
 
 class QuestionMetadataView(APIView):
@@ -435,6 +461,7 @@ class QuestionRatingView(APIView):
             "userRating": user_rating.score if user_rating else None,
         })
 
+    @transaction.atomic
     def post(self, request, question_id):
         score = request.data.get("score")
         try:
@@ -446,12 +473,24 @@ class QuestionRatingView(APIView):
             return Response({"error": "Score must be between 1 and 5."}, status=status.HTTP_400_BAD_REQUEST)
 
         question = get_object_or_404(Question, pk=question_id)
-        rating, _created = QuestionRating.objects.update_or_create(
-            question=question,
-            user=request.user,
-            defaults={"score": score},
-        )
-        question.recalculate_rating()
+        rating = QuestionRating.objects.select_for_update().filter(question=question, user=request.user).first()
+        created = False
+        if rating is None:
+            try:
+                with transaction.atomic():
+                    rating = QuestionRating.objects.create(question=question, user=request.user, score=score)
+                created = True
+            except IntegrityError:
+                # A concurrent first rating by this user won the insert (and counted it);
+                # treat this request as a change to that rating so the deltas stay exact.
+                rating = QuestionRating.objects.select_for_update().get(question=question, user=request.user)
+        if created:
+            apply_rating_change(question, score, 1)
+        elif rating.score != score:
+            previous = rating.score
+            rating.score = score
+            rating.save(update_fields=["score", "updated_at"])
+            apply_rating_change(question, score - previous, 0)
         return Response({
             "questionId": str(question.id),
             "average": question.rating,
@@ -459,11 +498,13 @@ class QuestionRatingView(APIView):
             "userRating": rating.score,
         }, status=status.HTTP_200_OK)
 
+    @transaction.atomic
     def delete(self, request, question_id):
         question = get_object_or_404(Question, pk=question_id)
-        deleted = question.ratings.filter(user=request.user).delete()
-        if deleted[0]:
-            question.recalculate_rating()
+        rating = question.ratings.select_for_update().filter(user=request.user).first()
+        if rating is not None:
+            rating.delete()
+            apply_rating_change(question, -rating.score, -1)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 class SaveQuestionView(APIView):
@@ -550,124 +591,39 @@ class RecommendedQuestionsView(APIView):
     - 20% popular questions (high attempt count)
     - Excludes questions the user has already attempted
     - Prioritizes verified questions with weighted scoring
+    ?similar_to=<question uuid> instead returns that question's co-attempt neighbours
+    ("students who attempted this also attempted") the user has not attempted yet.
     """
     permission_classes = [permissions.IsAuthenticated]
+    similar_limit = 6
 
     def get(self, request):
-        user = request.user
-        
-        # Get questions user has already attempted
-        attempted_question_ids = Attempt.objects.filter(
-            attempter=user
-        ).values_list('question_id', flat=True).distinct()
-
-        # Get user's most recent topic
-        last_attempt = Attempt.objects.filter(attempter=user).select_related('question').order_by('-submitted_at').first()
-        recent_topic = last_attempt.question.topic if last_attempt and last_attempt.question.topic else None
-
-        # Base queryset: exclude already attempted questions
-        base_queryset = Question.objects.exclude(
-            id__in=attempted_question_ids
-        ).select_related("creator").prefetch_related("mcq_detail", "short_detail")
-
-        # Add weighted score annotation
-        # Verified questions get +1000 points, approved get +500
-        base_queryset = base_queryset.annotate(
-            priority_score=Case(
-                When(verify_status='APPROVED', then=Value(1000)),
-                When(verify_status='PENDING', then=Value(100)),
-                default=Value(0),
-                output_field=IntegerField(),
-            )
-        )
-
-        recommendations = []
-        
-        # Strategy 1: 50% same topic (3 questions)
-        if recent_topic:
-            same_topic_qs = base_queryset.filter(topic=recent_topic).order_by(
-                '-priority_score',  # Verified first
-                '-rating',           # Then by rating
-                '-num_attempts',     # Then by popularity
-                '-created_at'        # Then by newness
-            )[:10]  # Get top 10 to have variety
-            same_topic_list = list(same_topic_qs)
-            # Randomly sample 3 from top 10 for diversity
-            if len(same_topic_list) >= 3:
-                recommendations.extend(sample(same_topic_list, 3))
-            else:
-                recommendations.extend(same_topic_list)
-
-        # Strategy 2: 30% high-rated questions (2 questions)
-        high_rated_qs = base_queryset.filter(
-            rating__gte=3.5  # Only good questions
-        ).exclude(
-            id__in=[q.id for q in recommendations]
-        )
-        
-        if recent_topic:
-            high_rated_qs = high_rated_qs.exclude(topic=recent_topic)
-        
-        high_rated_qs = high_rated_qs.order_by(
-            '-priority_score',
-            '-rating',
-            '-num_attempts'
-        )[:8]
-        high_rated_list = list(high_rated_qs)
-        if len(high_rated_list) >= 2:
-            recommendations.extend(sample(high_rated_list, 2))
-        else:
-            recommendations.extend(high_rated_list)
-
-        # Strategy 3: 20% popular questions (1 question)
-        popular_qs = base_queryset.filter(
-            num_attempts__gte=5  # At least 5 attempts
-        ).exclude(
-            id__in=[q.id for q in recommendations]
-        ).order_by(
-            '-priority_score',
-            '-num_attempts',
-            '-rating'
-        )[:5]
-        popular_list = list(popular_qs)
-        if popular_list:
-            recommendations.extend(sample(popular_list, min(1, len(popular_list))))
-
-        # If we don't have 6 questions yet, fill with best available
-        if len(recommendations) < 6:
-            remaining_needed = 6 - len(recommendations)
-            filler_qs = base_queryset.exclude(
-                id__in=[q.id for q in recommendations]
-            ).order_by(
-                '-priority_score',
-                '-rating',
-                '-num_attempts',
-                '-created_at'
-            )[:remaining_needed * 2]  # Get extra for sampling
-            filler_list = list(filler_qs)
-            if filler_list:
-                sample_size = min(remaining_needed, len(filler_list))
-                recommendations.extend(sample(filler_list, sample_size))
-
-        # Prefetch user ratings
-        if recommendations:
-            question_ids = [q.id for q in recommendations]
-            queryset_with_ratings = Question.objects.filter(
-                id__in=question_ids
-            ).prefetch_related(
-                Prefetch(
-                    "ratings",
-                    queryset=QuestionRating.objects.filter(user=user),
-                    to_attr="user_rating_for_requester",
-                )
-            )
-            # Create a mapping for efficient lookup
-            rating_map = {q.id: q for q in queryset_with_ratings}
-            # Update recommendations with rating info
-            for q in recommendations:
-                if q.id in rating_map:
-                    q.user_rating_for_requester = rating_map[q.id].user_rating_for_requester
+        similar_to = request.query_params.get("similar_to")
+        if similar_to:
+            return self.similar(request, similar_to)
+
+        # Ids come from the precomputed pools (see questions.recommendations), cached per
+        # user until their next attempt; only the requester-specific fields are read here
+        ids = recommended_ids(request.user)
+        questions = {
+            q.id: q for q in with_requester_state(Question.objects.filter(id__in=ids), request.user)
+        }
+        recommendations = [questions[question_id] for question_id in ids if question_id in questions]
 
         # Serialize and return
         serializer = QuestionSerializer(recommendations, many=True, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def similar(self, request, question_id):
+        try:
+            question_id = uuid.UUID(question_id)
+        except ValueError:
+            return Response({"error": "similar_to must be a question id"}, status=status.HTTP_400_BAD_REQUEST)
+        # One read of the (question, rank) index written by build_question_similarity
+        neighbors = (
+            with_requester_state(Question.objects.filter(neighbor_of__question_id=question_id), request.user)
+            .filter(requester_attempted=False)
+            .order_by("neighbor_of__rank")[:self.similar_limit]
+        )
+        serializer = QuestionSerializer(neighbors, many=True, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
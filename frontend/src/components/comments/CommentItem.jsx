@@ -1,22 +1,26 @@
 import React, { useState } from 'react';
 import { Card, Button, Form, Image } from 'react-bootstrap';
 import { Link } from 'react-router-dom';
-import { CommentService } from '../../services/commentService';
+import { CommentService, cursorFrom } from '../../services/commentService';
 
 /**
  * SingleComment Component (Reusable comment/reply display component)
  * Displays a single comment or reply with likes and reply functionality
  * 
  * @param {Object} comment - Comment or reply data object
- * @param {Function} onCommentUpdate - Callback function to refresh comments
+ * @param {Function} onCommentChange - (commentId, changes) merges changes into a comment or reply in the list
+ * @param {Function} onRepliesAdded - (commentId, replies, options) adds loaded or posted replies to a comment
  * @param {boolean} isReply - Whether this is a reply (affects styling)
  * @param {number} parentCommentId - Parent comment ID (the root comment ID for nested replies)
  */
-const SingleComment = ({ comment, onCommentUpdate, isReply = false, parentCommentId = null }) => {
+const SingleComment = ({ comment, onCommentChange, onRepliesAdded, isReply = false, parentCommentId = null }) => {
     const [showReplyForm, setShowReplyForm] = useState(false);
     const [replyContent, setReplyContent] = useState('');
     const [isSubmittingReply, setIsSubmittingReply] = useState(false);
     const [isLiking, setIsLiking] = useState(false);
+    const [isLoadingReplies, setIsLoadingReplies] = useState(false);
+    // Replies past the ones shown so far are paged from `replies_next`
+    const repliesCursor = cursorFrom(comment.replies_next);
 
     // Format date
     const formatDate = (dateString) => {
@@ -42,12 +46,11 @@ const SingleComment = ({ comment, onCommentUpdate, isReply = false, parentCommen
         
         setIsLiking(true);
         try {
-            if (comment.is_liked_by_user) {
-                await CommentService.unlikeComment(comment.id);
-            } else {
-                await CommentService.likeComment(comment.id);
-            }
-            onCommentUpdate(); // Refresh comments
+            const liked = !comment.is_liked_by_user;
+            const data = liked
+                ? await CommentService.likeComment(comment.id)
+                : await CommentService.unlikeComment(comment.id);
+            onCommentChange(comment.id, { is_liked_by_user: liked, like_count: data.like_count });
         } catch (error) {
             console.error('Failed to toggle like:', error);
         } finally {
@@ -55,6 +58,21 @@ const SingleComment = ({ comment, onCommentUpdate, isReply = false, parentCommen
         }
     };
 
+    // Load the next page of replies
+    const handleLoadMoreReplies = async () => {
+        if (!repliesCursor || isLoadingReplies) return;
+
+        setIsLoadingReplies(true);
+        try {
+            const data = await CommentService.getReplies(comment.id, repliesCursor);
+            onRepliesAdded(comment.id, data.results, { repliesNext: data.next });
+        } catch (error) {
+            console.error('Failed to load replies:', error);
+        } finally {
+            setIsLoadingReplies(false);
+        }
+    };
+
     // Handle reply submission (for both main comments and replies)
     const handleReplySubmit = async (e) => {
         e.preventDefault();
@@ -71,10 +89,10 @@ const SingleComment = ({ comment, onCommentUpdate, isReply = false, parentCommen
                 ? `@${authorDisplayName}: ${replyContent}`
                 : replyContent;
             
-            await CommentService.replyToComment(targetId, finalContent);
+            const reply = await CommentService.replyToComment(targetId, finalContent);
             setReplyContent('');
             setShowReplyForm(false);
-            onCommentUpdate(); // Refresh comments
+            onRepliesAdded(targetId, [reply], { posted: true });
         } catch (error) {
             console.error('Failed to submit reply:', error);
             alert('Failed to post reply. Please try again.');
@@ -224,12 +242,26 @@ const SingleComment = ({ comment, onCommentUpdate, isReply = false, parentCommen
                             <div key={reply.id} className="mb-2">
                                 <SingleComment
                                     comment={reply}
-                                    onCommentUpdate={onCommentUpdate}
+                                    onCommentChange={onCommentChange}
+                                    onRepliesAdded={onRepliesAdded}
                                     isReply={true}
                                     parentCommentId={comment.id}
                                 />
                             </div>
                         ))}
+                        {repliesCursor && (
+                            <Button
+                                variant="link"
+                                size="sm"
+                                className="p-0"
+                                onClick={handleLoadMoreReplies}
+                                disabled={isLoadingReplies}
+                            >
+                                {isLoadingReplies
+                                    ? 'Loading...'
+                                    : `View more replies (${comment.reply_count - comment.replies.length})`}
+                            </Button>
+                        )}
                     </div>
                 )}
             </Card.Body>
@@ -241,13 +273,14 @@ const SingleComment = ({ comment, onCommentUpdate, isReply = false, parentCommen
  * CommentItem Component (Main comment container component)
  * Wrapper component for displaying a top-level comment with its replies
  */
-const CommentItem = ({ comment, onCommentUpdate }) => {
+const CommentItem = ({ comment, onCommentChange, onRepliesAdded }) => {
 
     return (
         <div className="mb-3">
             <SingleComment 
                 comment={comment} 
-                onCommentUpdate={onCommentUpdate} 
+                onCommentChange={onCommentChange}
+                onRepliesAdded={onRepliesAdded}
                 isReply={false}
             />
         </div>
@@ -1,14 +1,16 @@
 import React, { useState, useEffect } from 'react';
-import { Card, Alert, Spinner } from 'react-bootstrap';
+import { Card, Alert, Spinner, Button } from 'react-bootstrap';
 import CommentItem from './CommentItem';
-import { CommentService } from '../../services/commentService';
+import { CommentService, cursorFrom } from '../../services/commentService';
 
 /**
  * CommentList Component
- * Displays all comments for a question
+ * Displays a question's comments a page at a time
  */
 const CommentList = ({ questionId, refreshTrigger }) => {
     const [comments, setComments] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
 
@@ -21,7 +23,8 @@ const CommentList = ({ questionId, refreshTrigger }) => {
         try {
             setLoading(true);
             const data = await CommentService.getComments(questionId);
-            setComments(data);
+            setComments(data.results);
+            setNextCursor(cursorFrom(data.next));
             setError('');
         } catch (err) {
             console.error('Failed to load comments:', err);
@@ -31,13 +34,66 @@ const CommentList = ({ questionId, refreshTrigger }) => {
         }
     };
 
+    // Oldest first, without duplicates (a reply posted here may come back in a later replies page)
+    const mergeReplies = (existing, incoming) => {
+        const seen = new Set(existing.map((reply) => reply.id));
+        return [...existing, ...incoming.filter((reply) => !seen.has(reply.id))]
+            .sort((a, b) => new Date(a.created_at) - new Date(b.created_at));
+    };
+
+    // Merge `changes` into the comment or reply with this id, leaving every loaded page in place
+    const handleCommentChange = (commentId, changes) => {
+        setComments((previous) => previous.map((comment) => {
+            if (comment.id === commentId) {
+                return { ...comment, ...changes };
+            }
+            if (comment.replies.some((reply) => reply.id === commentId)) {
+                return {
+                    ...comment,
+                    replies: comment.replies.map((reply) => (
+                        reply.id === commentId ? { ...reply, ...changes } : reply
+                    )),
+                };
+            }
+            return comment;
+        }));
+    };
+
+    // Add replies to a top-level comment: a page loaded from `replies_next` or one just posted
+    const handleRepliesAdded = (commentId, replies, { repliesNext, posted = false } = {}) => {
+        setComments((previous) => previous.map((comment) => {
+            if (comment.id !== commentId) return comment;
+            return {
+                ...comment,
+                replies: mergeReplies(comment.replies, replies),
+                reply_count: posted ? comment.reply_count + replies.length : comment.reply_count,
+                replies_next: repliesNext === undefined ? comment.replies_next : repliesNext,
+            };
+        }));
+    };
+
+    const loadMoreComments = async () => {
+        if (!nextCursor || loadingMore) return;
+        try {
+            setLoadingMore(true);
+            const data = await CommentService.getComments(questionId, { cursor: nextCursor });
+            setComments((previous) => [...previous, ...data.results]);
+            setNextCursor(cursorFrom(data.next));
+        } catch (err) {
+            console.error('Failed to load more comments:', err);
+            setError('Failed to load more comments. Please try again.');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     return (
         <div className="comment-list-section">
             <Card className="shadow-sm">
                 <Card.Body>
                     <h5 className="mb-3">
                         Comments
-                        <span className="badge bg-secondary ms-2">{comments.length}</span>
+                        <span className="badge bg-secondary ms-2">{comments.length}{nextCursor ? '+' : ''}</span>
                     </h5>
 
                     {error && (
@@ -64,9 +120,22 @@ const CommentList = ({ questionId, refreshTrigger }) => {
                                 <CommentItem
                                     key={comment.id}
                                     comment={comment}
-                                    onCommentUpdate={loadComments}
+                                    onCommentChange={handleCommentChange}
+                                    onRepliesAdded={handleRepliesAdded}
                                 />
                             ))}
+                            {nextCursor && (
+                                <div className="text-center">
+                                    <Button
+                                        variant="outline-secondary"
+                                        size="sm"
+                                        onClick={loadMoreComments}
+                                        disabled={loadingMore}
+                                    >
+                                        {loadingMore ? 'Loading...' : 'Load more comments'}
+                                    </Button>
+                                </div>
+                            )}
                         </div>
                     )}
                 </Card.Body>
@@ -24,6 +24,7 @@ const DoQuestion = () => {
     const [savingQuestion, setSavingQuestion] = useState(false);
     const [questionsList, setQuestionsList] = useState([]);
     const [currentIndex, setCurrentIndex] = useState(-1);
+    const [listPage, setListPage] = useState({ page: 1, pageSize: null, count: 0, options: {} });
     const [previousAttempt, setPreviousAttempt] = useState(null);
     const [showAttemptView, setShowAttemptView] = useState(true);
     
@@ -220,21 +221,22 @@ const DoQuestion = () => {
         }
     };
 
-    // Fetch all questions for navigation
+    // Fetch the question list page the user is browsing, for navigation
     useEffect(() => {
         const loadQuestionsList = async () => {
             try {
-                // Try to get saved filters and sorting from sessionStorage
+                // Try to get saved filters, sorting and page from sessionStorage
                 const savedFilters = sessionStorage.getItem('questionFilters');
                 const savedSort = sessionStorage.getItem('questionSort');
                 const savedSearch = sessionStorage.getItem('questionSearch');
-                
-                console.log('Loading questions list with saved preferences:', { savedFilters, savedSort, savedSearch });
-                
+                const savedPage = sessionStorage.getItem('questionListPage');
+
                 let filters = {};
                 let sort = undefined;
                 let search = undefined;
-                
+                let page = 1;
+                let pageSize = null;
+
                 // Parse saved filters if they exist
                 if (savedFilters) {
                     try {
@@ -245,24 +247,35 @@ const DoQuestion = () => {
                         console.error('Failed to parse saved filters:', e);
                     }
                 }
-                
+
                 if (savedSort) {
                     sort = savedSort;
                 }
-                
+
                 if (savedSearch) {
                     search = savedSearch;
                 }
-                
-                // Fetch questions with user's filters and sorting
-                const questions = await QuestionService.getAllQuestions({
-                    filters: filters,
-                    sort: sort,
-                    search: search
-                });
-                
+
+                if (savedPage) {
+                    try {
+                        const parsedPage = JSON.parse(savedPage);
+                        // Only resume the saved page if it contains this question
+                        if (parsedPage?.ids?.includes(questionId)) {
+                            page = parsedPage.page || 1;
+                            pageSize = parsedPage.pageSize || null;
+                        }
+                    } catch (e) {
+                        console.error('Failed to parse saved page:', e);
+                    }
+                }
+
+                const options = { filters, sort, search };
+                const data = await QuestionService.getQuestionPage({ ...options, page, pageSize });
+                const questions = data?.results || [];
+
                 setQuestionsList(questions);
-                
+                setListPage({ page, pageSize, count: data?.count || 0, options });
+
                 // Find current question index
                 const index = questions.findIndex(q => q.id === questionId);
                 setCurrentIndex(index);
@@ -294,15 +307,47 @@ const DoQuestion = () => {
         navigate(`/question/${newQuestionId}`);
     };
 
+    const hasPreviousPage = listPage.page > 1;
+    const hasNextPage = listPage.pageSize
+        ? listPage.page * listPage.pageSize < listPage.count
+        : questionsList.length < listPage.count;
+
+    // Step onto an adjacent list page, remembering it for the next load
+    const navigateAcrossPage = async (page, pickQuestion) => {
+        try {
+            const data = await QuestionService.getQuestionPage({
+                ...listPage.options,
+                page,
+                pageSize: listPage.pageSize,
+            });
+            const questions = data?.results || [];
+            const target = pickQuestion(questions);
+            if (!target) return;
+            sessionStorage.setItem('questionListPage', JSON.stringify({
+                page,
+                pageSize: listPage.pageSize,
+                count: data?.count || 0,
+                ids: questions.map(q => q.id),
+            }));
+            navigateToQuestion(target.id);
+        } catch (err) {
+            console.error('Failed to load adjacent questions page:', err);
+        }
+    };
+
     const handlePrevious = () => {
         if (currentIndex > 0 && questionsList.length > 0) {
             navigateToQuestion(questionsList[currentIndex - 1].id);
+        } else if (currentIndex === 0 && hasPreviousPage) {
+            navigateAcrossPage(listPage.page - 1, (questions) => questions[questions.length - 1]);
         }
     };
 
     const handleNext = () => {
         if (currentIndex < questionsList.length - 1 && questionsList.length > 0) {
             navigateToQuestion(questionsList[currentIndex + 1].id);
+        } else if (currentIndex === questionsList.length - 1 && hasNextPage) {
+            navigateAcrossPage(listPage.page + 1, (questions) => questions[0]);
         }
     };
 
@@ -386,7 +431,10 @@ const DoQuestion = () => {
                         <Button
                             variant="outline-primary"
                             onClick={handlePrevious}
-                            disabled={currentIndex <= 0 || questionsList.length === 0}
+                            disabled={
+                                currentIndex < 0 ||
+                                (currentIndex === 0 && !hasPreviousPage)
+                            }
                             title="Previous question"
                         >
                             <i className="bi bi-chevron-left"></i> Previous
@@ -403,8 +451,8 @@ const DoQuestion = () => {
                             variant="outline-primary"
                             onClick={handleNext}
                             disabled={
-                                currentIndex >= questionsList.length - 1 ||
-                                questionsList.length === 0
+                                currentIndex < 0 ||
+                                (currentIndex >= questionsList.length - 1 && !hasNextPage)
                             }
                             title="Next question"
                         >
@@ -106,6 +106,7 @@ const QuestionDisplay = ({
 
     const [items, setItems] = useState([]);
     const [filteredItems, setFilteredItems] = useState([]);
+    const [totalCount, setTotalCount] = useState(0);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [currentPage, setCurrentPage] = useState(1);
@@ -119,15 +120,16 @@ const QuestionDisplay = ({
         sources: DEFAULT_SOURCE_OPTIONS,
     });
 
-    const itemsPerPage = mode === 'grid' ? ITEMS_PER_PAGE_GRID : ITEMS_PER_PAGE_LIST;
-    const shouldUsePagination = usePagination !== null ? usePagination : mode === 'grid';
-
-    const navigate = useNavigate();
-
     const isAttempted = type === 'attempted';
     const isPosted = type === 'posted';
     const isSaved = type === 'saved';
     const isAll = type === 'all';
+
+    const itemsPerPage = mode === 'grid' ? ITEMS_PER_PAGE_GRID : ITEMS_PER_PAGE_LIST;
+    // The "all" dataset is paged by the server, so it always paginates
+    const shouldUsePagination = isAll || (usePagination !== null ? usePagination : mode === 'grid');
+
+    const navigate = useNavigate();
     const hasSearchValue = searchQuery.trim().length > 0;
     const filtersApplied = isAll && hasActiveFilters(filters);
 
@@ -182,7 +184,7 @@ const QuestionDisplay = ({
         }
     }, [isAll, filters, sortOption, searchQuery]);
 
-    // Fetch data for "all" questions with filters/sorting/search
+    // Fetch one server page of "all" questions with filters/sorting/search
     useEffect(() => {
         if (!isAll) return;
 
@@ -192,20 +194,31 @@ const QuestionDisplay = ({
 
         const debounceId = setTimeout(async () => {
             try {
-                const data = await QuestionService.getAllQuestions({
+                const data = await QuestionService.getQuestionPage({
                     search: searchQuery,
                     filters,
                     sort: sortOption,
+                    page: currentPage,
+                    pageSize: itemsPerPage,
                 });
                 if (!active) return;
-                setItems(data || []);
-                setFilteredItems(data || []);
-                setCurrentPage(1);
+                const results = data?.results || [];
+                setItems(results);
+                setFilteredItems(results);
+                setTotalCount(data?.count || 0);
+                // Remember the visible page so DoQuestion can step through it
+                sessionStorage.setItem('questionListPage', JSON.stringify({
+                    page: currentPage,
+                    pageSize: itemsPerPage,
+                    count: data?.count || 0,
+                    ids: results.map((item) => item.id),
+                }));
             } catch (err) {
                 if (!active) return;
                 console.error('Error fetching all questions:', err);
                 setItems([]);
                 setFilteredItems([]);
+                setTotalCount(0);
                 setError('Failed to load all questions. Please try again.');
             } finally {
                 if (active) setLoading(false);
@@ -216,7 +229,7 @@ const QuestionDisplay = ({
             active = false;
             clearTimeout(debounceId);
         };
-    }, [isAll, searchQuery, filters, sortOption]);
+    }, [isAll, searchQuery, filters, sortOption, currentPage, itemsPerPage]);
 
     // Fetch data for attempted or posted question views
     useEffect(() => {
@@ -298,10 +311,12 @@ const QuestionDisplay = ({
         setCurrentPage(1);
     }, [searchQuery, items, isAttempted, isAll]);
 
-    const totalPages = Math.ceil((filteredItems.length || 0) / itemsPerPage) || 1;
+    // "all" holds a single server page; other datasets are paged client-side
+    const resultCount = isAll ? totalCount : filteredItems.length;
+    const totalPages = Math.ceil((resultCount || 0) / itemsPerPage) || 1;
     const startIndex = (currentPage - 1) * itemsPerPage;
     const endIndex = startIndex + itemsPerPage;
-    const currentItems = shouldUsePagination
+    const currentItems = shouldUsePagination && !isAll
         ? filteredItems.slice(startIndex, endIndex)
         : filteredItems;
 
@@ -394,9 +409,9 @@ const QuestionDisplay = ({
         );
 
         const pageInfo =
-            shouldUsePagination && filteredItems.length > 0 && (
+            shouldUsePagination && resultCount > 0 && (
                 <div className="text-center text-muted small">
-                    Showing {startIndex + 1} - {Math.min(endIndex, filteredItems.length)} of {filteredItems.length}{' '}
+                    Showing {startIndex + 1} - {Math.min(endIndex, resultCount)} of {resultCount}{' '}
                     questions
                 </div>
             );
@@ -531,7 +546,7 @@ const QuestionDisplay = ({
                     {/* Second row: Results count + Active filter chips on the same line */}
                     <div className="d-flex align-items-center flex-wrap gap-2 mt-0 px-2 py-2">
                         <div className="text-muted small me-2">
-                            {filteredItems.length} results{activeSummary ? ` · ${activeSummary}` : ''}
+                            {resultCount} results{activeSummary ? ` · ${activeSummary}` : ''}
                         </div>
                         {isAll && (filtersApplied || hasSearchValue) && (
                             <div className="ql-chips d-flex flex-wrap gap-2">
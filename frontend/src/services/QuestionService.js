@@ -1,47 +1,73 @@
 import apiClient from './apiClient.js';
 import { AttemptService } from './attemptService.js';
 
+// Translate list options (search, filters, sort) into /questions/ query params
+const buildQuestionParams = (options = {}) => {
+    const params = {};
+
+    if (options.search?.trim()) {
+        params.search = options.search.trim();
+    }
+
+    const filters = options.filters || {};
+    if (filters.week) {
+        params.week = filters.week;
+    }
+    if (filters.topic) {
+        params.topic = filters.topic;
+    }
+    if (filters.type) {
+        params.type = filters.type;
+    }
+    if (filters.source) {
+        params.source = filters.source;
+    }
+    if (filters.creator) {
+        params.creator = filters.creator;
+    }
+    if (filters.verified) {
+        params.verified = 'true';
+    }
+    if (typeof filters.minRating === 'number' && filters.minRating > 0) {
+        params.min_rating = filters.minRating;
+    }
+    if (typeof filters.maxRating === 'number' && filters.maxRating > 0) {
+        params.max_rating = filters.maxRating;
+    }
+
+    if (options.sort) {
+        params.ordering = options.sort;
+    }
+
+    return params;
+};
+
 // Question service API methods
 export const QuestionService = {
-    // Get all questions from backend (matches QuestionListView)
-    getAllQuestions: async (options = {}) => {
+    // Get one page of questions ({count, next, previous, results}) from QuestionListView
+    getQuestionPage: async (options = {}) => {
         try {
-            const params = {};
-
-            if (options.search?.trim()) {
-                params.search = options.search.trim();
+            const params = buildQuestionParams(options);
+            params.page = options.page || 1;
+            if (options.pageSize) {
+                params.page_size = options.pageSize;
             }
 
-            const filters = options.filters || {};
-            if (filters.week) {
-                params.week = filters.week;
-            }
-            if (filters.topic) {
-                params.topic = filters.topic;
-            }
-            if (filters.type) {
-                params.type = filters.type;
-            }
-            if (filters.source) {
-                params.source = filters.source;
-            }
-            if (filters.creator) {
-                params.creator = filters.creator;
-            }
-            if (filters.verified) {
-                params.verified = 'true';
-            }
-            if (typeof filters.minRating === 'number' && filters.minRating > 0) {
-                params.min_rating = filters.minRating;
-            }
-            if (typeof filters.maxRating === 'number' && filters.maxRating > 0) {
-                params.max_rating = filters.maxRating;
-            }
-
-            if (options.sort) {
-                params.ordering = options.sort;
+            const response = await apiClient.get('/questions/', { params });
+            return response.data;
+        } catch (error) {
+            if (import.meta.env.DEV) {
+                console.error('Failed to fetch questions:', error);
             }
+            throw new Error('Failed to fetch questions');
+        }
+    },
 
+    // Get every matching question as a plain array (explicit ?all=true opt-in;
+    // only use for small, scoped lists such as one creator's questions)
+    getAllQuestions: async (options = {}) => {
+        try {
+            const params = { ...buildQuestionParams(options), all: 'true' };
             const response = await apiClient.get('/questions/', { params });
             return response.data;
         } catch (error) {
@@ -52,20 +78,11 @@ export const QuestionService = {
         }
     },
 
-    // Search questions by query (client-side filtering since no backend search endpoint)
-    searchQuestions: async (searchQuery) => {
+    // Search questions by query (first page of the backend's ?search= results)
+    searchQuestions: async (searchQuery, options = {}) => {
         try {
-            // Get all questions and filter client-side
-            const response = await apiClient.get('/questions/');
-            const questions = response.data;
-            
-            // Basic filtering based on question text and creator
-            const filteredQuestions = questions.filter(question =>
-                question.question?.toLowerCase().includes(searchQuery.toLowerCase()) ||
-                question.creator?.toLowerCase().includes(searchQuery.toLowerCase())
-            );
-            
-            return filteredQuestions;
+            const data = await QuestionService.getQuestionPage({ ...options, search: searchQuery });
+            return data.results;
         } catch (error) {
             if (import.meta.env.DEV) {
                 console.error('Failed to search questions:', error);
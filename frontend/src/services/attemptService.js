@@ -22,13 +22,14 @@ export const AttemptService = {
     },
 
     /**
-     * Get all attempts for a specific question (all users)
+     * Get one page of attempts for a specific question (all users), newest first
      * @param {string} questionId - Question UUID
-     * @returns {Promise<Array>} List of attempts for the question
+     * @param {Object} [params] - Optional `limit`, `cursor` (from `next`), `since`
+     * @returns {Promise<{next: string|null, results: Array}>} Page of attempts for the question
      */
-    getQuestionAttempts: async (questionId) => {
+    getQuestionAttempts: async (questionId, params = {}) => {
         try {
-            const response = await apiClient.get(`/attempts/question/${questionId}/`);
+            const response = await apiClient.get(`/attempts/question/${questionId}/`, { params });
             return response.data;
         } catch (error) {
             if (import.meta.env.DEV) {
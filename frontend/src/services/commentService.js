@@ -1,18 +1,26 @@
 import apiClient from './apiClient.js';
 
+/**
+ * The `cursor` query param of a paginated response's `next` link, or null on the last page
+ * @param {string|null} nextUrl - `next` (or a comment's `replies_next`) from the API
+ * @returns {string|null} Cursor to pass back to the API
+ */
+export const cursorFrom = (nextUrl) => (nextUrl ? new URL(nextUrl).searchParams.get('cursor') : null);
+
 /**
  * Comment Service
  * Handles all comment-related API calls
  */
 export const CommentService = {
     /**
-     * Get all comments for a specific question
+     * Get a page of top-level comments for a specific question
      * @param {string} questionId - UUID of the question
-     * @returns {Promise<Array>} Array of comments
+     * @param {Object} params - Optional query params: limit, cursor (from the previous page's `next`)
+     * @returns {Promise<Object>} { next, results } with each comment's first replies inlined
      */
-    getComments: async (questionId) => {
+    getComments: async (questionId, params = {}) => {
         try {
-            const response = await apiClient.get(`/questions/${questionId}/comments/`);
+            const response = await apiClient.get(`/questions/${questionId}/comments/`, { params });
             return response.data;
         } catch (error) {
             if (import.meta.env.DEV) {
@@ -22,6 +30,26 @@ export const CommentService = {
         }
     },
 
+    /**
+     * Get the next page of replies to a comment
+     * @param {string} commentId - UUID of the top-level comment
+     * @param {string} cursor - Cursor from the comment's `replies_next` or the previous page's `next`
+     * @returns {Promise<Object>} { next, results }
+     */
+    getReplies: async (commentId, cursor) => {
+        try {
+            const response = await apiClient.get(`/questions/comments/${commentId}/replies/`, {
+                params: { cursor }
+            });
+            return response.data;
+        } catch (error) {
+            if (import.meta.env.DEV) {
+                console.error(`Failed to fetch replies for comment ${commentId}:`, error);
+            }
+            throw error;
+        }
+    },
+
     /**
      * Create a new comment on a question
      * @param {string} questionId - UUID of the question